@@ -0,0 +1,107 @@
+"""Add trigger-maintained platform counters and BRIN created_at indexes.
+
+Revision ID: 20261018_0002
+Revises: 20260223_0001
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0002"
+down_revision = "20260223_0001"
+branch_labels = None
+depends_on = None
+
+
+COUNTED_TABLES = ["users", "cases", "documents", "quick_scans", "leads", "lender_submissions"]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS platform_counters (
+            entity VARCHAR(64) PRIMARY KEY,
+            row_count BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_platform_counter() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            UPDATE platform_counters
+            SET row_count = row_count + (SELECT COUNT(*) FROM new_rows), updated_at = NOW()
+            WHERE entity = TG_TABLE_NAME;
+          ELSIF TG_OP = 'DELETE' THEN
+            UPDATE platform_counters
+            SET row_count = GREATEST(row_count - (SELECT COUNT(*) FROM old_rows), 0), updated_at = NOW()
+            WHERE entity = TG_TABLE_NAME;
+          ELSIF TG_OP = 'TRUNCATE' THEN
+            UPDATE platform_counters SET row_count = 0, updated_at = NOW() WHERE entity = TG_TABLE_NAME;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    for table_name in COUNTED_TABLES:
+        # Seed under a write lock in the same transaction that installs the
+        # triggers so no row can slip between the COUNT and the trigger.
+        op.execute(f"LOCK TABLE {table_name} IN SHARE ROW EXCLUSIVE MODE;")
+        op.execute(
+            f"""
+            INSERT INTO platform_counters (entity, row_count)
+            SELECT '{table_name}', COUNT(*) FROM {table_name}
+            ON CONFLICT (entity) DO UPDATE SET row_count = EXCLUDED.row_count, updated_at = NOW();
+            """
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table_name}_counter_ins ON {table_name};")
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table_name}_counter_ins AFTER INSERT ON {table_name}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_platform_counter();
+            """
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table_name}_counter_del ON {table_name};")
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table_name}_counter_del AFTER DELETE ON {table_name}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_platform_counter();
+            """
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table_name}_counter_trunc ON {table_name};")
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table_name}_counter_trunc AFTER TRUNCATE ON {table_name}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_platform_counter();
+            """
+        )
+
+    op.execute("CREATE INDEX IF NOT EXISTS idx_users_created_at_brin ON users USING brin (created_at);")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_copilot_queries_created_at_brin ON copilot_queries USING brin (created_at);"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_leads_created_at_brin ON leads USING brin (created_at);")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_lender_submissions_created_at_brin "
+        "ON lender_submissions USING brin (created_at);"
+    )
+
+
+def downgrade() -> None:
+    for table_name in COUNTED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table_name}_counter_ins ON {table_name};")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table_name}_counter_del ON {table_name};")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table_name}_counter_trunc ON {table_name};")
+    op.execute("DROP FUNCTION IF EXISTS bump_platform_counter();")
+    op.execute("DROP TABLE IF EXISTS platform_counters;")
+    op.execute("DROP INDEX IF EXISTS idx_users_created_at_brin;")
+    op.execute("DROP INDEX IF EXISTS idx_copilot_queries_created_at_brin;")
+    op.execute("DROP INDEX IF EXISTS idx_leads_created_at_brin;")
+    op.execute("DROP INDEX IF EXISTS idx_lender_submissions_created_at_brin;")
@@ -0,0 +1,35 @@
+"""Add mv_admin_case_stats materialized view for the admin dashboard.
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0003"
+down_revision = "20261018_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_admin_case_stats AS
+        SELECT
+            COALESCE(status, 'unknown') AS status,
+            COUNT(*)::bigint AS cnt,
+            COALESCE(SUM(completeness_score), 0)::double precision AS completeness_sum,
+            COUNT(completeness_score)::bigint AS scored_count
+        FROM cases
+        GROUP BY COALESCE(status, 'unknown');
+        """
+    )
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_admin_case_stats_status ON mv_admin_case_stats(status);")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_admin_case_stats;")
@@ -0,0 +1,48 @@
+"""Store lender_documents.embedding as halfvec(384).
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # halfvec needs pgvector >= 0.7; older installs keep the VECTOR column.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'halfvec')
+             AND EXISTS (
+               SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'lender_documents' AND column_name = 'embedding' AND udt_name = 'vector'
+             ) THEN
+            ALTER TABLE lender_documents ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+          END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'lender_documents' AND column_name = 'embedding' AND udt_name = 'halfvec'
+          ) THEN
+            ALTER TABLE lender_documents ALTER COLUMN embedding TYPE vector(384) USING embedding::vector(384);
+          END IF;
+        END $$;
+        """
+    )
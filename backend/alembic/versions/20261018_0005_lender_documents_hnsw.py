@@ -0,0 +1,51 @@
+"""Add an HNSW inner-product index on lender_documents.embedding.
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+OPCLASS_BY_TYPE = {
+    "halfvec": "halfvec_ip_ops",
+    "vector": "vector_ip_ops",
+}
+
+
+def upgrade() -> None:
+    embedding_type = op.get_bind().execute(
+        text(
+            """
+            SELECT udt_name
+            FROM information_schema.columns
+            WHERE table_name = 'lender_documents' AND column_name = 'embedding'
+            """
+        )
+    ).scalar()
+    opclass = OPCLASS_BY_TYPE.get(embedding_type)
+    if not opclass:
+        return
+
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_docs_hnsw
+            ON lender_documents USING hnsw (embedding {opclass})
+            WITH (m = 16, ef_construction = 64);
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_lender_docs_hnsw;")
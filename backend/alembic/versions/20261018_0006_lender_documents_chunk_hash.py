@@ -0,0 +1,43 @@
+"""Dedupe lender_documents on a stored chunk hash instead of md5(chunk_text).
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE lender_documents
+        ADD COLUMN IF NOT EXISTS chunk_hash BYTEA GENERATED ALWAYS AS (decode(md5(chunk_text), 'hex')) STORED;
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_lender_documents_dedupe_hash
+            ON lender_documents (organization_id, lender_name, product_type, COALESCE(section_title, ''), chunk_hash);
+            """
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_lender_documents_dedupe;")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_lender_documents_dedupe
+            ON lender_documents (organization_id, lender_name, product_type, COALESCE(section_title, ''), md5(chunk_text));
+            """
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_lender_documents_dedupe_hash;")
+    op.execute("ALTER TABLE lender_documents DROP COLUMN IF EXISTS chunk_hash;")
@@ -0,0 +1,28 @@
+"""Add indexes backing the admin user list aggregates.
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_user_created ON cases (user_id, created_at DESC);"
+        )
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at ON users (created_at DESC);")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_user_created;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_created_at;")
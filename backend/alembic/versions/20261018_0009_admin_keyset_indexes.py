@@ -0,0 +1,30 @@
+"""Add (created_at, id) indexes for keyset pagination of admin lists.
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0009"
+down_revision = "20261018_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_id ON users (created_at DESC, id DESC);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_created_at_id ON cases (created_at DESC, id DESC);"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_created_at_id;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_created_at_id;")
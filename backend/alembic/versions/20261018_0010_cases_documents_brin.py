@@ -0,0 +1,37 @@
+"""Add BRIN indexes for time-windowed case and document scans.
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0010"
+down_revision = "20261018_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_created_at_brin "
+            "ON cases USING brin (created_at) WITH (pages_per_range = 32);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_updated_at_brin "
+            "ON cases USING brin (updated_at) WITH (pages_per_range = 32);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_created_at_brin "
+            "ON documents USING brin (created_at);"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_created_at_brin;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_updated_at_brin;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_documents_created_at_brin;")
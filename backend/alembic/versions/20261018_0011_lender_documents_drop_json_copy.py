@@ -0,0 +1,52 @@
+"""Clear the JSON embedding copy on rows that have a typed embedding.
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0011"
+down_revision = "20261018_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # embedding_json stays for the no-pgvector fallback search; rows with a
+    # halfvec/vector embedding no longer need the ~3 KB text copy.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'lender_documents' AND column_name = 'embedding'
+          ) THEN
+            UPDATE lender_documents
+            SET embedding_json = '[]'
+            WHERE embedding IS NOT NULL AND embedding_json <> '[]';
+          END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'lender_documents' AND column_name = 'embedding'
+          ) THEN
+            UPDATE lender_documents
+            SET embedding_json = embedding::vector::text
+            WHERE embedding IS NOT NULL AND embedding_json = '[]';
+          END IF;
+        END $$;
+        """
+    )
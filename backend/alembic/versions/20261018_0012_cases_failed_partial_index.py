@@ -0,0 +1,27 @@
+"""Add a partial index over failed cases for the operational log.
+
+Revision ID: 20261018_0012
+Revises: 20261018_0011
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0012"
+down_revision = "20261018_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_status_failed "
+            "ON cases (updated_at DESC) WHERE status = 'failed';"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_status_failed;")
@@ -0,0 +1,47 @@
+"""Add mv_platform_daily_stats for the admin 7-day activity tiles.
+
+Revision ID: 20261018_0013
+Revises: 20261018_0012
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0013"
+down_revision = "20261018_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_platform_daily_stats AS
+        SELECT date_trunc('day', created_at) AS day, 'users'::text AS entity, COUNT(*)::bigint AS cnt
+        FROM users WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('day', created_at), 'cases', COUNT(*)
+        FROM cases WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('day', created_at), 'quick_scans', COUNT(*)
+        FROM quick_scans WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('day', created_at), 'copilot_queries', COUNT(*)
+        FROM copilot_queries WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('day', created_at), 'leads', COUNT(*)
+        FROM leads WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('day', created_at), 'lender_submissions', COUNT(*)
+        FROM lender_submissions WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1;
+        """
+    )
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_platform_daily_stats ON mv_platform_daily_stats(day, entity);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_platform_daily_stats;")
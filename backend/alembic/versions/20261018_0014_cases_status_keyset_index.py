@@ -0,0 +1,27 @@
+"""Add a (status, created_at, id) index for status-filtered admin case lists.
+
+Revision ID: 20261018_0014
+Revises: 20261018_0013
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0014"
+down_revision = "20261018_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_status_created_id "
+            "ON cases (status, created_at DESC, id DESC);"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_status_created_id;")
@@ -0,0 +1,103 @@
+"""Add mv_user_usage_30d for the admin user-usage matrix.
+
+Revision ID: 20261018_0015
+Revises: 20261018_0014
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0015"
+down_revision = "20261018_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_usage_30d AS
+        WITH case_agg AS (
+            SELECT
+                user_id,
+                COUNT(*)::int AS cases_total,
+                COUNT(*) FILTER (WHERE status = 'failed' AND updated_at >= NOW() - INTERVAL '30 days')::int AS failed_cases_30d,
+                MAX(updated_at) AS last_case_at
+            FROM cases
+            GROUP BY user_id
+        ),
+        doc_agg AS (
+            SELECT
+                c.user_id,
+                COUNT(*) FILTER (WHERE d.created_at >= NOW() - INTERVAL '30 days')::int AS docs_uploaded_30d,
+                MAX(d.created_at) AS last_doc_at
+            FROM documents d
+            INNER JOIN cases c ON c.id = d.case_id
+            GROUP BY c.user_id
+        ),
+        quick_scan_agg AS (
+            SELECT
+                user_id,
+                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')::int AS quick_scans_30d,
+                MAX(created_at) AS last_quick_scan_at
+            FROM quick_scans
+            GROUP BY user_id
+        ),
+        copilot_agg AS (
+            SELECT
+                user_id,
+                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')::int AS copilot_queries_30d,
+                MAX(created_at) AS last_copilot_at
+            FROM copilot_queries
+            GROUP BY user_id
+        ),
+        lead_agg AS (
+            SELECT
+                created_by AS user_id,
+                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')::int AS leads_30d,
+                MAX(created_at) AS last_lead_at
+            FROM leads
+            GROUP BY created_by
+        ),
+        submission_agg AS (
+            SELECT
+                c.user_id,
+                COUNT(*) FILTER (WHERE ls.created_at >= NOW() - INTERVAL '30 days')::int AS submissions_30d,
+                MAX(ls.created_at) AS last_submission_at
+            FROM lender_submissions ls
+            INNER JOIN cases c ON c.id = ls.case_id
+            GROUP BY c.user_id
+        )
+        SELECT
+            u.id AS user_id,
+            COALESCE(ca.cases_total, 0) AS cases_total,
+            COALESCE(da.docs_uploaded_30d, 0) AS docs_uploaded_30d,
+            COALESCE(qa.quick_scans_30d, 0) AS quick_scans_30d,
+            COALESCE(coa.copilot_queries_30d, 0) AS copilot_queries_30d,
+            COALESCE(la.leads_30d, 0) AS leads_30d,
+            COALESCE(sa.submissions_30d, 0) AS submissions_30d,
+            COALESCE(ca.failed_cases_30d, 0) AS failed_cases_30d,
+            GREATEST(
+                ca.last_case_at,
+                da.last_doc_at,
+                qa.last_quick_scan_at,
+                coa.last_copilot_at,
+                la.last_lead_at,
+                sa.last_submission_at
+            ) AS last_activity_at
+        FROM users u
+        LEFT JOIN case_agg ca ON ca.user_id = u.id
+        LEFT JOIN doc_agg da ON da.user_id = u.id
+        LEFT JOIN quick_scan_agg qa ON qa.user_id = u.id
+        LEFT JOIN copilot_agg coa ON coa.user_id = u.id
+        LEFT JOIN lead_agg la ON la.user_id = u.id
+        LEFT JOIN submission_agg sa ON sa.user_id = u.id;
+        """
+    )
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_user_usage_30d_user ON mv_user_usage_30d(user_id);")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_user_usage_30d;")
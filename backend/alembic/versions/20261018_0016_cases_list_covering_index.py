@@ -0,0 +1,32 @@
+"""Replace the admin case keyset index with a covering one.
+
+Revision ID: 20261018_0016
+Revises: 20261018_0015
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0016"
+down_revision = "20261018_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_created_at_id_covering "
+            "ON cases (created_at DESC, id DESC) "
+            "INCLUDE (case_id, borrower_name, status, program_type, completeness_score, user_id, updated_at);"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_created_at_id;")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_created_at_id ON cases (created_at DESC, id DESC);"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_created_at_id_covering;")
@@ -0,0 +1,101 @@
+"""Add trigger-maintained case completeness totals for the admin average.
+
+Revision ID: 20261018_0017
+Revises: 20261018_0016
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0017"
+down_revision = "20261018_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS platform_summary (
+            id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+            completeness_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            scored_count BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_case_completeness() RETURNS trigger AS $$
+        DECLARE
+          delta_sum DOUBLE PRECISION := 0;
+          delta_count BIGINT := 0;
+          part_sum DOUBLE PRECISION;
+          part_count BIGINT;
+        BEGIN
+          IF TG_OP = 'TRUNCATE' THEN
+            UPDATE platform_summary SET completeness_sum = 0, scored_count = 0, updated_at = NOW();
+            RETURN NULL;
+          END IF;
+          IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT COALESCE(SUM(completeness_score), 0), COUNT(completeness_score)
+            INTO part_sum, part_count FROM new_rows;
+            delta_sum := delta_sum + part_sum;
+            delta_count := delta_count + part_count;
+          END IF;
+          IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            SELECT COALESCE(SUM(completeness_score), 0), COUNT(completeness_score)
+            INTO part_sum, part_count FROM old_rows;
+            delta_sum := delta_sum - part_sum;
+            delta_count := delta_count - part_count;
+          END IF;
+          -- Most case updates (status changes) leave completeness alone; skip the
+          -- write so they do not contend on the summary row.
+          IF delta_sum <> 0 OR delta_count <> 0 THEN
+            UPDATE platform_summary
+            SET completeness_sum = completeness_sum + delta_sum,
+                scored_count = GREATEST(scored_count + delta_count, 0),
+                updated_at = NOW();
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Seed under a write lock in the same transaction that installs the
+    # triggers, so no write can slip between the SUM and the trigger.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_cases_completeness_ins') THEN
+            LOCK TABLE cases IN SHARE ROW EXCLUSIVE MODE;
+            INSERT INTO platform_summary (id, completeness_sum, scored_count)
+            SELECT TRUE, COALESCE(SUM(completeness_score), 0), COUNT(completeness_score) FROM cases
+            ON CONFLICT (id) DO UPDATE
+            SET completeness_sum = EXCLUDED.completeness_sum,
+                scored_count = EXCLUDED.scored_count,
+                updated_at = NOW();
+            CREATE TRIGGER trg_cases_completeness_ins AFTER INSERT ON cases
+              REFERENCING NEW TABLE AS new_rows
+              FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+            CREATE TRIGGER trg_cases_completeness_upd AFTER UPDATE ON cases
+              REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+              FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+            CREATE TRIGGER trg_cases_completeness_del AFTER DELETE ON cases
+              REFERENCING OLD TABLE AS old_rows
+              FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+            CREATE TRIGGER trg_cases_completeness_trunc AFTER TRUNCATE ON cases
+              FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+          END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    for suffix in ("ins", "upd", "del", "trunc"):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_cases_completeness_{suffix} ON cases;")
+    op.execute("DROP FUNCTION IF EXISTS bump_case_completeness();")
+    op.execute("DROP TABLE IF EXISTS platform_summary;")
@@ -0,0 +1,43 @@
+"""Add pg_trgm GIN indexes for the smart case search.
+
+Revision ID: 20261018_0018
+Revises: 20261018_0017
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0018"
+down_revision = "20261018_0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS "pg_trgm";')
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_case_id_upper_trgm "
+            "ON cases USING gin (upper(case_id) gin_trgm_ops);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_gstin_upper_trgm "
+            "ON cases USING gin (upper(gstin) gin_trgm_ops);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_borrower_name_trgm "
+            "ON cases USING gin (borrower_name gin_trgm_ops);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_borrower_features_pan_upper_trgm "
+            "ON borrower_features USING gin (upper(pan_number) gin_trgm_ops);"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_case_id_upper_trgm;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_gstin_upper_trgm;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_borrower_name_trgm;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_borrower_features_pan_upper_trgm;")
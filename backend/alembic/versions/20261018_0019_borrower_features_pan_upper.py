@@ -0,0 +1,27 @@
+"""Add an upper(pan_number) index for exact duplicate-PAN lookups.
+
+Revision ID: 20261018_0019
+Revises: 20261018_0018
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0019"
+down_revision = "20261018_0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_borrower_features_pan_upper "
+            "ON borrower_features (upper(pan_number));"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_borrower_features_pan_upper;")
@@ -0,0 +1,68 @@
+"""Make (case, user, lender) unique on commission_payouts for a single-statement upsert.
+
+Revision ID: 20261018_0020
+Revises: 20261018_0019
+Create Date: 2026-10-18 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261018_0020"
+down_revision = "20261018_0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Payout rows are financial history; refuse to migrate rather than drop any.
+    duplicates = bind.execute(
+        sa.text(
+            """
+            SELECT case_id::text, user_id::text, LOWER(COALESCE(lender_name, '')), COUNT(*)
+            FROM commission_payouts
+            GROUP BY case_id, user_id, LOWER(COALESCE(lender_name, ''))
+            HAVING COUNT(*) > 1
+            ORDER BY COUNT(*) DESC
+            LIMIT 50
+            """
+        )
+    ).fetchall()
+    if duplicates:
+        groups = "\n".join(
+            f"  case_id={case_id} user_id={user_id} lender={lender!r} payouts={count}"
+            for case_id, user_id, lender, count in duplicates
+        )
+        raise RuntimeError(
+            "commission_payouts has duplicate (case_id, user_id, lender) rows; "
+            f"resolve them before upgrading:\n{groups}"
+        )
+
+    with op.get_context().autocommit_block():
+        # An interrupted concurrent build leaves an INVALID index that
+        # IF NOT EXISTS would otherwise keep forever.
+        op.execute(
+            """
+            DO $$
+            BEGIN
+              IF EXISTS (
+                SELECT 1 FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = 'uq_commission_payouts_case_user_lender' AND NOT i.indisvalid
+              ) THEN
+                DROP INDEX uq_commission_payouts_case_user_lender;
+              END IF;
+            END $$;
+            """
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_commission_payouts_case_user_lender "
+            "ON commission_payouts (case_id, user_id, LOWER(COALESCE(lender_name, '')));"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_commission_payouts_case_user_lender;")
@@ -0,0 +1,89 @@
+"""Append platform counter deltas instead of updating one shared row per table.
+
+Revision ID: 20261018_0021
+Revises: 20261018_0020
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0021"
+down_revision = "20261018_0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS platform_counter_deltas (
+            id BIGSERIAL PRIMARY KEY,
+            entity VARCHAR(64) NOT NULL,
+            delta BIGINT NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_platform_counter_deltas_entity ON platform_counter_deltas(entity);"
+    )
+    # Existing triggers call the function by name, so replacing it is enough.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_platform_counter() RETURNS trigger AS $$
+        DECLARE
+          n BIGINT;
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            SELECT COUNT(*) INTO n FROM new_rows;
+          ELSIF TG_OP = 'DELETE' THEN
+            SELECT -COUNT(*) INTO n FROM old_rows;
+          ELSIF TG_OP = 'TRUNCATE' THEN
+            DELETE FROM platform_counter_deltas WHERE entity = TG_TABLE_NAME;
+            UPDATE platform_counters SET row_count = 0, updated_at = NOW() WHERE entity = TG_TABLE_NAME;
+            RETURN NULL;
+          END IF;
+          IF n <> 0 THEN
+            INSERT INTO platform_counter_deltas (entity, delta) VALUES (TG_TABLE_NAME, n);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_platform_counter() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            UPDATE platform_counters
+            SET row_count = row_count + (SELECT COUNT(*) FROM new_rows), updated_at = NOW()
+            WHERE entity = TG_TABLE_NAME;
+          ELSIF TG_OP = 'DELETE' THEN
+            UPDATE platform_counters
+            SET row_count = GREATEST(row_count - (SELECT COUNT(*) FROM old_rows), 0), updated_at = NOW()
+            WHERE entity = TG_TABLE_NAME;
+          ELSIF TG_OP = 'TRUNCATE' THEN
+            UPDATE platform_counters SET row_count = 0, updated_at = NOW() WHERE entity = TG_TABLE_NAME;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Fold pending deltas back into the counters before dropping them.
+    op.execute(
+        """
+        UPDATE platform_counters c
+        SET row_count = GREATEST(c.row_count + d.delta, 0), updated_at = NOW()
+        FROM (
+            SELECT entity, SUM(delta) AS delta FROM platform_counter_deltas GROUP BY entity
+        ) d
+        WHERE c.entity = d.entity;
+        """
+    )
+    op.execute("DROP TABLE IF EXISTS platform_counter_deltas;")
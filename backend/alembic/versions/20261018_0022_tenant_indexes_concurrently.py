@@ -0,0 +1,68 @@
+"""Repair tenant organization_id indexes without blocking writes.
+
+Revision ID: 20261018_0022
+Revises: 20261018_0021
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0022"
+down_revision = "20261018_0021"
+branch_labels = None
+depends_on = None
+
+
+TENANT_TABLES = [
+    "users",
+    "cases",
+    "documents",
+    "document_processing_jobs",
+    "extracted_fields",
+    "borrower_features",
+    "quick_scans",
+    "copilot_queries",
+    "case_reports",
+    "eligibility_results",
+    "leads",
+    "lender_submissions",
+    "submission_queries",
+    "dsa_commission_rates",
+    "commission_payouts",
+    "lender_pincodes",
+    "lender_branches",
+    "lender_rms",
+    "lender_products",
+    "lenders",
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table_name in TENANT_TABLES:
+            index_name = f"idx_{table_name}_organization_id"
+            # An interrupted concurrent build leaves an INVALID index that
+            # IF NOT EXISTS would otherwise keep forever.
+            op.execute(
+                f"""
+                DO $$
+                BEGIN
+                  IF EXISTS (
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = '{index_name}' AND NOT i.indisvalid
+                  ) THEN
+                    DROP INDEX {index_name};
+                  END IF;
+                END $$;
+                """
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name}(organization_id);"
+            )
+
+
+def downgrade() -> None:
+    # The indexes predate this revision (20260223_0001 creates them); keep them.
+    pass
@@ -1,21 +1,245 @@
 """Admin endpoints for platform operations dashboard."""
 
+import asyncio
+import base64
+import heapq
+import json
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from operator import itemgetter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
 
+import asyncpg
 import httpx
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
 
+from app.core.cache import invalidate_cache, ttl_cache
 from app.core.config import settings
 from app.core.latency_metrics import get_latency_snapshot
 from app.core.deps import CurrentAdmin
-from app.db.database import get_db_session
+from app.db.database import get_db_session, get_readonly_db_session
 from app.services.rq_queue import get_queue_snapshot
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+ADMIN_STATS_CACHE_KEY = "admin:stats:v1"
+
+# Caps the pool connections one process spends on admin fan-out queries so a
+# dashboard refresh cannot starve user-facing endpoints.
+_admin_query_slots = asyncio.Semaphore(max(1, settings.ADMIN_DB_CONCURRENCY))
+
+# Platform stats are split into independent groups that run concurrently.
+# Row totals come from the trigger-maintained platform_counters table plus
+# its not-yet-compacted deltas (falling back to a live COUNT when a counter
+# is missing). Status distribution and completeness come from mv_admin_case_stats.
+
+
+def _counter_total_sql(entity: str) -> str:
+    return f"""COALESCE(
+            (
+                SELECT c.row_count + COALESCE(
+                    (SELECT SUM(d.delta) FROM platform_counter_deltas d WHERE d.entity = '{entity}'),
+                    0
+                )
+                FROM platform_counters c
+                WHERE c.entity = '{entity}'
+            ),
+            (SELECT COUNT(*) FROM {entity})
+        )"""
+
+
+_STATS_USERS_SQL = """
+    SELECT
+        """ + _counter_total_sql("users") + """ AS users_total,
+        (SELECT COUNT(*) FROM users WHERE is_active = TRUE) AS users_active
+"""
+
+_STATS_CASES_SQL = """
+    SELECT
+        """ + _counter_total_sql("cases") + """ AS cases_total,
+        (SELECT COUNT(*) FROM cases WHERE created_at >= $1) AS cases_created_24h,
+        """ + _counter_total_sql("documents") + """ AS documents_total,
+        (
+            SELECT COUNT(*)
+            FROM (SELECT 1 FROM eligibility_results GROUP BY case_id) runs
+        ) AS eligibility_runs
+"""
+
+
+def _windowed_count_sql(entity: str, alias: str) -> str:
+    # Whole days inside the window come from mv_platform_daily_stats; only the
+    # partial first day and today are counted live, over short created_at ranges.
+    return f"""
+        (
+            SELECT COALESCE(SUM(cnt), 0)
+            FROM mv_platform_daily_stats
+            WHERE entity = '{entity}' AND day >= b.head_end AND day < b.today
+        )
+        + (SELECT COUNT(*) FROM {entity} WHERE created_at >= $1 AND created_at < b.head_end)
+        + (SELECT COUNT(*) FROM {entity} WHERE created_at >= GREATEST(b.today, $1)) AS {alias}"""
+
+
+_STATS_WINDOW_SQL = """
+    WITH b AS (
+        SELECT
+            date_trunc('day', $1::timestamptz) + INTERVAL '1 day' AS head_end,
+            date_trunc('day', NOW()) AS today
+    )
+    SELECT""" + ",".join(
+    _windowed_count_sql(entity, alias)
+    for entity, alias in (
+        ("users", "users_created_7d"),
+        ("cases", "cases_created_7d"),
+        ("quick_scans", "quick_scans_7d"),
+        ("copilot_queries", "copilot_queries_7d"),
+        ("leads", "leads_7d"),
+        ("lender_submissions", "submissions_7d"),
+    )
+) + """
+    FROM b
+"""
+
+_STATS_CASE_MV_SQL = """
+    SELECT
+        (
+            SELECT COALESCE(SUM(cnt), 0)
+            FROM mv_admin_case_stats
+            WHERE status = 'report_generated'
+        ) AS reports_generated,
+        -- Trigger-maintained running totals are exact. platform_summary must
+        -- exist (runtime migrations create it); the view is used only while
+        -- it has no row or its scored_count is still 0.
+        COALESCE(
+            (SELECT completeness_sum / NULLIF(scored_count, 0) FROM platform_summary),
+            (
+                SELECT SUM(completeness_sum) / NULLIF(SUM(scored_count), 0)
+                FROM mv_admin_case_stats
+            ),
+            0
+        ) AS avg_case_completeness,
+        (
+            SELECT COALESCE(jsonb_object_agg(status, cnt), '{}'::jsonb)
+            FROM mv_admin_case_stats
+        ) AS status_distribution
+"""
+
+_STATS_ACTIVITY_SQL = """
+    SELECT
+        """ + _counter_total_sql("quick_scans") + """ AS quick_scans_total,
+        """ + _counter_total_sql("leads") + """ AS leads_total,
+        """ + _counter_total_sql("lender_submissions") + """ AS submissions_total
+"""
+
+
+# List queries use a single text per endpoint (optional filters are NULL-able
+# parameters) so each pooled connection caches one prepared statement.
+_LIST_USERS_SQL = """
+    SELECT
+        u.id::text,
+        u.email,
+        u.full_name,
+        u.role,
+        u.organization,
+        COALESCE(u.is_active, FALSE) AS is_active,
+        u.created_at,
+        cs.case_count,
+        cs.latest_case_at
+    FROM users u
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*)::int AS case_count, MAX(c.created_at) AS latest_case_at
+        FROM cases c
+        WHERE c.user_id = u.id
+    ) cs ON TRUE
+    WHERE ($1::text IS NULL OR u.email ILIKE $1 OR u.full_name ILIKE $1)
+      AND ($4::timestamptz IS NULL OR (u.created_at, u.id) < ($4::timestamptz, $5::uuid))
+    ORDER BY u.created_at DESC, u.id DESC
+    LIMIT $2 OFFSET $3
+"""
+
+_LIST_CASES_SQL = """
+    SELECT
+        c.id::text,
+        c.case_id,
+        c.borrower_name,
+        c.status,
+        c.program_type,
+        COALESCE(c.completeness_score, 0)::float AS completeness_score,
+        u.email as user_email,
+        c.created_at,
+        c.updated_at
+    FROM cases c
+    INNER JOIN users u ON u.id = c.user_id
+    WHERE ($1::text IS NULL OR c.status = $1)
+      AND ($4::timestamptz IS NULL OR (c.created_at, c.id) < ($4::timestamptz, $5::uuid))
+    ORDER BY c.created_at DESC, c.id DESC
+    LIMIT $2 OFFSET $3
+"""
+
+
+async def _admin_fetchrow(query: str, *args: Any):
+    """Run one admin aggregate on its own pooled connection."""
+    async with _admin_query_slots:
+        async with get_readonly_db_session() as db:
+            return await db.fetchrow(query, *args)
+
+
+async def _admin_fetch(query: str, *args: Any) -> List[Any]:
+    """Run one admin list query on its own pooled connection."""
+    async with _admin_query_slots:
+        async with get_readonly_db_session() as db:
+            return await db.fetch(query, *args)
+
+
+def _json_response(
+    content: Any,
+    *,
+    max_age: Optional[int] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Encode an already-shaped payload with pydantic_core, skipping response_model revalidation.
+
+    The endpoint's declared response_model still documents the payload.
+    """
+    response_headers = dict(headers or {})
+    if max_age is not None:
+        # private: responses are admin-only and must not land in shared caches.
+        response_headers["Cache-Control"] = f"private, max-age={max_age}"
+    return Response(content=to_json(content), media_type="application/json", headers=response_headers)
+
+
+def _encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Tuple[Optional[datetime], Optional[UUID]]:
+    """Decode a keyset cursor into its (created_at, id) seek position."""
+    if not cursor:
+        return None, None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at_text, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at_text), UUID(row_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _page_response(rows: List[Any], limit: int) -> Response:
+    """Serialize list rows directly; a full page carries its seek position in X-Next-Cursor.
+
+    The list SQL already returns the row models' shapes and types.
+    """
+    headers: Dict[str, str] = {}
+    if len(rows) == limit and rows[-1]["created_at"] is not None:
+        headers["X-Next-Cursor"] = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return _json_response([dict(row) for row in rows], headers=headers)
+
 
 class PlatformStats(BaseModel):
     users_total: int
@@ -94,6 +318,13 @@ class ActivityEventRow(BaseModel):
     details: str
 
 
+# Whole-page validators: one Rust-side pass per page instead of a model
+# constructor per row, and a JSON-mode dump so cached and fresh payloads
+# serialize identically.
+_USER_USAGE_ROWS = TypeAdapter(List[UserUsageRow])
+_ACTIVITY_EVENT_ROWS = TypeAdapter(List[ActivityEventRow])
+
+
 class LatencyMetricRow(BaseModel):
     route_key: str
     count: int
@@ -126,90 +357,69 @@ async def get_rq_dashboard_snapshot(current_user: CurrentAdmin):
 
 @router.get("/stats", response_model=PlatformStats)
 async def get_platform_stats(current_user: CurrentAdmin):
-    """Aggregated platform metrics for admin dashboard."""
-    now = datetime.now(timezone.utc)
-    seven_days_ago = now - timedelta(days=7)
-    one_day_ago = now - timedelta(hours=24)
+    """Aggregated platform metrics for admin dashboard (cached briefly in Redis)."""
+    return _json_response(
+        await _compute_platform_stats(),
+        max_age=settings.ADMIN_STATS_CACHE_TTL_SECONDS,
+    )
 
-    async with get_db_session() as db:
-        users_total = await db.fetchval("SELECT COUNT(*) FROM users")
-        users_active = await db.fetchval("SELECT COUNT(*) FROM users WHERE is_active = TRUE")
-        users_created_7d = await db.fetchval(
-            "SELECT COUNT(*) FROM users WHERE created_at >= $1",
-            seven_days_ago,
-        )
 
-        cases_total = await db.fetchval("SELECT COUNT(*) FROM cases")
-        cases_created_7d = await db.fetchval(
-            "SELECT COUNT(*) FROM cases WHERE created_at >= $1",
-            seven_days_ago,
-        )
-        cases_created_24h = await db.fetchval(
-            "SELECT COUNT(*) FROM cases WHERE created_at >= $1",
-            one_day_ago,
-        )
+@router.post("/stats/invalidate")
+async def invalidate_platform_stats(current_user: CurrentAdmin):
+    """Force the next /stats request to recompute instead of serving the cache."""
+    removed = await invalidate_cache(ADMIN_STATS_CACHE_KEY)
+    return {"invalidated": bool(removed)}
 
-        documents_total = await db.fetchval("SELECT COUNT(*) FROM documents")
-        reports_generated = await db.fetchval(
-            "SELECT COUNT(*) FROM cases WHERE status = 'report_generated'"
-        )
-        eligibility_runs = await db.fetchval(
-            "SELECT COUNT(DISTINCT case_id) FROM eligibility_results"
-        )
-        quick_scans_total = await db.fetchval("SELECT COUNT(*) FROM quick_scans")
-        quick_scans_7d = await db.fetchval(
-            "SELECT COUNT(*) FROM quick_scans WHERE created_at >= $1",
-            seven_days_ago,
-        )
-        copilot_queries_7d = await db.fetchval(
-            "SELECT COUNT(*) FROM copilot_queries WHERE created_at >= $1",
-            seven_days_ago,
-        )
-        leads_total = await db.fetchval("SELECT COUNT(*) FROM leads")
-        leads_7d = await db.fetchval(
-            "SELECT COUNT(*) FROM leads WHERE created_at >= $1",
-            seven_days_ago,
-        )
-        submissions_total = await db.fetchval("SELECT COUNT(*) FROM lender_submissions")
-        submissions_7d = await db.fetchval(
-            "SELECT COUNT(*) FROM lender_submissions WHERE created_at >= $1",
-            seven_days_ago,
-        )
-        avg_case_completeness = await db.fetchval(
-            "SELECT COALESCE(AVG(completeness_score), 0) FROM cases"
-        )
 
-        status_rows = await db.fetch(
-            """
-            SELECT status, COUNT(*) as count
-            FROM cases
-            GROUP BY status
-            ORDER BY count DESC
-            """
-        )
+@ttl_cache(ADMIN_STATS_CACHE_KEY, ttl=settings.ADMIN_STATS_CACHE_TTL_SECONDS)
+async def _compute_platform_stats() -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    seven_days_ago = now - timedelta(days=7)
+    one_day_ago = now - timedelta(hours=24)
 
-    status_distribution = {row["status"]: int(row["count"]) for row in status_rows}
+    # The groups are independent, so each runs on its own pooled connection
+    # (asyncpg serializes queries per connection).
+    rows = await asyncio.gather(
+        _admin_fetchrow(_STATS_USERS_SQL),
+        _admin_fetchrow(_STATS_CASES_SQL, one_day_ago),
+        _admin_fetchrow(_STATS_CASE_MV_SQL),
+        _admin_fetchrow(_STATS_ACTIVITY_SQL),
+        _admin_fetchrow(_STATS_WINDOW_SQL, seven_days_ago),
+    )
+    row: Dict[str, Any] = {}
+    for group_row in rows:
+        row.update(dict(group_row))
+
+    raw_distribution = row["status_distribution"]
+    if isinstance(raw_distribution, str):
+        raw_distribution = json.loads(raw_distribution)
+    status_distribution = {
+        status: int(count)
+        for status, count in sorted(
+            (raw_distribution or {}).items(), key=lambda item: item[1], reverse=True
+        )
+    }
 
     return PlatformStats(
-        users_total=int(users_total or 0),
-        users_active=int(users_active or 0),
-        users_created_7d=int(users_created_7d or 0),
-        cases_total=int(cases_total or 0),
-        cases_created_7d=int(cases_created_7d or 0),
-        cases_created_24h=int(cases_created_24h or 0),
-        documents_total=int(documents_total or 0),
-        reports_generated=int(reports_generated or 0),
-        eligibility_runs=int(eligibility_runs or 0),
-        quick_scans_total=int(quick_scans_total or 0),
-        quick_scans_7d=int(quick_scans_7d or 0),
-        copilot_queries_7d=int(copilot_queries_7d or 0),
-        leads_total=int(leads_total or 0),
-        leads_7d=int(leads_7d or 0),
-        submissions_total=int(submissions_total or 0),
-        submissions_7d=int(submissions_7d or 0),
-        avg_case_completeness=float(avg_case_completeness or 0.0),
+        users_total=int(row["users_total"] or 0),
+        users_active=int(row["users_active"] or 0),
+        users_created_7d=int(row["users_created_7d"] or 0),
+        cases_total=int(row["cases_total"] or 0),
+        cases_created_7d=int(row["cases_created_7d"] or 0),
+        cases_created_24h=int(row["cases_created_24h"] or 0),
+        documents_total=int(row["documents_total"] or 0),
+        reports_generated=int(row["reports_generated"] or 0),
+        eligibility_runs=int(row["eligibility_runs"] or 0),
+        quick_scans_total=int(row["quick_scans_total"] or 0),
+        quick_scans_7d=int(row["quick_scans_7d"] or 0),
+        copilot_queries_7d=int(row["copilot_queries_7d"] or 0),
+        leads_total=int(row["leads_total"] or 0),
+        leads_7d=int(row["leads_7d"] or 0),
+        submissions_total=int(row["submissions_total"] or 0),
+        submissions_7d=int(row["submissions_7d"] or 0),
+        avg_case_completeness=float(row["avg_case_completeness"] or 0.0),
         status_distribution=status_distribution,
-    )
+    ).model_dump()
 
 
 @router.get("/users", response_model=List[UserOpsRow])
@@ -218,72 +428,29 @@ async def list_users_ops(
     q: Optional[str] = Query(None, description="Search by user name/email"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor (overrides offset)"),
 ):
-    """User operations view with activity metadata."""
-    search_pattern = f"%{q.strip()}%" if q else None
+    """User operations view with activity metadata.
 
-    async with get_db_session() as db:
-        if search_pattern:
-            rows = await db.fetch(
-                """
-                SELECT
-                    u.id::text,
-                    u.email,
-                    u.full_name,
-                    u.role,
-                    u.organization,
-                    u.is_active,
-                    u.created_at,
-                    COUNT(c.id) as case_count,
-                    MAX(c.created_at) as latest_case_at
-                FROM users u
-                LEFT JOIN cases c ON c.user_id = u.id
-                WHERE u.email ILIKE $1 OR u.full_name ILIKE $1
-                GROUP BY u.id
-                ORDER BY u.created_at DESC
-                LIMIT $2 OFFSET $3
-                """,
-                search_pattern,
-                limit,
-                offset,
-            )
-        else:
-            rows = await db.fetch(
-                """
-                SELECT
-                    u.id::text,
-                    u.email,
-                    u.full_name,
-                    u.role,
-                    u.organization,
-                    u.is_active,
-                    u.created_at,
-                    COUNT(c.id) as case_count,
-                    MAX(c.created_at) as latest_case_at
-                FROM users u
-                LEFT JOIN cases c ON c.user_id = u.id
-                GROUP BY u.id
-                ORDER BY u.created_at DESC
-                LIMIT $1 OFFSET $2
-                """,
-                limit,
-                offset,
-            )
+    Per-user case aggregates come from a LATERAL subquery, so they only run for
+    the page of users returned, each as one idx_cases_user_created range scan.
+    """
+    search_pattern = f"%{q.strip()}%" if q else None
+    after_created_at, after_id = _decode_cursor(cursor)
+    if cursor:
+        offset = 0
 
-    return [
-        UserOpsRow(
-            id=row["id"],
-            email=row["email"],
-            full_name=row["full_name"],
-            role=row["role"],
-            organization=row["organization"],
-            is_active=bool(row["is_active"]),
-            created_at=row["created_at"],
-            case_count=int(row["case_count"] or 0),
-            latest_case_at=row["latest_case_at"],
+    async with get_readonly_db_session() as db:
+        rows = await db.fetch(
+            _LIST_USERS_SQL,
+            search_pattern,
+            limit,
+            offset,
+            after_created_at,
+            after_id,
         )
-        for row in rows
-    ]
+
+    return _page_response(rows, limit)
 
 
 @router.get("/latency", response_model=List[LatencyMetricRow])
@@ -311,68 +478,86 @@ async def list_cases_ops(
     status: Optional[str] = Query(None, description="Filter by case status"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor (overrides offset)"),
 ):
     """Cross-organization case operations view."""
-    async with get_db_session() as db:
-        if status:
-            rows = await db.fetch(
-                """
-                SELECT
-                    c.id::text,
-                    c.case_id,
-                    c.borrower_name,
-                    c.status,
-                    c.program_type,
-                    c.completeness_score,
-                    u.email as user_email,
-                    c.created_at,
-                    c.updated_at
-                FROM cases c
-                INNER JOIN users u ON u.id = c.user_id
-                WHERE c.status = $1
-                ORDER BY c.created_at DESC
-                LIMIT $2 OFFSET $3
-                """,
-                status,
-                limit,
-                offset,
-            )
-        else:
-            rows = await db.fetch(
-                """
-                SELECT
-                    c.id::text,
-                    c.case_id,
-                    c.borrower_name,
-                    c.status,
-                    c.program_type,
-                    c.completeness_score,
-                    u.email as user_email,
-                    c.created_at,
-                    c.updated_at
-                FROM cases c
-                INNER JOIN users u ON u.id = c.user_id
-                ORDER BY c.created_at DESC
-                LIMIT $1 OFFSET $2
-                """,
-                limit,
-                offset,
-            )
+    after_created_at, after_id = _decode_cursor(cursor)
+    if cursor:
+        offset = 0
 
-    return [
-        CaseOpsRow(
-            id=row["id"],
-            case_id=row["case_id"],
-            borrower_name=row["borrower_name"],
-            status=row["status"],
-            program_type=row["program_type"],
-            completeness_score=float(row["completeness_score"] or 0.0),
-            user_email=row["user_email"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
+    async with get_readonly_db_session() as db:
+        rows = await db.fetch(
+            _LIST_CASES_SQL,
+            status,
+            limit,
+            offset,
+            after_created_at,
+            after_id,
         )
-        for row in rows
-    ]
+
+    return _page_response(rows, limit)
+
+
+# Both log queries return each row already encoded as a JSON object, so the
+# stream writes Postgres' text straight through without building a dict and
+# re-encoding it per row.
+_LOGS_FAILED_CASES_SQL = """
+    SELECT row_to_json(f)::text
+    FROM (
+        SELECT case_id, borrower_name, updated_at
+        FROM cases
+        WHERE status = 'failed' AND updated_at >= $1
+        ORDER BY updated_at DESC
+        LIMIT 100
+    ) f
+"""
+
+_LOGS_WATCHLIST_SQL = """
+    SELECT row_to_json(w)::text
+    FROM (
+        SELECT c.case_id, d.original_filename, d.status, d.doc_type, d.created_at
+        FROM documents d
+        INNER JOIN cases c ON c.id = d.case_id
+        WHERE d.created_at >= $1 AND (d.doc_type = 'unknown' OR d.status IN ('uploaded', 'ocr_complete'))
+        ORDER BY d.created_at DESC
+        LIMIT 200
+    ) w
+"""
+
+
+async def _stream_operational_logs(days: int, since: datetime) -> AsyncIterator[bytes]:
+    """Emit the logs document row by row.
+
+    The watchlist query (capped at 200 rows) starts on a second pooled
+    connection while failed cases stream from a server-side cursor, so both
+    run on the server concurrently. The JSON shape matches the previous
+    buffered response; error_summary is written last because its counts are
+    only known once both lists are drained.
+    """
+    watchlist_task = asyncio.create_task(_admin_fetch(_LOGS_WATCHLIST_SQL, since))
+    try:
+        failed_count = 0
+        # Read-only sessions already run inside a transaction, which the
+        # server-side cursor requires.
+        async with get_readonly_db_session() as db:
+            yield b'{"window_days":' + to_json(days) + b',"failed_cases":['
+            async for row in db.cursor(_LOGS_FAILED_CASES_SQL, since, prefetch=50):
+                yield (b"," if failed_count else b"") + row[0].encode()
+                failed_count += 1
+
+        watchlist = await watchlist_task
+        yield b'],"classification_watchlist":['
+        for idx, row in enumerate(watchlist):
+            yield (b"," if idx else b"") + row[0].encode()
+    finally:
+        if not watchlist_task.done():
+            watchlist_task.cancel()
+
+    summary = {
+        "failed_case_count": failed_count,
+        "classification_watchlist_count": len(watchlist),
+    }
+    yield b'],"error_summary":' + to_json(summary) + b"}"
 
 
 @router.get("/logs")
@@ -387,73 +572,205 @@ async def get_operational_logs(
     direct filesystem log access in Railway runtime.
     """
     since = datetime.now(timezone.utc) - timedelta(days=days)
+    return StreamingResponse(
+        _stream_operational_logs(days, since),
+        media_type="application/json",
+    )
+
+
+_health_http_client: Optional[httpx.AsyncClient] = None
+_health_cache: Optional[Tuple[float, "AdminHealthStatus"]] = None
+_health_lock = asyncio.Lock()
 
-    async with get_db_session() as db:
-        failed_cases = await db.fetch(
-            """
-            SELECT case_id, borrower_name, updated_at
-            FROM cases
-            WHERE status = 'failed' AND updated_at >= $1
-            ORDER BY updated_at DESC
-            LIMIT 100
-            """,
-            since,
-        )
 
-        unreadable_docs = await db.fetch(
-            """
-            SELECT c.case_id, d.original_filename, d.status, d.doc_type, d.created_at
-            FROM documents d
-            INNER JOIN cases c ON c.id = d.case_id
-            WHERE d.created_at >= $1 AND (d.doc_type = 'unknown' OR d.status IN ('uploaded', 'ocr_complete'))
-            ORDER BY d.created_at DESC
-            LIMIT 200
-            """,
-            since,
+def _get_health_http_client() -> httpx.AsyncClient:
+    global _health_http_client
+    if _health_http_client is None:
+        _health_http_client = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=5),
         )
+    return _health_http_client
 
-    return {
-        "window_days": days,
-        "failed_cases": [dict(r) for r in failed_cases],
-        "classification_watchlist": [dict(r) for r in unreadable_docs],
-        "error_summary": {
-            "failed_case_count": len(failed_cases),
-            "classification_watchlist_count": len(unreadable_docs),
-        },
-    }
 
+async def close_admin_http_client() -> None:
+    """Close the pooled probe client (application shutdown)."""
+    global _health_http_client
+    if _health_http_client is not None:
+        await _health_http_client.aclose()
+        _health_http_client = None
 
-@router.get("/health", response_model=AdminHealthStatus)
-async def get_admin_health(current_user: CurrentAdmin):
-    """Service dependency status useful for admin troubleshooting."""
-    db_ok = False
-    whatsapp_ok = False
-    whatsapp_status = None
 
-    # DB check
+async def _probe_database() -> bool:
     try:
         async with get_db_session() as db:
             _ = await db.fetchval("SELECT 1")
-        db_ok = True
+        return True
     except Exception:
-        db_ok = False
+        return False
+
 
-    # WhatsApp health check
+async def _probe_whatsapp() -> Tuple[bool, Optional[int]]:
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            res = await client.get(f"{settings.WHATSAPP_SERVICE_URL}/health")
-            whatsapp_status = res.status_code
-            whatsapp_ok = res.status_code == 200
+        res = await _get_health_http_client().get(f"{settings.WHATSAPP_SERVICE_URL}/health")
+        return res.status_code == 200, res.status_code
     except Exception:
-        whatsapp_ok = False
-
-    return AdminHealthStatus(
-        database_ok=db_ok,
-        llm_configured=bool(settings.LLM_API_KEY),
-        whatsapp_service_ok=whatsapp_ok,
-        whatsapp_service_status=whatsapp_status,
-        checked_at=datetime.now(timezone.utc),
+        return False, None
+
+
+@router.get("/health", response_model=AdminHealthStatus)
+async def get_admin_health(current_user: CurrentAdmin):
+    """Service dependency status useful for admin troubleshooting.
+
+    Probes run concurrently and the result is reused for a few seconds so a
+    burst of dashboard refreshes costs one round of probes.
+    """
+    global _health_cache
+    ttl = settings.ADMIN_HEALTH_CACHE_TTL_SECONDS
+    cached = _health_cache
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    async with _health_lock:
+        cached = _health_cache
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        db_ok, (whatsapp_ok, whatsapp_status) = await asyncio.gather(
+            _probe_database(),
+            _probe_whatsapp(),
+        )
+        status = AdminHealthStatus(
+            database_ok=db_ok,
+            llm_configured=bool(settings.LLM_API_KEY),
+            whatsapp_service_ok=whatsapp_ok,
+            whatsapp_service_status=whatsapp_status,
+            checked_at=datetime.now(timezone.utc),
+        )
+        _health_cache = (time.monotonic(), status)
+        return status
+
+
+def _user_usage_sql(search: bool) -> str:
+    """Build the live user-usage query.
+
+    All six sources are normalized into one event stream and aggregated in a
+    single GROUP BY. The window cannot be pushed into the branches because
+    cases_total and last_activity_at are all-time values. With a search term
+    the matching users are picked first and every branch is restricted to
+    them, so only their rows are read (via the per-user indexes) instead of
+    aggregating every user before filtering. Ordering by last activity is
+    unchanged, which is why paging still happens after aggregation.
+    """
+    picked = ""
+    if search:
+        picked = """
+    picked AS (
+        SELECT id FROM users WHERE email ILIKE $2 OR full_name ILIKE $2
+    ),"""
+
+    def only_picked(column: str) -> str:
+        return f"\n        WHERE {column} IN (SELECT id FROM picked)" if search else ""
+
+    tail = (
+        """
+    WHERE u.id IN (SELECT id FROM picked)
+    ORDER BY last_activity_at DESC NULLS LAST, u.created_at DESC
+    LIMIT $3 OFFSET $4
+"""
+        if search
+        else """
+    ORDER BY last_activity_at DESC NULLS LAST, u.created_at DESC
+    LIMIT $2 OFFSET $3
+"""
+    )
+
+    return f"""
+    WITH{picked}
+    events AS (
+        SELECT user_id, 'case'::text AS src, updated_at AS ts,
+               (status = 'failed' AND updated_at >= $1) AS failed_in_window
+        FROM cases{only_picked("user_id")}
+        UNION ALL
+        SELECT c.user_id, 'document', d.created_at, FALSE
+        FROM documents d
+        INNER JOIN cases c ON c.id = d.case_id{only_picked("c.user_id")}
+        UNION ALL
+        SELECT user_id, 'quick_scan', created_at, FALSE
+        FROM quick_scans{only_picked("user_id")}
+        UNION ALL
+        SELECT user_id, 'copilot', created_at, FALSE
+        FROM copilot_queries{only_picked("user_id")}
+        UNION ALL
+        SELECT created_by, 'lead', created_at, FALSE
+        FROM leads{only_picked("created_by")}
+        UNION ALL
+        SELECT c.user_id, 'submission', ls.created_at, FALSE
+        FROM lender_submissions ls
+        INNER JOIN cases c ON c.id = ls.case_id{only_picked("c.user_id")}
+    ),
+    usage_agg AS (
+        SELECT
+            user_id,
+            COUNT(*) FILTER (WHERE src = 'case')::int AS cases_total,
+            COUNT(*) FILTER (WHERE src = 'document' AND ts >= $1)::int AS docs_uploaded_30d,
+            COUNT(*) FILTER (WHERE src = 'quick_scan' AND ts >= $1)::int AS quick_scans_30d,
+            COUNT(*) FILTER (WHERE src = 'copilot' AND ts >= $1)::int AS copilot_queries_30d,
+            COUNT(*) FILTER (WHERE src = 'lead' AND ts >= $1)::int AS leads_30d,
+            COUNT(*) FILTER (WHERE src = 'submission' AND ts >= $1)::int AS submissions_30d,
+            COUNT(*) FILTER (WHERE failed_in_window)::int AS failed_cases_30d,
+            MAX(ts) AS last_activity_at
+        FROM events
+        GROUP BY user_id
     )
+    SELECT
+        u.id::text,
+        u.email,
+        u.full_name,
+        u.role,
+        COALESCE(u.is_active, FALSE) AS is_active,
+        COALESCE(g.cases_total, 0) AS cases_total,
+        COALESCE(g.docs_uploaded_30d, 0) AS docs_uploaded_30d,
+        COALESCE(g.quick_scans_30d, 0) AS quick_scans_30d,
+        COALESCE(g.copilot_queries_30d, 0) AS copilot_queries_30d,
+        COALESCE(g.leads_30d, 0) AS leads_30d,
+        COALESCE(g.submissions_30d, 0) AS submissions_30d,
+        COALESCE(g.failed_cases_30d, 0) AS failed_cases_30d,
+        g.last_activity_at
+    FROM users u
+    LEFT JOIN usage_agg g ON g.user_id = u.id{tail}"""
+
+
+# Composed once at import so each variant is a stable statement text.
+_USER_USAGE_SEARCH_SQL = _user_usage_sql(search=True)
+_USER_USAGE_SQL = _user_usage_sql(search=False)
+
+
+# The 30-day matrix (the dashboard default) reads the background-refreshed
+# mv_user_usage_30d; other windows fall back to the live aggregation above.
+USER_USAGE_MV_DAYS = 30
+
+_USER_USAGE_MV_SQL = """
+    SELECT
+        u.id::text,
+        u.email,
+        u.full_name,
+        u.role,
+        COALESCE(u.is_active, FALSE) AS is_active,
+        COALESCE(m.cases_total, 0) AS cases_total,
+        COALESCE(m.docs_uploaded_30d, 0) AS docs_uploaded_30d,
+        COALESCE(m.quick_scans_30d, 0) AS quick_scans_30d,
+        COALESCE(m.copilot_queries_30d, 0) AS copilot_queries_30d,
+        COALESCE(m.leads_30d, 0) AS leads_30d,
+        COALESCE(m.submissions_30d, 0) AS submissions_30d,
+        COALESCE(m.failed_cases_30d, 0) AS failed_cases_30d,
+        m.last_activity_at
+    FROM users u
+    LEFT JOIN mv_user_usage_30d m ON m.user_id = u.id
+    WHERE ($1::text IS NULL OR u.email ILIKE $1 OR u.full_name ILIKE $1)
+    ORDER BY m.last_activity_at DESC NULLS LAST, u.created_at DESC
+    LIMIT $2 OFFSET $3
+"""
 
 
 @router.get("/user-usage", response_model=List[UserUsageRow])
@@ -464,136 +781,131 @@ async def get_user_usage_matrix(
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
-    """Usage matrix across product modules for each user."""
-    since = datetime.now(timezone.utc) - timedelta(days=days)
-    search_pattern = f"%{q.strip()}%" if q else None
+    """Usage matrix across product modules for each user (cached briefly in Redis)."""
+    return _json_response(
+        await _compute_user_usage(days, q.strip() if q else None, limit, offset),
+        max_age=settings.ADMIN_USER_USAGE_CACHE_TTL_SECONDS,
+    )
 
-    query_base = """
-        WITH case_agg AS (
-            SELECT
-                user_id,
-                COUNT(*)::int AS cases_total,
-                COUNT(*) FILTER (WHERE status = 'failed' AND updated_at >= $1)::int AS failed_cases_30d,
-                MAX(updated_at) AS last_case_at
-            FROM cases
-            GROUP BY user_id
-        ),
-        doc_agg AS (
-            SELECT
-                c.user_id,
-                COUNT(*) FILTER (WHERE d.created_at >= $1)::int AS docs_uploaded_30d,
-                MAX(d.created_at) AS last_doc_at
-            FROM documents d
-            INNER JOIN cases c ON c.id = d.case_id
-            GROUP BY c.user_id
-        ),
-        quick_scan_agg AS (
-            SELECT
-                user_id,
-                COUNT(*) FILTER (WHERE created_at >= $1)::int AS quick_scans_30d,
-                MAX(created_at) AS last_quick_scan_at
-            FROM quick_scans
-            GROUP BY user_id
-        ),
-        copilot_agg AS (
-            SELECT
-                user_id,
-                COUNT(*) FILTER (WHERE created_at >= $1)::int AS copilot_queries_30d,
-                MAX(created_at) AS last_copilot_at
-            FROM copilot_queries
-            GROUP BY user_id
-        ),
-        lead_agg AS (
-            SELECT
-                created_by AS user_id,
-                COUNT(*) FILTER (WHERE created_at >= $1)::int AS leads_30d,
-                MAX(created_at) AS last_lead_at
-            FROM leads
-            GROUP BY created_by
-        ),
-        submission_agg AS (
-            SELECT
-                c.user_id,
-                COUNT(*) FILTER (WHERE ls.created_at >= $1)::int AS submissions_30d,
-                MAX(ls.created_at) AS last_submission_at
-            FROM lender_submissions ls
-            INNER JOIN cases c ON c.id = ls.case_id
-            GROUP BY c.user_id
-        )
-        SELECT
-            u.id::text,
-            u.email,
-            u.full_name,
-            u.role,
-            u.is_active,
-            COALESCE(ca.cases_total, 0) AS cases_total,
-            COALESCE(da.docs_uploaded_30d, 0) AS docs_uploaded_30d,
-            COALESCE(qa.quick_scans_30d, 0) AS quick_scans_30d,
-            COALESCE(coa.copilot_queries_30d, 0) AS copilot_queries_30d,
-            COALESCE(la.leads_30d, 0) AS leads_30d,
-            COALESCE(sa.submissions_30d, 0) AS submissions_30d,
-            COALESCE(ca.failed_cases_30d, 0) AS failed_cases_30d,
-            GREATEST(
-                ca.last_case_at,
-                da.last_doc_at,
-                qa.last_quick_scan_at,
-                coa.last_copilot_at,
-                la.last_lead_at,
-                sa.last_submission_at
-            ) AS last_activity_at
-        FROM users u
-        LEFT JOIN case_agg ca ON ca.user_id = u.id
-        LEFT JOIN doc_agg da ON da.user_id = u.id
-        LEFT JOIN quick_scan_agg qa ON qa.user_id = u.id
-        LEFT JOIN copilot_agg coa ON coa.user_id = u.id
-        LEFT JOIN lead_agg la ON la.user_id = u.id
-        LEFT JOIN submission_agg sa ON sa.user_id = u.id
-    """
 
-    async with get_db_session() as db:
-        if search_pattern:
-            rows = await db.fetch(
-                f"""
-                {query_base}
-                WHERE u.email ILIKE $2 OR u.full_name ILIKE $2
-                ORDER BY last_activity_at DESC NULLS LAST, u.created_at DESC
-                LIMIT $3 OFFSET $4
-                """,
-                since,
-                search_pattern,
-                limit,
-                offset,
-            )
-        else:
-            rows = await db.fetch(
-                f"""
-                {query_base}
-                ORDER BY last_activity_at DESC NULLS LAST, u.created_at DESC
-                LIMIT $2 OFFSET $3
-                """,
-                since,
-                limit,
-                offset,
-            )
+@ttl_cache(
+    lambda days, q, limit, offset: f"admin:user-usage:v1:{days}:{limit}:{offset}:{q or ''}",
+    ttl=settings.ADMIN_USER_USAGE_CACHE_TTL_SECONDS,
+)
+async def _compute_user_usage(
+    days: int,
+    q: Optional[str],
+    limit: int,
+    offset: int,
+) -> List[Dict[str, Any]]:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    search_pattern = f"%{q}%" if q else None
+
+    async with get_readonly_db_session() as db:
+        rows = None
+        if days == USER_USAGE_MV_DAYS:
+            try:
+                # Savepoint, so a missing view does not abort the session's transaction.
+                async with db.transaction():
+                    rows = await db.fetch(_USER_USAGE_MV_SQL, search_pattern, limit, offset)
+            except asyncpg.UndefinedTableError:
+                rows = None
+        if rows is None and search_pattern:
+            rows = await db.fetch(_USER_USAGE_SEARCH_SQL, since, search_pattern, limit, offset)
+        elif rows is None:
+            rows = await db.fetch(_USER_USAGE_SQL, since, limit, offset)
+
+    return _USER_USAGE_ROWS.dump_python(
+        _USER_USAGE_ROWS.validate_python([dict(row) for row in rows]),
+        mode="json",
+    )
 
-    return [
-        UserUsageRow(
-            id=row["id"],
-            email=row["email"],
-            full_name=row["full_name"],
-            role=row["role"],
-            is_active=bool(row["is_active"]),
-            cases_total=int(row["cases_total"] or 0),
-            docs_uploaded_30d=int(row["docs_uploaded_30d"] or 0),
-            quick_scans_30d=int(row["quick_scans_30d"] or 0),
-            copilot_queries_30d=int(row["copilot_queries_30d"] or 0),
-            leads_30d=int(row["leads_30d"] or 0),
-            submissions_30d=int(row["submissions_30d"] or 0),
-            failed_cases_30d=int(row["failed_cases_30d"] or 0),
-            last_activity_at=row["last_activity_at"],
-        )
-        for row in rows
-    ]
+
+# One query per source, each an index-ordered scan of its created_at index
+# capped at the page size. They run concurrently and are merged newest-first
+# in Python instead of sorting a UNION ALL in a single plan.
+_ACTIVITY_FEED_SOURCE_SQL: Tuple[str, ...] = (
+    """
+    SELECT
+        c.created_at AS occurred_at,
+        'case_created'::text AS event_type,
+        u.email AS actor_email,
+        u.full_name AS actor_name,
+        CONCAT(c.case_id, ' • ', COALESCE(c.borrower_name, 'Unnamed borrower')) AS details
+    FROM cases c
+    INNER JOIN users u ON u.id = c.user_id
+    WHERE c.created_at >= $1
+    ORDER BY c.created_at DESC
+    LIMIT $2
+    """,
+    """
+    SELECT
+        d.created_at AS occurred_at,
+        'document_uploaded'::text AS event_type,
+        u.email AS actor_email,
+        u.full_name AS actor_name,
+        CONCAT(c.case_id, ' • ', COALESCE(d.original_filename, 'unnamed file')) AS details
+    FROM documents d
+    INNER JOIN cases c ON c.id = d.case_id
+    INNER JOIN users u ON u.id = c.user_id
+    WHERE d.created_at >= $1
+    ORDER BY d.created_at DESC
+    LIMIT $2
+    """,
+    """
+    SELECT
+        qs.created_at AS occurred_at,
+        'quick_scan_run'::text AS event_type,
+        u.email AS actor_email,
+        u.full_name AS actor_name,
+        CONCAT(qs.loan_type, ' • ', COALESCE(qs.pincode, 'no pincode')) AS details
+    FROM quick_scans qs
+    INNER JOIN users u ON u.id = qs.user_id
+    WHERE qs.created_at >= $1
+    ORDER BY qs.created_at DESC
+    LIMIT $2
+    """,
+    """
+    SELECT
+        cq.created_at AS occurred_at,
+        'copilot_query'::text AS event_type,
+        u.email AS actor_email,
+        u.full_name AS actor_name,
+        LEFT(COALESCE(cq.query_text, ''), 120) AS details
+    FROM copilot_queries cq
+    LEFT JOIN users u ON u.id = cq.user_id
+    WHERE cq.created_at >= $1
+    ORDER BY cq.created_at DESC
+    LIMIT $2
+    """,
+    """
+    SELECT
+        l.created_at AS occurred_at,
+        'lead_created'::text AS event_type,
+        u.email AS actor_email,
+        u.full_name AS actor_name,
+        CONCAT(COALESCE(l.customer_name, 'Unnamed lead'), ' • ', COALESCE(l.loan_type_interest, 'N/A')) AS details
+    FROM leads l
+    LEFT JOIN users u ON u.id = l.created_by
+    WHERE l.created_at >= $1
+    ORDER BY l.created_at DESC
+    LIMIT $2
+    """,
+    """
+    SELECT
+        ls.created_at AS occurred_at,
+        'submission_created'::text AS event_type,
+        u.email AS actor_email,
+        u.full_name AS actor_name,
+        CONCAT(c.case_id, ' • ', COALESCE(ls.lender_name, 'Unknown lender')) AS details
+    FROM lender_submissions ls
+    INNER JOIN cases c ON c.id = ls.case_id
+    INNER JOIN users u ON u.id = c.user_id
+    WHERE ls.created_at >= $1
+    ORDER BY ls.created_at DESC
+    LIMIT $2
+    """,
+)
 
 
 @router.get("/activity-feed", response_model=List[ActivityEventRow])
@@ -603,99 +915,26 @@ async def get_activity_feed(
     limit: int = Query(100, ge=1, le=500),
 ):
     """Cross-module activity feed to debug platform usage and failures."""
+    return _json_response(
+        await _compute_activity_feed(days, limit),
+        max_age=settings.ADMIN_ACTIVITY_FEED_CACHE_TTL_SECONDS,
+    )
+
+
+@ttl_cache(
+    lambda days, limit: f"admin:activity-feed:v1:{days}:{limit}",
+    ttl=settings.ADMIN_ACTIVITY_FEED_CACHE_TTL_SECONDS,
+)
+async def _compute_activity_feed(days: int, limit: int) -> List[Dict[str, Any]]:
     since = datetime.now(timezone.utc) - timedelta(days=days)
 
-    async with get_db_session() as db:
-        rows = await db.fetch(
-            """
-            SELECT *
-            FROM (
-                SELECT
-                    c.created_at AS occurred_at,
-                    'case_created'::text AS event_type,
-                    u.email AS actor_email,
-                    u.full_name AS actor_name,
-                    CONCAT(c.case_id, ' • ', COALESCE(c.borrower_name, 'Unnamed borrower')) AS details
-                FROM cases c
-                INNER JOIN users u ON u.id = c.user_id
-                WHERE c.created_at >= $1
-
-                UNION ALL
-
-                SELECT
-                    d.created_at AS occurred_at,
-                    'document_uploaded'::text AS event_type,
-                    u.email AS actor_email,
-                    u.full_name AS actor_name,
-                    CONCAT(c.case_id, ' • ', COALESCE(d.original_filename, 'unnamed file')) AS details
-                FROM documents d
-                INNER JOIN cases c ON c.id = d.case_id
-                INNER JOIN users u ON u.id = c.user_id
-                WHERE d.created_at >= $1
-
-                UNION ALL
-
-                SELECT
-                    qs.created_at AS occurred_at,
-                    'quick_scan_run'::text AS event_type,
-                    u.email AS actor_email,
-                    u.full_name AS actor_name,
-                    CONCAT(qs.loan_type, ' • ', COALESCE(qs.pincode, 'no pincode')) AS details
-                FROM quick_scans qs
-                INNER JOIN users u ON u.id = qs.user_id
-                WHERE qs.created_at >= $1
-
-                UNION ALL
-
-                SELECT
-                    cq.created_at AS occurred_at,
-                    'copilot_query'::text AS event_type,
-                    u.email AS actor_email,
-                    u.full_name AS actor_name,
-                    LEFT(COALESCE(cq.query_text, ''), 120) AS details
-                FROM copilot_queries cq
-                LEFT JOIN users u ON u.id = cq.user_id
-                WHERE cq.created_at >= $1
-
-                UNION ALL
-
-                SELECT
-                    l.created_at AS occurred_at,
-                    'lead_created'::text AS event_type,
-                    u.email AS actor_email,
-                    u.full_name AS actor_name,
-                    CONCAT(COALESCE(l.customer_name, 'Unnamed lead'), ' • ', COALESCE(l.loan_type_interest, 'N/A')) AS details
-                FROM leads l
-                LEFT JOIN users u ON u.id = l.created_by
-                WHERE l.created_at >= $1
-
-                UNION ALL
-
-                SELECT
-                    ls.created_at AS occurred_at,
-                    'submission_created'::text AS event_type,
-                    u.email AS actor_email,
-                    u.full_name AS actor_name,
-                    CONCAT(c.case_id, ' • ', COALESCE(ls.lender_name, 'Unknown lender')) AS details
-                FROM lender_submissions ls
-                INNER JOIN cases c ON c.id = ls.case_id
-                INNER JOIN users u ON u.id = c.user_id
-                WHERE ls.created_at >= $1
-            ) feed
-            ORDER BY occurred_at DESC
-            LIMIT $2
-            """,
-            since,
-            limit,
-        )
+    per_source = await asyncio.gather(
+        *(_admin_fetch(query, since, limit) for query in _ACTIVITY_FEED_SOURCE_SQL)
+    )
+    merged = heapq.merge(*per_source, key=itemgetter("occurred_at"), reverse=True)
+    rows = [dict(row) for row in islice(merged, limit)]
 
-    return [
-        ActivityEventRow(
-            occurred_at=row["occurred_at"],
-            event_type=row["event_type"],
-            actor_email=row["actor_email"],
-            actor_name=row["actor_name"],
-            details=row["details"],
-        )
-        for row in rows
-    ]
+    return _ACTIVITY_EVENT_ROWS.dump_python(
+        _ACTIVITY_EVENT_ROWS.validate_python(rows),
+        mode="json",
+    )
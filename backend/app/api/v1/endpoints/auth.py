@@ -6,10 +6,21 @@ import re
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.deps import (
+    forget_unknown_login_email,
+    get_current_user,
+    is_unknown_login_email,
+    remember_unknown_login_email,
+)
+from app.core.security import (
+    DUMMY_PASSWORD_HASH,
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+)
 from app.db.database import get_db
 from app.models.organization import Organization
 from app.models.user import User
@@ -52,20 +63,8 @@ async def register(
     Raises:
         HTTPException 400: If email already exists
     """
-    # Check if email already exists
-    result = await db.execute(
-        select(User).where(User.email == user_data.email)
-    )
-    existing_user = result.scalar_one_or_none()
-
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-
     # Hash the password
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
 
     # Organization bootstrap: self-register creates a DSA owner org.
     org_name = (user_data.organization_name or user_data.organization or f"{user_data.full_name} Org").strip()
@@ -83,22 +82,36 @@ async def register(
     db.add(organization)
     await db.flush()
 
-    # Create new user
+    # Create new user. The unique email constraint decides duplicates in the
+    # same statement, so concurrent sign-ups cannot both get past a pre-check.
     role = user_data.role or "dsa_owner"
-    new_user = User(
-        email=user_data.email,
-        hashed_password=hashed_password,
-        full_name=user_data.full_name,
-        phone=user_data.phone,
-        organization=user_data.organization,
-        role=role,
-        organization_id=organization.id,
-        is_active=True,
+    result = await db.execute(
+        insert(User)
+        .values(
+            email=user_data.email,
+            hashed_password=hashed_password,
+            full_name=user_data.full_name,
+            phone=user_data.phone,
+            organization=user_data.organization,
+            role=role,
+            organization_id=organization.id,
+            is_active=True,
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
     )
+    new_user = result.scalar_one_or_none()
+
+    if new_user is None:
+        # Discard the organization created for this attempt.
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
+    await forget_unknown_login_email(new_user.email)
 
     # Return user response (without password)
     return UserResponse(
@@ -133,19 +146,33 @@ async def login(
     Raises:
         HTTPException 401: If credentials are invalid
     """
+    invalid_credentials = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # Emails that recently matched no account skip the database entirely.
+    # Unknown emails are still checked against a dummy hash so they take as
+    # long to reject as a wrong password.
+    if await is_unknown_login_email(credentials.email):
+        await verify_password_async(credentials.password, DUMMY_PASSWORD_HASH)
+        raise invalid_credentials
+
     # Find user by email
     result = await db.execute(
         select(User).where(User.email == credentials.email)
     )
     user = result.scalar_one_or_none()
 
-    # Verify user exists and password is correct
-    if not user or not verify_password(credentials.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if user is None:
+        await verify_password_async(credentials.password, DUMMY_PASSWORD_HASH)
+        await remember_unknown_login_email(credentials.email)
+        raise invalid_credentials
+
+    # Verify password is correct
+    if not await verify_password_async(credentials.password, user.hashed_password):
+        raise invalid_credentials
 
     # Check if user is active
     if not user.is_active:
@@ -1,61 +1,136 @@
 """
 Bank Statement Analyzer endpoints - Proxy to external processing API
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from typing import List
+from pathlib import Path
+from typing import AsyncIterator, List
+import asyncio
 import httpx
 import logging
 
+from app.core.config import settings
 from app.services.credilo_api_client import CrediloApiClient
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/bank-statement", tags=["bank-statement"])
 
-_credilo_client = CrediloApiClient()
-EXTERNAL_API_URL = _credilo_client.process_url
-EXTERNAL_API_TIMEOUT_SECONDS = _credilo_client.timeout_seconds
+# Caps concurrent forwards per process so a burst of large multipart uploads
+# queues here instead of piling up sockets and upload buffers.
+_forward_slots = asyncio.Semaphore(max(1, settings.CREDILO_MAX_CONCURRENCY))
+
+# Formats the analyzer UI offers for upload.
+ALLOWED_EXTENSIONS = frozenset({".pdf", ".zip", ".xlsx", ".xls"})
+MAX_FILE_BYTES = settings.MAX_CASE_UPLOAD_MB * 1024 * 1024
+
+# Credilo returns the workbook as XLSX; some deployments label it as a generic
+# binary download.
+EXCEL_MIME_TYPES = frozenset({
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.ms-excel",
+    "application/octet-stream",
+})
+
+# Built once; Starlette copies header mappings into the response and never
+# mutates them.
+_XLSX_HEADERS = {"Content-Disposition": 'attachment; filename="bank_statement_analysis.xlsx"'}
+_NO_HEADERS: dict = {}
+
+
+async def _relay_upstream(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield an upstream body in 64 KiB chunks, closing it once drained or abandoned."""
+    try:
+        async for chunk in response.aiter_bytes(chunk_size=65536):
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+_TIMEOUT_PHASES = {
+    httpx.ConnectTimeout: "connect",
+    httpx.WriteTimeout: "upload",
+    httpx.ReadTimeout: "processing",
+}
+
+
+def _length_header(response: httpx.Response) -> dict:
+    """Pass the upstream Content-Length through when the relayed bytes match it.
+
+    A known length lets the response go out without chunked framing and lets
+    browsers show download progress. httpx decodes any Content-Encoding, so
+    encoded bodies are relayed without a length.
+    """
+    length = response.headers.get("content-length")
+    if length is None or response.headers.get("content-encoding"):
+        return _NO_HEADERS
+    return {"Content-Length": length}
 
 
 @router.post("/process")
 async def process_bank_statements(
+    request: Request,
     files: List[UploadFile] = File(...)
 ):
     """
     Proxy endpoint to forward bank statement files to external processing API.
     This avoids CORS issues by making the request from backend.
     """
-    try:
-        if not EXTERNAL_API_URL:
+    # Opened once in the app lifespan around a pooled httpx client.
+    credilo: CrediloApiClient = request.app.state.credilo
+    if not credilo.process_url:
+        raise HTTPException(
+            status_code=503,
+            detail="Credilo process endpoint is not configured",
+        )
+
+    # Reject bad batches from upload metadata alone, before any bytes are
+    # forwarded to Credilo.
+    for file in files:
+        if Path(file.filename or "").suffix.lower() not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file type: {file.filename}. Upload PDF, ZIP, XLSX or XLS files.",
+            )
+        if file.size is not None and file.size > MAX_FILE_BYTES:
             raise HTTPException(
-                status_code=503,
-                detail="Credilo process endpoint is not configured",
+                status_code=413,
+                detail=f"{file.filename} exceeds the {settings.MAX_CASE_UPLOAD_MB}MB upload limit",
             )
+    # A batch is forwarded as one multipart body, so cap the total as well.
+    if sum(file.size or 0 for file in files) > MAX_FILE_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds the {settings.MAX_CASE_UPLOAD_MB}MB total upload limit",
+        )
 
+    try:
         logger.info(f"Received {len(files)} file(s) for bank statement processing")
 
-        # Prepare files for forwarding
+        # Prepare files for forwarding. Starlette already spooled each upload
+        # to a temporary file; handing httpx that file object lets it stream
+        # the multipart body in chunks instead of holding a second copy in RAM.
         files_to_send = []
         for file in files:
-            content = await file.read()
+            await file.seek(0)
             files_to_send.append(
-                ("files", (file.filename, content, file.content_type))
-            )
-            logger.info(f"Prepared file: {file.filename} ({len(content)} bytes)")
-
-        # Forward request to external API
-        async with httpx.AsyncClient(timeout=EXTERNAL_API_TIMEOUT_SECONDS) as client:
-            logger.info(f"Forwarding request to {EXTERNAL_API_URL}")
-            response = await client.post(
-                EXTERNAL_API_URL,
-                files=files_to_send
+                ("files", (file.filename, file.file, file.content_type))
             )
+            logger.info(f"Prepared file: {file.filename} ({file.size} bytes)")
 
+        # Forward request to external API. The response is opened in
+        # streaming mode so spreadsheets are relayed chunk by chunk instead
+        # of being buffered whole before the client sees a byte.
+        logger.info(f"Forwarding request to {credilo.process_url}")
+        async with _forward_slots:
+            response = await credilo.open_process_stream(files_to_send)
+        relaying = False
+        try:
             logger.info(f"External API response status: {response.status_code}")
             logger.info(f"External API response headers: {dict(response.headers)}")
 
             # Check if response is successful
             if response.status_code != 200:
+                await response.aread()
                 logger.error(f"External API error: {response.text}")
                 raise HTTPException(
                     status_code=response.status_code,
@@ -64,31 +139,48 @@ async def process_bank_statements(
 
             # Check content type to determine response format
             content_type = response.headers.get("content-type", "")
+            mime = content_type.split(";", 1)[0].strip().lower()
 
-            if "spreadsheet" in content_type or "excel" in content_type or content_type.startswith("application/vnd"):
-                # Excel file response - return as streaming response
+            if mime in EXCEL_MIME_TYPES:
+                # Excel file response - relay the upstream body as it arrives
                 logger.info("Returning Excel file response")
+                relaying = True
                 return StreamingResponse(
-                    iter([response.content]),
+                    _relay_upstream(response),
                     media_type=content_type,
-                    headers={
-                        "Content-Disposition": f'attachment; filename="bank_statement_analysis.xlsx"'
-                    }
+                    headers=_XLSX_HEADERS | _length_header(response),
                 )
-            elif "json" in content_type:
-                # JSON response - return as JSON
+            elif mime == "application/json" or mime.endswith("+json"):
+                # JSON response - relay Credilo's bytes verbatim; decoding and
+                # re-encoding the payload here would only burn CPU
                 logger.info("Returning JSON response")
-                return response.json()
+                relaying = True
+                return StreamingResponse(
+                    _relay_upstream(response),
+                    media_type=content_type,
+                    headers=_length_header(response),
+                )
             else:
-                # Unknown format - return raw content
+                # Unknown format - relay raw content
                 logger.warning(f"Unknown content type: {content_type}")
+                relaying = True
                 return StreamingResponse(
-                    iter([response.content]),
-                    media_type=content_type
+                    _relay_upstream(response),
+                    media_type=content_type,
+                    headers=_length_header(response),
                 )
+        finally:
+            if not relaying:
+                await response.aclose()
 
-    except httpx.TimeoutException:
-        logger.error("Request to external API timed out after %.0fs", EXTERNAL_API_TIMEOUT_SECONDS)
+    except httpx.PoolTimeout:
+        logger.error("No pooled Credilo connection became free in time")
+        raise HTTPException(
+            status_code=503,
+            detail="Bank statement analyzer is busy. Please retry in a moment.",
+        )
+    except httpx.TimeoutException as e:
+        logger.error("Request to external API timed out (%s phase)", _TIMEOUT_PHASES.get(type(e), "unknown"))
         raise HTTPException(
             status_code=504,
             detail=(
@@ -4,14 +4,18 @@ Batch Upload API Endpoints
 Handles ZIP file uploads and batch document processing.
 """
 
+import json
 import logging
 from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 
 from app.services.zip_handler import zip_handler, bank_aggregator
+from app.core.cache import invalidate_cache, ttl_cache
+from app.core.config import settings
 from app.core.deps import CurrentUser
 
 logger = logging.getLogger(__name__)
@@ -86,56 +90,50 @@ async def upload_zip_batch(
         if not file.filename.endswith('.zip'):
             raise HTTPException(status_code=400, detail="File must be a ZIP archive")
 
-        # Read file content
-        file_content = await file.read()
+        # Starlette records the spooled size while parsing the form, so an
+        # oversize archive is refused without reading it back from disk.
+        if file.size is not None and file.size > zip_handler.MAX_ZIP_BYTES:
+            raise HTTPException(status_code=413, detail="ZIP file too large (max: 100MB)")
+
+        # Work from Starlette's spooled temp file rather than reading the whole
+        # archive into memory; zipfile seeks to the members it needs.
+        file_content = file.file
+        file_content.seek(0)
 
         # Validate ZIP
         is_valid, error_message = zip_handler.validate_zip(file_content, file.filename)
         if not is_valid:
             raise HTTPException(status_code=400, detail=error_message)
 
-        # Extract ZIP
-        extracted_files = await zip_handler.extract_zip(file_content, file.filename)
-
-        if not extracted_files:
-            raise HTTPException(status_code=400, detail="No valid files found in ZIP")
-
-        logger.info(f"Extracted {len(extracted_files)} files from {file.filename}")
-
-        # Process batch documents
+        # Extract and process in one pipeline: each file starts processing as
+        # soon as it is decompressed instead of after the whole archive.
         result = await zip_handler.process_batch_documents(
-            extracted_files=extracted_files,
+            extracted_files=zip_handler.iter_zip(file_content, file.filename),
             case_id=case_id,
             user_id=str(current_user.id) if current_user else None
         )
 
-        # Check if processing was successful
-        if not result.get('success'):
-            return ZIPUploadResponse(
-                success=False,
-                message=result.get('error', 'Failed to process documents'),
-                case_id=case_id,
-                total_files=result.get('total_files', 0),
-                processed=result.get('processed', 0),
-                failed=result.get('failed', 0),
-                document_ids=result.get('document_ids', []),
-                errors=result.get('errors', [])
-            )
+        # New documents change the counts; don't serve a cached status poll.
+        if current_user:
+            await invalidate_cache(_upload_status_cache_key(case_id, str(current_user.id)))
 
-        # Success response
-        message = f"Successfully processed {result['processed']} files"
-        if result['failed'] > 0:
-            message += f" ({result['failed']} failed)"
+        # Build the response message
+        if result.success:
+            message = f"Successfully processed {result.processed} files"
+            if result.failed > 0:
+                message += f" ({result.failed} failed)"
+        else:
+            message = result.error or 'Failed to process documents'
 
         return ZIPUploadResponse(
-            success=True,
+            success=result.success,
             message=message,
             case_id=case_id,
-            total_files=result['total_files'],
-            processed=result['processed'],
-            failed=result['failed'],
-            document_ids=result['document_ids'],
-            errors=result['errors']
+            total_files=result.total_files,
+            processed=result.processed,
+            failed=result.failed,
+            document_ids=result.document_ids,
+            errors=result.errors
         )
 
     except HTTPException:
@@ -231,53 +229,88 @@ async def get_batch_upload_status(
     Returns:
         Status information
     """
-    from app.db.database import get_db_session
-
     try:
-        async with get_db_session() as db:
-            # Get case UUID
-            case_query = "SELECT id FROM cases WHERE case_id = $1 AND user_id = $2"
-            case_row = await db.fetchrow(case_query, case_id, current_user.id)
-
-            if not case_row:
-                raise HTTPException(status_code=404, detail="Case not found")
-
-            case_uuid = case_row['id']
-
-            # Get document counts
-            stats_query = """
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE status = 'processed') as processed,
-                    COUNT(*) FILTER (WHERE status = 'failed') as failed,
-                    COUNT(*) FILTER (WHERE doc_type = 'BANK_STATEMENT') as bank_statements,
-                    COUNT(*) FILTER (WHERE doc_type = 'GST_CERTIFICATE') as gst_certs,
-                    COUNT(*) FILTER (WHERE doc_type = 'GST_RETURNS') as gst_returns,
-                    COUNT(*) FILTER (WHERE doc_type = 'PAN_CARD') as pan_cards,
-                    COUNT(*) FILTER (WHERE doc_type = 'AADHAAR_CARD') as aadhaar_cards
-                FROM documents
-                WHERE case_id = $1
-            """
-
-            stats_row = await db.fetchrow(stats_query, case_uuid)
-
-            return {
-                "case_id": case_id,
-                "total_documents": stats_row['total'],
-                "processed": stats_row['processed'],
-                "failed": stats_row['failed'],
-                "by_type": {
-                    "bank_statements": stats_row['bank_statements'],
-                    "gst_certificates": stats_row['gst_certs'],
-                    "gst_returns": stats_row['gst_returns'],
-                    "pan_cards": stats_row['pan_cards'],
-                    "aadhaar_cards": stats_row['aadhaar_cards']
-                },
-                "completion_percentage": (stats_row['processed'] / stats_row['total'] * 100) if stats_row['total'] > 0 else 0
-            }
+        return await _compute_upload_status(case_id, str(current_user.id))
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting batch upload status: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# Response key -> documents.doc_type reported by the upload-status endpoint.
+_STATUS_DOC_TYPES = (
+    ("bank_statements", "BANK_STATEMENT"),
+    ("gst_certificates", "GST_CERTIFICATE"),
+    ("gst_returns", "GST_RETURNS"),
+    ("pan_cards", "PAN_CARD"),
+    ("aadhaar_cards", "AADHAAR_CARD"),
+)
+
+
+def _upload_status_cache_key(case_id: str, user_id: str) -> str:
+    return f"batch:upload-status:v1:{case_id}:{user_id}"
+
+
+@ttl_cache(_upload_status_cache_key, ttl=settings.BATCH_UPLOAD_STATUS_CACHE_TTL_SECONDS)
+async def _compute_upload_status(case_id: str, user_id: str) -> dict:
+    """Document counts for one case; polls within the TTL share one query."""
+    from app.db.database import get_db_session
+
+    async with get_db_session() as db:
+        # Resolve the case and count its documents in one round-trip.
+        # No row back means the case does not exist for this user. The case's
+        # documents are read once into t; status counters and a single
+        # GROUP BY doc_type both aggregate from it.
+        stats_query = """
+            WITH c AS (
+                SELECT id FROM cases WHERE case_id = $1 AND user_id = $2
+            ),
+            t AS MATERIALIZED (
+                SELECT d.id, d.status, d.doc_type
+                FROM documents d
+                INNER JOIN c ON d.case_id = c.id
+            )
+            SELECT
+                COUNT(t.id) as total,
+                COUNT(*) FILTER (WHERE t.status = 'processed') as processed,
+                COUNT(*) FILTER (WHERE t.status = 'failed') as failed,
+                COALESCE(
+                    100.0 * COUNT(*) FILTER (WHERE t.status = 'processed') / NULLIF(COUNT(t.id), 0),
+                    0
+                )::float as completion_percentage,
+                (
+                    SELECT COALESCE(jsonb_object_agg(doc_type, cnt), '{}'::jsonb)
+                    FROM (
+                        SELECT doc_type, COUNT(*) AS cnt
+                        FROM t
+                        WHERE doc_type IS NOT NULL
+                        GROUP BY doc_type
+                    ) g
+                ) as by_type
+            FROM c
+            LEFT JOIN t ON TRUE
+            GROUP BY c.id
+        """
+
+        stats_row = await db.fetchrow(stats_query, case_id, UUID(user_id))
+
+        if not stats_row:
+            raise HTTPException(status_code=404, detail="Case not found")
+
+        by_type = stats_row['by_type']
+        if isinstance(by_type, str):
+            by_type = json.loads(by_type)
+
+        return {
+            "case_id": case_id,
+            "total_documents": stats_row['total'],
+            "processed": stats_row['processed'],
+            "failed": stats_row['failed'],
+            "by_type": {
+                key: by_type.get(doc_type, 0)
+                for key, doc_type in _STATUS_DOC_TYPES
+            },
+            "completion_percentage": stats_row['completion_percentage']
+        }
@@ -1,21 +1,25 @@
 """Case management API endpoints."""
 import asyncio
-import io
 import mimetypes
+import os
 import zipfile
 import re
 import hashlib
 import secrets
 import logging
-from typing import List, Optional
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Callable, List, Optional
 from uuid import UUID
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, status, Query, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select, func, or_, text
+from sqlalchemy import select, func, or_, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -32,17 +36,21 @@ from app.schemas.shared import (
     DocumentChecklist,
     ManualFieldPrompt
 )
+from app.services.file_storage import LocalFileStorage
 from app.services.stages.stage0_case_entry import CaseEntryService
 from app.services.stages.stage1_checklist import ChecklistEngine
 from app.services.gst_api import get_gst_api_service
+from app.core.cache import get_async_redis
 from app.core.config import settings
 
 router = APIRouter(prefix="/cases", tags=["cases"])
 logger = logging.getLogger(__name__)
 
-GSTIN_RE = re.compile(r"^\d{2}[A-Z]{5}\d{4}[A-Z][A-Z\d]Z[A-Z\d]$", re.IGNORECASE)
-PAN_RE = re.compile(r"^[A-Z]{5}\d{4}[A-Z]$", re.IGNORECASE)
-CASE_ID_RE = re.compile(r"^CASE-\d{8}-\d{4}$", re.IGNORECASE)
+# Matched with fullmatch(), so the patterns carry no anchors.
+GSTIN_RE = re.compile(r"\d{2}[A-Z]{5}\d{4}[A-Z][A-Z\d]Z[A-Z\d]", re.IGNORECASE)
+PAN_RE = re.compile(r"[A-Z]{5}\d{4}[A-Z]", re.IGNORECASE)
+CASE_ID_RE = re.compile(r"CASE-\d{8}-\d{4}", re.IGNORECASE)
+NON_DIGIT_RE = re.compile(r"\D+")
 
 
 class ShareLinkRequest(BaseModel):
@@ -55,40 +63,190 @@ class PipelineTriggerRequest(BaseModel):
 
 
 async def _read_document_bytes(service: CaseEntryService, storage_key: str) -> Optional[bytes]:
-    """Read document bytes from configured storage with safe fallbacks."""
+    """Read document bytes from configured storage with safe fallbacks.
+
+    A resolvable local path is read directly, so the local backend resolves
+    the key once per read; other backends go through ``get_file``.
+    """
     if not storage_key:
         return None
 
-    file_content = await service.storage.get_file(storage_key)
-    if file_content is not None:
-        return file_content
+    file_path = _local_document_path(service, storage_key)
+    if file_path is not None:
+        return await asyncio.to_thread(file_path.read_bytes)
+
+    if isinstance(service.storage, LocalFileStorage):
+        # get_file would probe the same candidate paths again.
+        return None
+    return await service.storage.get_file(storage_key)
+
 
+def _local_document_path(service: CaseEntryService, storage_key: str) -> Optional[Path]:
+    """On-disk path for a stored document, when the file is local."""
+    if not storage_key:
+        return None
+
+    # LocalFileStorage only returns paths it has already found on disk.
     file_path = service.storage.get_file_path(storage_key)
-    if file_path and file_path.exists():
-        return file_path.read_bytes()
+    if file_path is not None:
+        return file_path
 
     raw_path = Path(storage_key)
     if raw_path.is_absolute() and raw_path.exists():
-        return raw_path.read_bytes()
+        return raw_path
 
     return None
 
 
+# Share tokens are stored as keyed BLAKE2b digests, so a leaked table is
+# useless without the server key. The key is derived once because SECRET_KEY
+# may exceed BLAKE2b's 64-byte key limit.
+_SHARE_TOKEN_KEY = hashlib.blake2b(
+    (settings.SHARE_LINK_HASH_KEY or settings.SECRET_KEY).encode("utf-8"),
+    digest_size=32,
+).digest()
+
+
 def _hash_share_token(token: str) -> str:
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=32, key=_SHARE_TOKEN_KEY).hexdigest()
+
+
+def _share_token_hashes(token: str) -> tuple[str, str]:
+    """Current and legacy (unkeyed SHA-256) hashes a stored link may carry.
+
+    The legacy form can be dropped once links created before the switch have
+    expired (at most ShareLinkRequest's 168 hours).
+    """
+    return _hash_share_token(token), hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class _ArchiveChunkSink:
+    """Write-only file object that collects ZipFile output until drained.
+
+    ZipFile falls back to data descriptors for unseekable outputs, so the
+    archive can be produced front to back and streamed as it is written.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: deque[bytes] = deque()
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# Already-compressed formats are stored as-is: DEFLATE costs CPU for almost no
+# size gain. Everything else uses the fastest DEFLATE level.
+_PRECOMPRESSED_MIME_TYPES = frozenset({
+    "application/pdf",
+    "image/jpeg",
+    "image/png",
+    "image/tiff",
+    "application/zip",
+})
+_ARCHIVE_DEFLATE_LEVEL = 1
+
+
+def _archive_entry(archive_name: str, mime_type: Optional[str]) -> zipfile.ZipInfo:
+    """ZipInfo for one document, stored or deflated by its content type."""
+    zinfo = zipfile.ZipInfo(archive_name, date_time=time.localtime(time.time())[:6])
+    zinfo.external_attr = 0o600 << 16
+    mime = (mime_type or mimetypes.guess_type(archive_name)[0] or "").split(";", 1)[0].strip().lower()
+    zinfo.compress_type = zipfile.ZIP_STORED if mime in _PRECOMPRESSED_MIME_TYPES else zipfile.ZIP_DEFLATED
+    # ZipFile.open() takes the level from the entry, not from the archive.
+    zinfo._compresslevel = _ARCHIVE_DEFLATE_LEVEL
+    return zinfo
+
+
+# zlib releases the GIL while compressing, so archive entries deflate on plain
+# threads. A dedicated pool caps compression at one thread per core across all
+# concurrent downloads and keeps it from queueing behind other to_thread work.
+_archive_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="case-archive",
+)
+
+# Documents are fed to the compressor in slices so compressed bytes reach the
+# client while a large file is still being written.
+_ARCHIVE_WRITE_SLICE = 1024 * 1024
+
+
+# Storage reads started ahead of the document being compressed. Bounds both
+# concurrent storage requests and the bytes held waiting for the archive.
+_ARCHIVE_READ_AHEAD = 8
+
 
+async def _iter_document_contents(
+    service: CaseEntryService, documents: List[Document]
+) -> AsyncIterator[tuple[Document, Optional[bytes]]]:
+    """Yield ``(doc, bytes)`` in document order while later reads run concurrently."""
+    pending: deque[tuple[Document, Optional[asyncio.Task]]] = deque()
 
-async def _build_case_documents_archive_bytes(service: CaseEntryService, case: Case) -> bytes:
-    archive_buffer = io.BytesIO()
+    async def _pop() -> tuple[Document, Optional[bytes]]:
+        doc, task = pending.popleft()
+        if task is None:
+            return doc, None
+        try:
+            return doc, await task
+        except Exception as exc:  # noqa: BLE001
+            # One unreadable file must not abort an archive that is already
+            # streaming; it gets the same OCR-text fallback as a missing one.
+            logger.warning("Archive read failed for document %s: %s", doc.id, exc)
+            return doc, None
+
+    try:
+        for doc in documents:
+            task = (
+                asyncio.ensure_future(_read_document_bytes(service, doc.storage_key))
+                if doc.storage_key else None
+            )
+            pending.append((doc, task))
+            if len(pending) >= _ARCHIVE_READ_AHEAD:
+                yield await _pop()
+        while pending:
+            yield await _pop()
+    finally:
+        for _, task in pending:
+            if task is not None:
+                task.cancel()
+
+
+async def _iter_case_documents_archive(
+    service: CaseEntryService,
+    case: Case,
+    unread_documents: Optional[list] = None,
+) -> AsyncIterator[bytes]:
+    """Yield a ZIP of the case documents, one document's compressed bytes at a time.
+
+    Storage reads run a few documents ahead; entries are still written in
+    document order so duplicate naming is stable. The generator runs after
+    the endpoint returns, so it touches storage only and never the session.
+    Ids of documents whose bytes could not be read are appended to
+    ``unread_documents`` when given.
+    """
+    loop = asyncio.get_running_loop()
+    sink = _ArchiveChunkSink()
     filename_counts: dict[str, int] = {}
     added_files = 0
 
-    with zipfile.ZipFile(archive_buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for doc in case.documents:
+    with zipfile.ZipFile(
+        sink,
+        mode="w",
+        compression=zipfile.ZIP_DEFLATED,
+        compresslevel=_ARCHIVE_DEFLATE_LEVEL,
+    ) as archive:
+        async for doc, file_content in _iter_document_contents(service, case.documents):
             original_name = doc.original_filename or (
                 Path(doc.storage_key).name if doc.storage_key else f"document_{doc.id}"
             )
-            file_content = await _read_document_bytes(service, doc.storage_key) if doc.storage_key else None
             if file_content is not None:
                 duplicate_idx = filename_counts.get(original_name, 0)
                 filename_counts[original_name] = duplicate_idx + 1
@@ -100,10 +258,25 @@ async def _build_case_documents_archive_bytes(service: CaseEntryService, case: C
                 else:
                     archive_name = original_name
 
-                archive.writestr(archive_name, file_content)
+                zinfo = _archive_entry(archive_name, doc.mime_type)
+                # Known up front so zipfile decides on ZIP64 before writing.
+                zinfo.file_size = len(file_content)
+                content_view = memoryview(file_content)
+                with archive.open(zinfo, mode="w") as entry:
+                    for offset in range(0, len(content_view), _ARCHIVE_WRITE_SLICE):
+                        # DEFLATE on multi-MB files would stall the event loop.
+                        await loop.run_in_executor(
+                            _archive_pool, entry.write, content_view[offset:offset + _ARCHIVE_WRITE_SLICE]
+                        )
+                        yield sink.drain()
+                content_view.release()
+                del file_content
                 added_files += 1
+                yield sink.drain()
                 continue
 
+            if unread_documents is not None:
+                unread_documents.append(doc.id)
             ocr_text = (doc.ocr_text or "").strip()
             if ocr_text:
                 stem = Path(original_name).stem or f"document_{doc.id}"
@@ -112,7 +285,11 @@ async def _build_case_documents_archive_bytes(service: CaseEntryService, case: C
                 filename_counts[fallback_name] = duplicate_idx + 1
                 if duplicate_idx > 0:
                     fallback_name = f"{Path(fallback_name).stem}_{duplicate_idx}.txt"
-                archive.writestr(
+                # OCR text for a long statement runs to megabytes; deflate it
+                # off the loop like the binaries.
+                await loop.run_in_executor(
+                    _archive_pool,
+                    archive.writestr,
                     fallback_name,
                     "Original binary file is currently unavailable in storage.\n\n"
                     f"Source filename: {original_name}\n"
@@ -121,6 +298,7 @@ async def _build_case_documents_archive_bytes(service: CaseEntryService, case: C
                     f"{ocr_text}",
                 )
                 added_files += 1
+                yield sink.drain()
 
         if added_files == 0:
             archive.writestr(
@@ -129,30 +307,141 @@ async def _build_case_documents_archive_bytes(service: CaseEntryService, case: C
                 "Please re-upload the latest documents and try again.",
             )
 
-    archive_buffer.seek(0)
-    return archive_buffer.getvalue()
+    # Closing the archive writes the central directory.
+    yield sink.drain()
+
+
+# Bump when the archive layout changes so cached archives are rebuilt.
+_ARCHIVE_CACHE_VERSION = "1"
+
+
+def _case_archive_cache_path(service: CaseEntryService, case: Case) -> Optional[Path]:
+    """Content-addressed cache location for a case's documents archive.
 
+    The name hashes each document's id, storage key and content hash, so any
+    upload or delete yields a new name and stale archives are never served.
+    """
+    fingerprint = "|".join(sorted(
+        f"{doc.id}:{doc.storage_key}:{doc.file_hash or ''}" for doc in case.documents
+    ))
+    digest = hashlib.blake2b(
+        f"{_ARCHIVE_CACHE_VERSION}|{fingerprint}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    archive_dir = service._archive_cache_dir(case.id)
+    return archive_dir / f"{digest}.zip" if archive_dir is not None else None
+
+
+async def _tee_archive_to_cache(
+    chunks: AsyncIterator[bytes],
+    cache_path: Path,
+    publish_if: Callable[[], bool],
+) -> AsyncIterator[bytes]:
+    """Relay archive chunks while writing them to ``cache_path``.
+
+    The file is renamed into place only once the archive is complete and
+    ``publish_if()`` agrees, and older archives for the case are removed then.
+    A client that disconnects part-way leaves nothing behind.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = cache_path.with_name(f"{cache_path.name}.{secrets.token_hex(4)}.partial")
+    handle = await asyncio.to_thread(partial_path.open, "wb")
+    completed = False
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(handle.write, chunk)
+            yield chunk
+        completed = True
+    finally:
+        handle.close()
+        if completed and publish_if():
+            await asyncio.to_thread(_publish_cached_archive, partial_path, cache_path)
+        else:
+            partial_path.unlink(missing_ok=True)
 
-def _detect_search_type(raw_term: str) -> str:
+
+def _publish_cached_archive(partial_path: Path, cache_path: Path) -> None:
+    partial_path.replace(cache_path)
+    for stale in cache_path.parent.glob("*.zip"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
+
+def _ensure_archive_within_limit(service: CaseEntryService, case: Case) -> None:
+    """Reject a case whose documents exceed MAX_ARCHIVE_MB before building anything.
+
+    Sizes come from documents.file_size_bytes, with a stat() of the local
+    file only for rows that predate the column.
+    """
+    total_bytes = 0
+    for doc in case.documents:
+        if doc.file_size_bytes is not None:
+            total_bytes += int(doc.file_size_bytes)
+            continue
+        file_path = _local_document_path(service, doc.storage_key)
+        if file_path is not None:
+            total_bytes += file_path.stat().st_size
+
+    if total_bytes > settings.MAX_ARCHIVE_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                f"Case documents exceed the {settings.MAX_ARCHIVE_MB}MB archive limit. "
+                "Download documents individually instead."
+            ),
+        )
+
+
+def _case_archive_response(service: CaseEntryService, case: Case, headers: dict) -> Response:
+    """Serve a cached archive for the current document set, or build and cache one."""
+    cache_path = _case_archive_cache_path(service, case)
+    if cache_path is not None and cache_path.exists():
+        return FileResponse(cache_path, media_type="application/zip", headers=headers)
+
+    # Archives with placeholder entries are not cached: a storage hiccup
+    # would otherwise stick until the document set changes.
+    unread_documents: list = []
+    chunks = _iter_case_documents_archive(service, case, unread_documents)
+    if cache_path is not None:
+        chunks = _tee_archive_to_cache(chunks, cache_path, publish_if=lambda: not unread_documents)
+    return StreamingResponse(chunks, media_type="application/zip", headers=headers)
+
+
+def _detect_search_type(raw_term: str) -> tuple[str, str, str]:
+    """Classify a search term.
+
+    Returns ``(search_type, normalized_upper, phone_tail)`` so callers reuse
+    the normalization instead of repeating it.
+    """
     value = (raw_term or "").strip()
     upper = value.upper()
-    digits = re.sub(r"\D+", "", value)
+    digits = NON_DIGIT_RE.sub("", value)
+    phone_tail = digits[-10:] if len(digits) >= 10 else digits
 
-    if CASE_ID_RE.match(upper):
-        return "case_id"
-    if GSTIN_RE.match(upper):
-        return "gstin"
-    if PAN_RE.match(upper):
-        return "pan"
-    if len(digits) >= 10:
-        return "phone"
-    return "company"
+    # Each identifier has a fixed length, so most free-text terms skip the
+    # regexes on a length compare.
+    term_length = len(upper)
+    if term_length == 18 and CASE_ID_RE.fullmatch(upper):
+        search_type = "case_id"
+    elif term_length == 15 and GSTIN_RE.fullmatch(upper):
+        search_type = "gstin"
+    elif term_length == 10 and PAN_RE.fullmatch(upper):
+        search_type = "pan"
+    elif len(digits) >= 10:
+        search_type = "phone"
+    else:
+        search_type = "company"
+    return search_type, upper, phone_tail
 
 
+@lru_cache(maxsize=1024)
 def _is_valid_gstin(gstin: Optional[str]) -> bool:
     if not gstin:
         return False
-    return bool(GSTIN_RE.match(gstin.strip().upper()))
+    return bool(GSTIN_RE.fullmatch(gstin.strip().upper()))
+
+
+def _score_band(score: float) -> str:
+    return "HIGH" if score >= 75 else "MEDIUM" if score >= 50 else "LOW"
 
 
 def _heuristic_pre_score(case_row: Case) -> dict:
@@ -164,8 +453,7 @@ def _heuristic_pre_score(case_row: Case) -> dict:
     if case_row.cibil_score_manual and case_row.cibil_score_manual >= 700:
         base += 12
     score = max(0.0, min(100.0, round(base, 2)))
-    band = "HIGH" if score >= 75 else "MEDIUM" if score >= 50 else "LOW"
-    return {"score": score, "band": band, "basis": "heuristic"}
+    return {"score": score, "band": _score_band(score), "basis": "heuristic"}
 
 
 @router.get("/gst/lookup/{gstin}")
@@ -204,28 +492,33 @@ async def smart_case_search(
     Smart unified search with lightweight quick-view background checks.
     """
     search_term = q.strip()
-    search_type = _detect_search_type(search_term)
-    normalized_upper = search_term.upper()
-    digits = re.sub(r"\D+", "", search_term)
-    phone_tail = digits[-10:] if len(digits) >= 10 else digits
+    search_type, normalized_upper, phone_tail = _detect_search_type(search_term)
 
-    query = (
-        select(Case)
-        .outerjoin(BorrowerFeature, BorrowerFeature.case_id == Case.id)
-        .outerjoin(User, User.id == Case.user_id)
-    )
+    # Related tables are only consulted through EXISTS / IN subqueries, so
+    # each case appears once without DISTINCT and Postgres can stop at LIMIT
+    # while walking cases in updated_at order.
+    query = select(Case)
 
+    # Identifier predicates compare UPPER(col) so the upper-cased trigram
+    # indexes serve them; borrower_name keeps ILIKE on its plain trigram index.
     if search_type == "case_id":
-        query = query.where(Case.case_id.ilike(f"%{normalized_upper}%"))
+        query = query.where(func.upper(Case.case_id).like(f"%{normalized_upper}%"))
     elif search_type == "gstin":
-        query = query.where(Case.gstin.ilike(f"%{normalized_upper}%"))
+        query = query.where(func.upper(Case.gstin).like(f"%{normalized_upper}%"))
     elif search_type == "pan":
-        query = query.where(BorrowerFeature.pan_number.ilike(f"%{normalized_upper}%"))
+        query = query.where(
+            select(BorrowerFeature.id)
+            .where(
+                BorrowerFeature.case_id == Case.id,
+                func.upper(BorrowerFeature.pan_number).like(f"%{normalized_upper}%"),
+            )
+            .exists()
+        )
     elif search_type == "phone":
         query = query.where(
             or_(
                 Case.whatsapp_number.ilike(f"%{phone_tail}%"),
-                User.phone.ilike(f"%{phone_tail}%"),
+                Case.user_id.in_(select(User.id).where(User.phone.ilike(f"%{phone_tail}%"))),
             )
         )
     else:
@@ -237,51 +530,74 @@ async def smart_case_search(
         else:
             query = query.where(Case.user_id == current_user.id)
 
-    query = query.order_by(Case.updated_at.desc()).distinct().limit(limit)
+    query = query.order_by(Case.updated_at.desc()).limit(limit)
     rows = (await db.execute(query)).scalars().all()
+    service = CaseEntryService(db)
 
     quick_view = None
     if rows:
         focus_case = rows[0]
 
-        # PAN + duplicates check (same PAN across org-scoped cases)
-        pan_row = await db.execute(
-            select(BorrowerFeature.pan_number).where(BorrowerFeature.case_id == focus_case.id)
-        )
-        pan_value = (pan_row.scalar_one_or_none() or "").strip().upper()
-        duplicate_count = 0
-        duplicate_case_ids: list[str] = []
-        if pan_value:
-            duplicate_query = (
-                select(Case.case_id)
-                .join(BorrowerFeature, BorrowerFeature.case_id == Case.id)
-                .where(BorrowerFeature.pan_number.ilike(pan_value))
+        # PAN, same-PAN duplicates in the caller's scope and the eligibility
+        # average for the pre-score, in one round-trip.
+        scope_org_id = None
+        scope_user_id = None
+        if current_user.role != "super_admin":
+            if current_user.organization_id:
+                scope_org_id = current_user.organization_id
+            else:
+                scope_user_id = current_user.id
+        quick_view_row = (
+            await db.execute(
+                text(
+                    """
+                    WITH pan AS (
+                        SELECT UPPER(TRIM(pan_number)) AS pan_number
+                        FROM borrower_features
+                        WHERE case_id = :case_uuid
+                        LIMIT 1
+                    ),
+                    dup AS (
+                        SELECT
+                            COUNT(*) FILTER (WHERE c.case_id <> :focus_case_id) AS n,
+                            (ARRAY_AGG(c.case_id) FILTER (WHERE c.case_id <> :focus_case_id))[1:5] AS ids
+                        FROM borrower_features b
+                        JOIN cases c ON c.id = b.case_id
+                        WHERE UPPER(b.pan_number) = (SELECT pan_number FROM pan WHERE pan_number <> '')
+                          AND (CAST(:org_id AS uuid) IS NULL OR c.organization_id = :org_id)
+                          AND (CAST(:user_id AS uuid) IS NULL OR c.user_id = :user_id)
+                    )
+                    SELECT
+                        (SELECT pan_number FROM pan) AS pan_number,
+                        dup.n AS duplicate_count,
+                        dup.ids AS duplicate_case_ids,
+                        (
+                            SELECT AVG(eligibility_score)::float
+                            FROM eligibility_results
+                            WHERE case_id = :case_uuid
+                        ) AS avg_score
+                    FROM dup
+                    """
+                ),
+                {
+                    "case_uuid": focus_case.id,
+                    "focus_case_id": focus_case.case_id,
+                    "org_id": scope_org_id,
+                    "user_id": scope_user_id,
+                },
             )
-            if current_user.role != "super_admin":
-                if current_user.organization_id:
-                    duplicate_query = duplicate_query.where(Case.organization_id == current_user.organization_id)
-                else:
-                    duplicate_query = duplicate_query.where(Case.user_id == current_user.id)
-            duplicate_rows = (await db.execute(duplicate_query)).scalars().all()
-            duplicate_case_ids = [case_id for case_id in duplicate_rows if case_id != focus_case.case_id][:5]
-            duplicate_count = max(len(duplicate_rows) - 1, 0)
+        ).one()
+        pan_value = quick_view_row.pan_number or ""
+        duplicate_count = int(quick_view_row.duplicate_count or 0)
+        duplicate_case_ids: list[str] = list(quick_view_row.duplicate_case_ids or [])
 
         # Pre-score: use existing eligibility average if available, else heuristic.
-        pre_score_row = await db.execute(
-            text(
-                """
-                SELECT AVG(eligibility_score)::float AS avg_score
-                FROM eligibility_results
-                WHERE case_id = :case_uuid
-                """
-            ),
-            {"case_uuid": focus_case.id},
-        )
-        pre_score_val = pre_score_row.scalar_one_or_none()
+        pre_score_val = quick_view_row.avg_score
         if pre_score_val is not None:
+            pre_score_val = float(pre_score_val)
             pre_score = {
-                "score": round(float(pre_score_val), 2),
-                "band": "HIGH" if float(pre_score_val) >= 75 else "MEDIUM" if float(pre_score_val) >= 50 else "LOW",
+                "score": round(pre_score_val, 2),
+                "band": _score_band(pre_score_val),
                 "basis": "eligibility_results_avg",
             }
         else:
@@ -316,7 +632,7 @@ async def smart_case_search(
     return {
         "query": search_term,
         "detected_type": search_type,
-        "matches": [CaseEntryService(db)._case_to_response(item).model_dump() for item in rows],
+        "matches": [service._case_to_response(item).model_dump(mode="json") for item in rows],
         "quick_view": quick_view,
     }
 
@@ -496,7 +812,7 @@ async def get_case_documents(
         List of DocumentResponse with document details
     """
     service = CaseEntryService(db)
-    case = await service._get_case_by_case_id(case_id, current_user)
+    case = await service._get_case_by_case_id(case_id, current_user, include_documents=True)
     return [service._document_to_response(doc) for doc in case.documents]
 
 
@@ -555,80 +871,160 @@ async def download_case_documents_archive(
     Useful for one-click lender sharing from the report/email workflow.
     """
     service = CaseEntryService(db)
-    case = await service._get_case_by_case_id(case_id, current_user)
+    case = await service._get_case_by_case_id(case_id, current_user, include_documents=True)
 
     if not case.documents:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No documents found for this case"
         )
-    archive_bytes = await _build_case_documents_archive_bytes(service, case)
-    return StreamingResponse(
-        iter([archive_bytes]),
-        media_type="application/zip",
+    _ensure_archive_within_limit(service, case)
+    return _case_archive_response(
+        service,
+        case,
         headers={
             "Content-Disposition": f'attachment; filename="{case_id}_documents.zip"'
-        }
+        },
     )
 
 
-@router.get("/share/{token}/download", name="download_shared_case_archive")
-async def download_shared_case_archive(
-    token: str,
-    db: AsyncSession = Depends(get_db),
-):
+def _share_rejection_key(token_hash: str) -> str:
+    return f"share:rejected:v1:{token_hash}"
+
+
+async def _cached_share_rejection(token_hash: str) -> Optional[HTTPException]:
+    """A recent terminal rejection for this token, if Redis remembers one."""
+    if not settings.CACHE_ENABLED:
+        return None
+    try:
+        cached = await get_async_redis().get(_share_rejection_key(token_hash))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Share-link rejection cache read skipped: %s", exc)
+        return None
+    if not cached:
+        return None
+    if isinstance(cached, bytes):
+        cached = cached.decode("utf-8")
+    status_code, _, detail = cached.partition(":")
+    return HTTPException(status_code=int(status_code), detail=detail)
+
+
+async def _remember_share_rejection(token_hash: str, exc: HTTPException) -> HTTPException:
+    """Cache a terminal rejection so browser retries of a dead link skip SQL.
+
+    Unknown, expired and exhausted links never become downloadable again, so
+    the entry needs no invalidation; the TTL only bounds Redis growth.
     """
-    Public download endpoint backed by expiring secure token links.
+    if settings.CACHE_ENABLED:
+        try:
+            await get_async_redis().setex(
+                _share_rejection_key(token_hash),
+                settings.SHARE_LINK_REJECTION_CACHE_TTL_SECONDS,
+                f"{exc.status_code}:{exc.detail}",
+            )
+        except Exception as cache_exc:  # noqa: BLE001
+            logger.debug("Share-link rejection cache write skipped: %s", cache_exc)
+    return exc
+
+
+async def _reject_share_download(db: AsyncSession, token_hashes: tuple[str, ...]) -> None:
+    """Raise the right error for a share link the download UPDATE did not match.
+
+    Only reached on the failure path. Links found expired or exhausted are
+    deactivated so later requests stop at the 404 check.
     """
-    token_hash = _hash_share_token(token)
-    result = await db.execute(
-        select(CaseShareLink).where(
-            CaseShareLink.token_hash == token_hash,
-            CaseShareLink.is_active.is_(True),
+    share_link = (
+        await db.execute(
+            select(CaseShareLink).where(
+                CaseShareLink.token_hash.in_(token_hashes),
+                CaseShareLink.is_active.is_(True),
+            )
         )
-    )
-    share_link = result.scalar_one_or_none()
+    ).scalar_one_or_none()
     if not share_link:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid or expired share link")
+        raise await _remember_share_rejection(
+            token_hashes[0],
+            HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid or expired share link"),
+        )
 
     now = datetime.now(timezone.utc)
     expires_at = share_link.expires_at
     if expires_at and expires_at.tzinfo is None:
         expires_at = expires_at.replace(tzinfo=timezone.utc)
-    if expires_at and now > expires_at:
+    if expires_at and now >= expires_at:
         share_link.is_active = False
         await db.commit()
-        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has expired")
+        raise await _remember_share_rejection(
+            token_hashes[0],
+            HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has expired"),
+        )
 
     if int(share_link.download_count or 0) >= int(share_link.max_downloads or 1):
         share_link.is_active = False
         await db.commit()
-        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link download limit reached")
+        raise await _remember_share_rejection(
+            token_hashes[0],
+            HTTPException(status_code=status.HTTP_410_GONE, detail="Share link download limit reached"),
+        )
+
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid or expired share link")
+
+
+@router.get("/share/{token}/download", name="download_shared_case_archive")
+async def download_shared_case_archive(
+    token: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Public download endpoint backed by expiring secure token links.
+    """
+    token_hashes = _share_token_hashes(token)
+    rejection = await _cached_share_rejection(token_hashes[0])
+    if rejection is not None:
+        raise rejection
+
+    # Validate and count the download in one statement. The row lock it takes
+    # is held until commit, so concurrent downloads cannot overrun the limit.
+    claimed = await db.execute(
+        update(CaseShareLink)
+        .where(
+            CaseShareLink.token_hash.in_(token_hashes),
+            CaseShareLink.is_active.is_(True),
+            CaseShareLink.expires_at > func.now(),
+            CaseShareLink.download_count < CaseShareLink.max_downloads,
+        )
+        .values(
+            download_count=CaseShareLink.download_count + 1,
+            last_accessed_at=func.now(),
+            is_active=CaseShareLink.download_count + 1 < CaseShareLink.max_downloads,
+        )
+        .returning(CaseShareLink.case_id)
+        .execution_options(synchronize_session=False)
+    )
+    share_case_id = claimed.scalar_one_or_none()
+    if share_case_id is None:
+        await _reject_share_download(db, token_hashes)
 
     case_result = await db.execute(
         select(Case)
-        .where(Case.id == share_link.case_id)
+        .where(Case.id == share_case_id)
         .options(selectinload(Case.documents))
     )
     case = case_result.scalar_one_or_none()
+    # Raising before commit rolls the claimed download back.
     if not case:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Case not found")
 
     service = CaseEntryService(db)
     if not case.documents:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No documents found for this case")
+    _ensure_archive_within_limit(service, case)
 
-    archive_bytes = await _build_case_documents_archive_bytes(service, case)
-
-    share_link.download_count = int(share_link.download_count or 0) + 1
-    share_link.last_accessed_at = now
-    if share_link.download_count >= int(share_link.max_downloads or 1):
-        share_link.is_active = False
     await db.commit()
 
-    return StreamingResponse(
-        iter([archive_bytes]),
-        media_type="application/zip",
+    return _case_archive_response(
+        service,
+        case,
         headers={
             "Content-Disposition": f'attachment; filename="{case.case_id}_documents.zip"',
             "Cache-Control": "no-store",
@@ -647,7 +1043,18 @@ async def preview_case_document(
     service = CaseEntryService(db)
     case = await service._get_case_by_case_id(case_id, current_user)
 
-    target_doc = next((doc for doc in case.documents if str(doc.id) == document_id), None)
+    # Fetch only the requested document rather than the whole case list.
+    try:
+        document_uuid = UUID(document_id)
+    except ValueError:
+        document_uuid = None
+    target_doc = None
+    if document_uuid is not None:
+        target_doc = (
+            await db.execute(
+                select(Document).where(Document.id == document_uuid, Document.case_id == case.id)
+            )
+        ).scalar_one_or_none()
     if not target_doc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -655,23 +1062,30 @@ async def preview_case_document(
         )
 
     filename = target_doc.original_filename or Path(target_doc.storage_key).name or "document"
-    file_content = await _read_document_bytes(service, target_doc.storage_key)
-    if file_content is None:
+    media_type = target_doc.mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    headers = {"Content-Disposition": f'inline; filename="{filename}"'}
+
+    # Local files are sent from disk in chunks rather than read whole first.
+    file_path = _local_document_path(service, target_doc.storage_key)
+    if file_path is not None:
+        return FileResponse(file_path, media_type=media_type, headers=headers)
+
+    # Other backends are read in chunks so the file is never held whole.
+    file_stream = None
+    if target_doc.storage_key and not isinstance(service.storage, LocalFileStorage):
+        file_stream = await service.storage.open_stream(target_doc.storage_key)
+    if file_stream is None:
         ocr_fallback = (target_doc.ocr_text or "").strip()
         if ocr_fallback:
             fallback_name = f"{Path(filename).stem or 'document'}_ocr.txt"
-            return StreamingResponse(
-                iter(
-                    [
-                        (
-                            "Original binary file is currently unavailable in storage.\n\n"
-                            f"Source filename: {filename}\n"
-                            f"Document ID: {target_doc.id}\n\n"
-                            "OCR TEXT:\n"
-                            f"{ocr_fallback}"
-                        ).encode("utf-8")
-                    ]
-                ),
+            return Response(
+                content=(
+                    "Original binary file is currently unavailable in storage.\n\n"
+                    f"Source filename: {filename}\n"
+                    f"Document ID: {target_doc.id}\n\n"
+                    "OCR TEXT:\n"
+                    f"{ocr_fallback}"
+                ).encode("utf-8"),
                 media_type="text/plain; charset=utf-8",
                 headers={
                     "Content-Disposition": f'inline; filename="{fallback_name}"'
@@ -682,15 +1096,7 @@ async def preview_case_document(
             detail="Unable to read this document file. Please re-upload and try again.",
         )
 
-    media_type = target_doc.mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
-
-    return StreamingResponse(
-        iter([file_content]),
-        media_type=media_type,
-        headers={
-            "Content-Disposition": f'inline; filename="{filename}"'
-        }
-    )
+    return StreamingResponse(file_stream, media_type=media_type, headers=headers)
 
 
 @router.get("/{case_id}/checklist", response_model=DocumentChecklist)
@@ -766,6 +1172,21 @@ async def get_manual_field_prompts(
         )
 
 
+async def _document_job_counts(db: AsyncSession, case_uuid: UUID):
+    """Per-status processing job counts for a case as one fixed-shape row."""
+    job_status = DocumentProcessingJob.status
+    result = await db.execute(
+        select(
+            func.count().filter(job_status == "queued").label("queued"),
+            func.count().filter(job_status == "processing").label("processing"),
+            func.count().filter(job_status == "completed").label("completed"),
+            func.count().filter(job_status == "failed").label("failed"),
+            func.count().label("total"),
+        ).where(DocumentProcessingJob.case_id == case_uuid)
+    )
+    return result.one()
+
+
 @router.get("/{case_id}/status")
 async def get_case_status(
     case_id: str,
@@ -779,16 +1200,11 @@ async def get_case_status(
     service = CaseEntryService(db)
     case = await service._get_case_by_case_id(case_id, current_user)
 
-    job_rows = await db.execute(
-        select(DocumentProcessingJob.status, func.count(DocumentProcessingJob.id))
-        .where(DocumentProcessingJob.case_id == case.id)
-        .group_by(DocumentProcessingJob.status)
-    )
-    counts = {status: int(count) for status, count in job_rows.all()}
-    queued = counts.get("queued", 0)
-    processing = counts.get("processing", 0)
-    completed = counts.get("completed", 0)
-    failed = counts.get("failed", 0)
+    job_counts = await _document_job_counts(db, case.id)
+    queued = job_counts.queued
+    processing = job_counts.processing
+    completed = job_counts.completed
+    failed = job_counts.failed
     total = queued + processing + completed + failed
     done = completed + failed
     completion_pct = int(round((done * 100 / total), 0)) if total > 0 else 100
@@ -810,6 +1226,25 @@ async def get_case_status(
     }
 
 
+# Strong references to in-process pipeline tasks; the event loop only keeps
+# weak ones, so an unreferenced task can be collected before it finishes.
+_pipeline_tasks: set = set()
+
+
+async def _run_pipeline_with_logging(case_id: str) -> None:
+    from app.services.jobs import run_case_pipeline_async
+
+    try:
+        await run_case_pipeline_async(case_id)
+    except Exception as exc:  # noqa: BLE001
+        logger.error(
+            "In-process pipeline failed for case %s: %s",
+            case_id,
+            exc,
+            exc_info=True,
+        )
+
+
 @router.post("/{case_id}/pipeline/trigger")
 async def trigger_case_pipeline(
     case_id: str,
@@ -843,14 +1278,9 @@ async def trigger_case_pipeline(
             "message": "Report is already generated for this case.",
         }
 
-    job_rows = await db.execute(
-        select(DocumentProcessingJob.status, func.count(DocumentProcessingJob.id))
-        .where(DocumentProcessingJob.case_id == case.id)
-        .group_by(DocumentProcessingJob.status)
-    )
-    counts = {status: int(count) for status, count in job_rows.all()}
-    queued = counts.get("queued", 0)
-    processing = counts.get("processing", 0)
+    job_counts = await _document_job_counts(db, case.id)
+    queued = job_counts.queued
+    processing = job_counts.processing
     pending = queued + processing
 
     # Upload flow already enqueues full pipeline automatically.
@@ -866,9 +1296,9 @@ async def trigger_case_pipeline(
             "document_jobs": {
                 "queued": queued,
                 "processing": processing,
-                "completed": counts.get("completed", 0),
-                "failed": counts.get("failed", 0),
-                "total": sum(counts.values()),
+                "completed": job_counts.completed,
+                "failed": job_counts.failed,
+                "total": job_counts.total,
             },
         }
 
@@ -892,22 +1322,17 @@ async def trigger_case_pipeline(
 
     # Non-blocking in-process fallback for local/non-RQ mode.
     try:
-        from app.services.jobs import run_case_pipeline_async
-
-        async def _run_inprocess_pipeline(target_case_id: str) -> None:
-            try:
-                await run_case_pipeline_async(target_case_id)
-            except Exception as exc:  # noqa: BLE001
-                logger.error(
-                    "In-process pipeline failed for case %s: %s",
-                    target_case_id,
-                    exc,
-                    exc_info=True,
-                )
+        # Import up front so a broken pipeline module still surfaces as a 503.
+        from app.services.jobs import run_case_pipeline_async  # noqa: F401
 
         case.status = "processing"
         await db.commit()
-        asyncio.create_task(_run_inprocess_pipeline(case.case_id))
+        task = asyncio.create_task(
+            _run_pipeline_with_logging(case.case_id),
+            name=f"pipeline:{case.case_id}",
+        )
+        _pipeline_tasks.add(task)
+        task.add_done_callback(_pipeline_tasks.discard)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=503, detail=f"Failed to start in-process pipeline: {exc}")
 
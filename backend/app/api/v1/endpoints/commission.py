@@ -1,15 +1,21 @@
 """Commission calculator and payout tracking endpoints."""
 
+import json
+import logging
 from datetime import date
-from typing import Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 from uuid import UUID
 
+import asyncpg
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from app.core.cache import get_async_redis, invalidate_cache
+from app.core.config import settings
 from app.core.deps import CurrentUser
 from app.db.database import get_db_session
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/commission", tags=["commission"])
 
@@ -31,6 +37,10 @@ class CommissionCalculationRequest(BaseModel):
     commission_pct: Optional[float] = Field(default=None, gt=0, le=100)
 
 
+class CommissionBatchCalculationRequest(BaseModel):
+    items: List[CommissionCalculationRequest] = Field(..., min_length=1, max_length=500)
+
+
 class CommissionPayoutUpsertRequest(BaseModel):
     case_id: str = Field(..., min_length=5, max_length=40)
     lender_name: str = Field(..., min_length=2, max_length=255)
@@ -43,29 +53,71 @@ class CommissionPayoutUpsertRequest(BaseModel):
     commission_pct: Optional[float] = Field(default=None, gt=0, le=100)
 
 
+_COMMISSION_PCT_SQL = """
+    SELECT commission_pct
+    FROM dsa_commission_rates
+    WHERE user_id = $1
+      AND LOWER(lender_name) = LOWER($2)
+      AND loan_type = $3
+    LIMIT 1
+"""
+
+
+def _rate_cache_key(user_id: UUID) -> str:
+    # One hash per user, so a rate change drops all of that user's entries.
+    return f"commission:rates:v1:{user_id}"
+
+
+def _rate_cache_field(lender_name: str, loan_type: str) -> str:
+    return f"{loan_type}:{lender_name.lower()}"
+
+
+async def _cached_commission_pct(user_id: UUID, lender_name: str, loan_type: str) -> Optional[float]:
+    if not settings.CACHE_ENABLED:
+        return None
+    try:
+        cached = await get_async_redis().hget(
+            _rate_cache_key(user_id), _rate_cache_field(lender_name, loan_type)
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Commission rate cache read skipped: %s", exc)
+        return None
+    return float(cached) if cached is not None else None
+
+
+async def _remember_commission_pct(user_id: UUID, lender_name: str, loan_type: str, pct: float) -> None:
+    if not settings.CACHE_ENABLED:
+        return
+    key = _rate_cache_key(user_id)
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.hset(key, _rate_cache_field(lender_name, loan_type), repr(pct))
+            pipe.expire(key, settings.COMMISSION_RATE_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Commission rate cache write skipped: %s", exc)
+
+
 async def _resolve_commission_pct(
     user_id: UUID,
     lender_name: str,
     loan_type: LoanType,
     explicit_pct: Optional[float] = None,
+    db: Optional[asyncpg.Connection] = None,
 ) -> float:
+    """Explicit pct, else the user's saved rate; pass ``db`` to reuse a held connection."""
     if explicit_pct is not None:
         return float(explicit_pct)
 
-    async with get_db_session() as db:
-        pct = await db.fetchval(
-            """
-            SELECT commission_pct
-            FROM dsa_commission_rates
-            WHERE user_id = $1
-              AND LOWER(lender_name) = LOWER($2)
-              AND loan_type = $3
-            LIMIT 1
-            """,
-            user_id,
-            lender_name,
-            loan_type,
-        )
+    cached = await _cached_commission_pct(user_id, lender_name, loan_type)
+    if cached is not None:
+        return cached
+
+    if db is not None:
+        pct = await db.fetchval(_COMMISSION_PCT_SQL, user_id, lender_name, loan_type)
+    else:
+        async with get_db_session() as conn:
+            pct = await conn.fetchval(_COMMISSION_PCT_SQL, user_id, lender_name, loan_type)
 
     if pct is None:
         raise HTTPException(
@@ -76,7 +128,43 @@ async def _resolve_commission_pct(
             ),
         )
 
-    return float(pct)
+    pct = float(pct)
+    await _remember_commission_pct(user_id, lender_name, loan_type, pct)
+    return pct
+
+
+async def _resolve_commission_pcts_bulk(
+    user_id: UUID,
+    pairs: List[Tuple[str, str]],
+) -> Dict[Tuple[str, str], float]:
+    """Saved rates for many (lender_name, loan_type) pairs in one query.
+
+    Keys are (lower(lender_name), loan_type); pairs without a saved rate are absent.
+    """
+    wanted = sorted({(lender_name.lower(), loan_type) for lender_name, loan_type in pairs})
+    if not wanted:
+        return {}
+
+    async with get_db_session() as db:
+        rows = await db.fetch(
+            """
+            SELECT DISTINCT ON (p.lender_key, p.loan_type)
+                p.lender_key, p.loan_type, r.commission_pct
+            FROM UNNEST($2::text[], $3::text[]) AS p(lender_key, loan_type)
+            INNER JOIN dsa_commission_rates r
+                ON LOWER(r.lender_name) = p.lender_key
+               AND r.loan_type = p.loan_type
+            WHERE r.user_id = $1
+            """,
+            user_id,
+            [lender_key for lender_key, _ in wanted],
+            [loan_type for _, loan_type in wanted],
+        )
+
+    return {
+        (row["lender_key"], row["loan_type"]): float(row["commission_pct"])
+        for row in rows
+    }
 
 
 @router.get("/rates")
@@ -116,6 +204,7 @@ async def upsert_commission_rate(payload: CommissionRateUpsertRequest, current_u
             payload.notes,
         )
 
+    await invalidate_cache(_rate_cache_key(current_user.id))
     return {"rate": dict(row)}
 
 
@@ -134,6 +223,8 @@ async def delete_commission_rate(rate_id: UUID, current_user: CurrentUser):
     if deleted == "DELETE 0":
         raise HTTPException(status_code=404, detail="Commission rate not found")
 
+    await invalidate_cache(_rate_cache_key(current_user.id))
+
     return {"deleted": True}
 
 
@@ -156,104 +247,171 @@ async def calculate_commission(payload: CommissionCalculationRequest, current_us
     }
 
 
-@router.post("/payouts")
-async def upsert_commission_payout(payload: CommissionPayoutUpsertRequest, current_user: CurrentUser):
-    pct = await _resolve_commission_pct(
-        user_id=current_user.id,
-        lender_name=payload.lender_name,
-        loan_type=payload.loan_type,
-        explicit_pct=payload.commission_pct,
+@router.post("/calculate-batch")
+async def calculate_commission_batch(payload: CommissionBatchCalculationRequest, current_user: CurrentUser):
+    # Saved rates for every row are fetched together instead of one /calculate per row.
+    saved = await _resolve_commission_pcts_bulk(
+        current_user.id,
+        [(item.lender_name, item.loan_type) for item in payload.items if item.commission_pct is None],
     )
-    commission_amount = round(float(payload.disbursed_amount) * pct / 100.0, 2)
 
-    async with get_db_session() as db:
-        case_row = await db.fetchrow(
-            """
-            SELECT id
-            FROM cases
-            WHERE case_id = $1 AND user_id = $2
-            LIMIT 1
-            """,
-            payload.case_id,
-            current_user.id,
+    results = []
+    for item in payload.items:
+        if item.commission_pct is not None:
+            pct = float(item.commission_pct)
+        else:
+            pct = saved.get((item.lender_name.lower(), item.loan_type))
+
+        result = {
+            "lender_name": item.lender_name,
+            "loan_type": item.loan_type,
+            "disbursed_amount": float(item.disbursed_amount),
+            "commission_pct": pct,
+            "commission_amount": None,
+        }
+        if pct is None:
+            result["error"] = f"No commission rate set for {item.lender_name} ({item.loan_type})."
+        else:
+            result["commission_amount"] = round(float(item.disbursed_amount) * pct / 100.0, 2)
+        results.append(result)
+
+    return {"results": results}
+
+
+_PAYOUT_RETURNING = """
+    id::text, lender_name, disbursed_amount, commission_pct,
+    commission_amount, disbursement_date, expected_payout_date,
+    actual_payout_date, payout_status, created_at
+"""
+
+# Case lookup and insert-or-update in one statement; the unique index on
+# (case_id, user_id, lower(lender_name)) backs the conflict target. No row
+# back means the case does not belong to this user.
+_PAYOUT_UPSERT_SQL = f"""
+    WITH target AS (
+        SELECT id
+        FROM cases
+        WHERE case_id = $1 AND user_id = $2
+        LIMIT 1
+    )
+    INSERT INTO commission_payouts (
+        case_id,
+        user_id,
+        lender_name,
+        disbursed_amount,
+        commission_pct,
+        commission_amount,
+        disbursement_date,
+        expected_payout_date,
+        actual_payout_date,
+        payout_status
+    )
+    SELECT target.id, $2, $3::varchar, $4::float8, $5::float8, $6::float8,
+           $7::date, $8::date, $9::date, $10::varchar
+    FROM target
+    ON CONFLICT (case_id, user_id, (LOWER(COALESCE(lender_name, ''))))
+    DO UPDATE SET
+        lender_name = EXCLUDED.lender_name,
+        disbursed_amount = EXCLUDED.disbursed_amount,
+        commission_pct = EXCLUDED.commission_pct,
+        commission_amount = EXCLUDED.commission_amount,
+        disbursement_date = EXCLUDED.disbursement_date,
+        expected_payout_date = EXCLUDED.expected_payout_date,
+        actual_payout_date = EXCLUDED.actual_payout_date,
+        payout_status = EXCLUDED.payout_status
+    RETURNING {_PAYOUT_RETURNING}
+"""
+
+# Same contract for databases without the unique index (duplicates pending
+# review): update the newest matching payout, else insert one.
+_PAYOUT_UPSERT_WITHOUT_KEY_SQL = f"""
+    WITH target AS (
+        SELECT id
+        FROM cases
+        WHERE case_id = $1 AND user_id = $2
+        LIMIT 1
+    ),
+    existing AS (
+        SELECT p.id
+        FROM commission_payouts p
+        INNER JOIN target ON p.case_id = target.id
+        WHERE p.user_id = $2
+          AND LOWER(COALESCE(p.lender_name, '')) = LOWER($3::varchar)
+        ORDER BY p.created_at DESC NULLS LAST
+        LIMIT 1
+    ),
+    updated AS (
+        UPDATE commission_payouts
+        SET
+            lender_name = $3::varchar,
+            disbursed_amount = $4::float8,
+            commission_pct = $5::float8,
+            commission_amount = $6::float8,
+            disbursement_date = $7::date,
+            expected_payout_date = $8::date,
+            actual_payout_date = $9::date,
+            payout_status = $10::varchar
+        WHERE id = (SELECT id FROM existing)
+        RETURNING {_PAYOUT_RETURNING}
+    ),
+    inserted AS (
+        INSERT INTO commission_payouts (
+            case_id,
+            user_id,
+            lender_name,
+            disbursed_amount,
+            commission_pct,
+            commission_amount,
+            disbursement_date,
+            expected_payout_date,
+            actual_payout_date,
+            payout_status
         )
-        if not case_row:
-            raise HTTPException(status_code=404, detail=f"Case {payload.case_id} not found")
+        SELECT target.id, $2, $3::varchar, $4::float8, $5::float8, $6::float8,
+               $7::date, $8::date, $9::date, $10::varchar
+        FROM target
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        RETURNING {_PAYOUT_RETURNING}
+    )
+    SELECT * FROM updated
+    UNION ALL
+    SELECT * FROM inserted
+"""
 
-        case_uuid = case_row["id"]
 
-        existing = await db.fetchrow(
-            """
-            SELECT id
-            FROM commission_payouts
-            WHERE case_id = $1
-              AND user_id = $2
-              AND LOWER(COALESCE(lender_name, '')) = LOWER($3)
-            LIMIT 1
-            """,
-            case_uuid,
+@router.post("/payouts")
+async def upsert_commission_payout(payload: CommissionPayoutUpsertRequest, current_user: CurrentUser):
+    # Rate lookup and upsert share one pooled connection.
+    async with get_db_session() as db:
+        pct = await _resolve_commission_pct(
+            user_id=current_user.id,
+            lender_name=payload.lender_name,
+            loan_type=payload.loan_type,
+            explicit_pct=payload.commission_pct,
+            db=db,
+        )
+        commission_amount = round(float(payload.disbursed_amount) * pct / 100.0, 2)
+
+        params = (
+            payload.case_id,
             current_user.id,
             payload.lender_name,
+            float(payload.disbursed_amount),
+            pct,
+            commission_amount,
+            payload.disbursement_date,
+            payload.expected_payout_date,
+            payload.actual_payout_date,
+            payload.payout_status,
         )
+        try:
+            row = await db.fetchrow(_PAYOUT_UPSERT_SQL, *params)
+        except asyncpg.InvalidColumnReferenceError:
+            # The unique index is withheld while duplicate payouts await review.
+            row = await db.fetchrow(_PAYOUT_UPSERT_WITHOUT_KEY_SQL, *params)
 
-        if existing:
-            row = await db.fetchrow(
-                """
-                UPDATE commission_payouts
-                SET
-                    lender_name = $2,
-                    disbursed_amount = $3,
-                    commission_pct = $4,
-                    commission_amount = $5,
-                    disbursement_date = $6,
-                    expected_payout_date = $7,
-                    actual_payout_date = $8,
-                    payout_status = $9
-                WHERE id = $1
-                RETURNING id::text, lender_name, disbursed_amount, commission_pct,
-                          commission_amount, disbursement_date, expected_payout_date,
-                          actual_payout_date, payout_status, created_at
-                """,
-                existing["id"],
-                payload.lender_name,
-                float(payload.disbursed_amount),
-                pct,
-                commission_amount,
-                payload.disbursement_date,
-                payload.expected_payout_date,
-                payload.actual_payout_date,
-                payload.payout_status,
-            )
-        else:
-            row = await db.fetchrow(
-                """
-                INSERT INTO commission_payouts (
-                    case_id,
-                    user_id,
-                    lender_name,
-                    disbursed_amount,
-                    commission_pct,
-                    commission_amount,
-                    disbursement_date,
-                    expected_payout_date,
-                    actual_payout_date,
-                    payout_status
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                RETURNING id::text, lender_name, disbursed_amount, commission_pct,
-                          commission_amount, disbursement_date, expected_payout_date,
-                          actual_payout_date, payout_status, created_at
-                """,
-                case_uuid,
-                current_user.id,
-                payload.lender_name,
-                float(payload.disbursed_amount),
-                pct,
-                commission_amount,
-                payload.disbursement_date,
-                payload.expected_payout_date,
-                payload.actual_payout_date,
-                payload.payout_status,
-            )
+    if not row:
+        raise HTTPException(status_code=404, detail=f"Case {payload.case_id} not found")
 
     return {
         "case_id": payload.case_id,
@@ -307,46 +465,51 @@ async def list_commission_payouts(
 
 @router.get("/overview")
 async def commission_overview(current_user: CurrentUser):
+    # Summary totals, rate count and the six-month trend in one round-trip.
     async with get_db_session() as db:
-        summary_row = await db.fetchrow(
+        row = await db.fetchrow(
             """
             SELECT
                 COUNT(*) AS total_records,
                 COALESCE(SUM(CASE WHEN payout_status = 'received' THEN commission_amount ELSE 0 END), 0) AS total_received,
                 COALESCE(SUM(CASE WHEN payout_status = 'pending' THEN commission_amount ELSE 0 END), 0) AS pending_amount,
                 COALESCE(SUM(CASE WHEN payout_status = 'overdue' THEN commission_amount ELSE 0 END), 0) AS overdue_amount,
-                COALESCE(SUM(commission_amount), 0) AS projected_total
-            FROM commission_payouts
-            WHERE user_id = $1
-            """,
-            current_user.id,
-        )
-
-        monthly_rows = await db.fetch(
-            """
-            SELECT
-                TO_CHAR(DATE_TRUNC('month', COALESCE(actual_payout_date::timestamp, disbursement_date::timestamp, created_at)), 'YYYY-MM') AS month,
-                COALESCE(SUM(commission_amount), 0) AS amount
+                COALESCE(SUM(commission_amount), 0) AS projected_total,
+                (
+                    SELECT COUNT(*)
+                    FROM dsa_commission_rates
+                    WHERE user_id = $1
+                ) AS rate_count,
+                (
+                    SELECT COALESCE(
+                        jsonb_agg(jsonb_build_object('month', m.month, 'amount', m.amount) ORDER BY m.month DESC),
+                        '[]'::jsonb
+                    )
+                    FROM (
+                        SELECT
+                            TO_CHAR(DATE_TRUNC('month', COALESCE(actual_payout_date::timestamp, disbursement_date::timestamp, created_at)), 'YYYY-MM') AS month,
+                            COALESCE(SUM(commission_amount), 0) AS amount
+                        FROM commission_payouts
+                        WHERE user_id = $1
+                        GROUP BY 1
+                        ORDER BY 1 DESC
+                        LIMIT 6
+                    ) m
+                ) AS monthly_trend
             FROM commission_payouts
             WHERE user_id = $1
-            GROUP BY 1
-            ORDER BY 1 DESC
-            LIMIT 6
             """,
             current_user.id,
         )
 
-        rate_count = await db.fetchval(
-            """
-            SELECT COUNT(*)
-            FROM dsa_commission_rates
-            WHERE user_id = $1
-            """,
-            current_user.id,
-        )
+    summary = dict(row)
+    rate_count = summary.pop("rate_count")
+    monthly_trend = summary.pop("monthly_trend")
+    if isinstance(monthly_trend, str):
+        monthly_trend = json.loads(monthly_trend)
 
     return {
-        "summary": dict(summary_row) if summary_row else {},
+        "summary": summary,
         "rate_count": int(rate_count or 0),
-        "monthly_trend": [dict(row) for row in monthly_rows],
+        "monthly_trend": monthly_trend,
     }
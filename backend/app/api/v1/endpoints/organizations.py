@@ -11,8 +11,13 @@ from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import CurrentDSAOwnerOrSuperAdmin, CurrentSuperAdmin, CurrentUser
-from app.core.security import hash_password
+from app.core.deps import (
+    CurrentDSAOwnerOrSuperAdmin,
+    CurrentSuperAdmin,
+    CurrentUser,
+    forget_unknown_login_email,
+)
+from app.core.security import hash_password_async
 from app.db.database import get_db
 from app.models.organization import Organization
 from app.models.user import User
@@ -96,7 +101,7 @@ async def create_dsa_owner(
 
     user = User(
         email=str(payload.email),
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         full_name=payload.full_name.strip(),
         phone=payload.phone,
         role="dsa_owner",
@@ -107,6 +112,7 @@ async def create_dsa_owner(
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await forget_unknown_login_email(user.email)
     return {"id": str(user.id), "email": user.email, "role": user.role, "organization_id": str(org.id)}
 
 
@@ -136,7 +142,7 @@ async def create_agent(
 
     user = User(
         email=str(payload.email),
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         full_name=payload.full_name.strip(),
         phone=payload.phone,
         role=role,
@@ -147,6 +153,7 @@ async def create_agent(
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await forget_unknown_login_email(user.email)
     return {"id": str(user.id), "email": user.email, "role": user.role, "organization_id": str(org.id)}
 
 
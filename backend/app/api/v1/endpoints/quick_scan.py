@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from openai import AsyncOpenAI
 from PIL import Image, ImageDraw, ImageFont
 from pydantic import BaseModel, Field
@@ -476,6 +476,5 @@ async def get_quick_scan_card(scan_id: UUID, current_user: CurrentUser):
 
     buffer = io.BytesIO()
     image.save(buffer, format="PNG")
-    buffer.seek(0)
 
-    return StreamingResponse(buffer, media_type="image/png")
+    return Response(content=buffer.getvalue(), media_type="image/png")
@@ -0,0 +1,129 @@
+"""Best-effort Redis caching for expensive read endpoints.
+
+Caching never becomes a hard dependency: when Redis is disabled or unreachable
+the wrapped coroutine simply runs uncached, so Redis-less deployments keep
+working exactly as before.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STALE_SUFFIX = ":stale"
+LOCK_SUFFIX = ":lock"
+# Stale copies outlive the fresh key so concurrent misses can be served while
+# a single request recomputes.
+STALE_TTL_MULTIPLIER = 10
+
+_redis: Redis | None = None
+
+
+def get_async_redis() -> Redis:
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.CACHE_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.CACHE_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _redis
+
+
+async def close_cache() -> None:
+    """Close the shared async Redis client (application shutdown)."""
+    global _redis
+    if _redis is not None:
+        try:
+            await _redis.aclose()
+        except Exception:  # noqa: BLE001
+            pass
+        _redis = None
+
+
+async def invalidate_cache(*keys: str) -> int:
+    """Drop fresh cache entries so the next read recomputes.
+
+    Stale copies are kept on purpose: requests racing the recompute still get
+    the previous value instead of stampeding the database.
+    """
+    if not settings.CACHE_ENABLED or not keys:
+        return 0
+    try:
+        return int(await get_async_redis().delete(*keys))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Cache invalidation skipped for %s: %s", keys, exc)
+        return 0
+
+
+def ttl_cache(
+    key: str | Callable[..., str],
+    ttl: int = 60,
+    lock_ms: int = 5000,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Cache a coroutine's JSON-serializable result in Redis under ``key``.
+
+    ``key`` is either a fixed string or a callable that receives the wrapped
+    coroutine's arguments and returns the key for that call.
+
+    On a miss only the request that wins a short ``SET NX PX`` mutex
+    recomputes; other concurrent callers are answered from the stale copy
+    when one exists. Hits and misses both return the JSON-decoded value, so
+    callers see the same types either way.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not settings.CACHE_ENABLED:
+                return await func(*args, **kwargs)
+
+            cache_key = key(*args, **kwargs) if callable(key) else key
+            redis = get_async_redis()
+            acquired = False
+            try:
+                cached = await redis.get(cache_key)
+                if cached is not None:
+                    return json.loads(cached)
+                acquired = bool(await redis.set(cache_key + LOCK_SUFFIX, "1", nx=True, px=lock_ms))
+                if not acquired:
+                    stale = await redis.get(cache_key + STALE_SUFFIX)
+                    if stale is not None:
+                        return json.loads(stale)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Cache read skipped for %s: %s", cache_key, exc)
+                return await func(*args, **kwargs)
+
+            try:
+                value = await func(*args, **kwargs)
+                # Round-trip through JSON so a miss returns what a hit would.
+                payload = json.dumps(value, default=str)
+                try:
+                    async with redis.pipeline(transaction=False) as pipe:
+                        pipe.setex(cache_key, ttl, payload)
+                        pipe.setex(cache_key + STALE_SUFFIX, ttl * STALE_TTL_MULTIPLIER, payload)
+                        await pipe.execute()
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("Cache write skipped for %s: %s", cache_key, exc)
+                return json.loads(payload)
+            finally:
+                # Release only our own mutex, including when func raised.
+                if acquired:
+                    try:
+                        await redis.delete(cache_key + LOCK_SUFFIX)
+                    except Exception as exc:  # noqa: BLE001
+                        logger.debug("Cache lock release skipped for %s: %s", cache_key, exc)
+
+        return wrapper
+
+    return decorator
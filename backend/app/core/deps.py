@@ -1,5 +1,9 @@
 """FastAPI dependencies for authentication and database access."""
 
+import hashlib
+import json
+import logging
+from datetime import datetime
 from typing import Annotated, Iterable
 from uuid import UUID
 
@@ -9,14 +13,115 @@ from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import get_async_redis, invalidate_cache
+from app.core.config import settings
 from app.core.security import decode_token
 from app.db.database import get_db
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
 
 # Security scheme for Bearer token
 security = HTTPBearer()
 
+# Columns route handlers read from the authenticated user. The password hash is
+# deliberately left out of the cache.
+_CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "phone",
+    "role",
+    "organization",
+    "organization_id",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+def _user_cache_key(user_id: UUID) -> str:
+    return f"auth:user:v1:{user_id}"
+
+
+def _unknown_email_key(email: str) -> str:
+    digest = hashlib.sha256(email.encode("utf-8")).hexdigest()
+    return f"auth:unknown-email:v1:{digest}"
+
+
+async def is_unknown_login_email(email: str) -> bool:
+    """True when a recent login already found no account for ``email``."""
+    if not settings.CACHE_ENABLED:
+        return False
+    try:
+        return bool(await get_async_redis().exists(_unknown_email_key(email)))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Unknown-email cache read skipped: %s", exc)
+        return False
+
+
+async def remember_unknown_login_email(email: str) -> None:
+    """Let repeated logins for a missing account skip the users lookup."""
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        await get_async_redis().setex(
+            _unknown_email_key(email),
+            settings.AUTH_UNKNOWN_EMAIL_CACHE_TTL_SECONDS,
+            "1",
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Unknown-email cache write skipped: %s", exc)
+
+
+async def forget_unknown_login_email(email: str) -> None:
+    """Call after creating a user so they can log in immediately."""
+    await invalidate_cache(_unknown_email_key(email))
+
+
+def _user_from_cache(payload: dict) -> User:
+    for field in ("id", "organization_id"):
+        if payload.get(field):
+            payload[field] = UUID(payload[field])
+    for field in ("created_at", "updated_at"):
+        if payload.get(field):
+            payload[field] = datetime.fromisoformat(payload[field])
+    return User(**payload)
+
+
+async def _load_user(db: AsyncSession, user_id: UUID) -> User | None:
+    """Fetch the user behind a token, answering from Redis when possible.
+
+    Cache hits return a transient ``User`` that is not attached to ``db``; it
+    is only meant for reading identity, role and org scope. Nothing in the
+    API changes a user's role or status, so entries are never invalidated;
+    a change made in the database takes effect once the entry expires,
+    after at most ``AUTH_USER_CACHE_TTL_SECONDS``.
+    """
+    cache_key = _user_cache_key(user_id)
+    if settings.CACHE_ENABLED:
+        try:
+            cached = await get_async_redis().get(cache_key)
+            if cached is not None:
+                return _user_from_cache(json.loads(cached))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Auth user cache read skipped for %s: %s", user_id, exc)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if user is not None and settings.CACHE_ENABLED:
+        payload = {field: getattr(user, field) for field in _CACHED_USER_FIELDS}
+        try:
+            await get_async_redis().setex(
+                cache_key,
+                settings.AUTH_USER_CACHE_TTL_SECONDS,
+                json.dumps(payload, default=str),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Auth user cache write skipped for %s: %s", user_id, exc)
+    return user
+
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
@@ -28,7 +133,7 @@ async def get_current_user(
     This function:
     1. Extracts the JWT token from the Authorization header
     2. Decodes and validates the token
-    3. Fetches the user from the database
+    3. Fetches the user (short-lived Redis cache, then the database)
     4. Returns the user object
 
     Args:
@@ -69,9 +174,8 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Fetch user (Redis first, then the database)
+    user = await _load_user(db, user_id)
 
     if user is None:
         raise credentials_exception
@@ -198,9 +302,8 @@ async def get_current_user_optional(
     except JWTError:
         return None
 
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Fetch user (Redis first, then the database)
+    user = await _load_user(db, user_id)
 
     if user is None or not user.is_active:
         return None
@@ -1,5 +1,6 @@
 """Security utilities for password hashing and JWT token management."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 
@@ -9,8 +10,11 @@ from passlib.context import CryptContext
 from app.core.config import settings
 
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context using bcrypt. The cost is pinned (passlib's default)
+# so a library upgrade cannot silently make every login slower; existing
+# hashes keep verifying at whatever cost they were created with.
+BCRYPT_ROUNDS = 12
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 
 def hash_password(plain_password: str) -> str:
@@ -40,6 +44,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# Hash verified against when a login names no account. Checking a password
+# against it costs the same as a real verification, so unknown and known emails
+# take equally long to reject. It is precomputed at BCRYPT_ROUNDS so no request
+# ever pays for generating it.
+DUMMY_PASSWORD_HASH = "$2b$12$LZi0.43lksAtDf8d6UTDcO42vVmfzJ1VCvHllSttvW/Dj2TwpYuAW"
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """Hash a password in a worker thread so bcrypt does not block the event loop."""
+    return await asyncio.to_thread(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so bcrypt does not block the event loop."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(
     user_id: str,
     email: str,
@@ -131,6 +131,8 @@ async def close_db() -> None:
     await engine.dispose()
     if _asyncpg_pool is not None:
         await _asyncpg_pool.close()
+    if _readonly_asyncpg_pool is not None:
+        await _readonly_asyncpg_pool.close()
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -138,6 +140,35 @@ async def close_db() -> None:
 # ═══════════════════════════════════════════════════════════════
 
 _asyncpg_pool: asyncpg.Pool = None
+_readonly_asyncpg_pool: asyncpg.Pool = None
+
+
+async def _create_asyncpg_pool(database_url: str) -> asyncpg.Pool:
+    # Convert SQLAlchemy async URL to standard postgres URL for asyncpg
+    db_url = database_url
+    # Remove the +asyncpg driver specification
+    db_url = db_url.replace("postgresql+asyncpg://", "")
+    db_url = db_url.replace("postgresql://", "")
+
+    # Parse connection details
+    # Format: postgres:postgres@localhost:5432/dsa_case_os
+    parts = db_url.split("@")
+    user_pass = parts[0].split(":")
+    host_db = parts[1].split("/")
+    host_port = host_db[0].split(":")
+
+    return await asyncpg.create_pool(
+        user=user_pass[0],
+        password=user_pass[1] if len(user_pass) > 1 else "",
+        host=host_port[0],
+        port=int(host_port[1]) if len(host_port) > 1 else 5432,
+        database=host_db[1],
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_SECONDS,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        max_cached_statement_lifetime=settings.DB_STATEMENT_CACHE_LIFETIME_SECONDS,
+    )
 
 
 async def get_asyncpg_pool() -> asyncpg.Pool:
@@ -145,32 +176,23 @@ async def get_asyncpg_pool() -> asyncpg.Pool:
     global _asyncpg_pool
 
     if _asyncpg_pool is None:
-        # Convert SQLAlchemy async URL to standard postgres URL for asyncpg
-        db_url = settings.DATABASE_URL
-        # Remove the +asyncpg driver specification
-        db_url = db_url.replace("postgresql+asyncpg://", "")
-        db_url = db_url.replace("postgresql://", "")
-
-        # Parse connection details
-        # Format: postgres:postgres@localhost:5432/dsa_case_os
-        parts = db_url.split("@")
-        user_pass = parts[0].split(":")
-        host_db = parts[1].split("/")
-        host_port = host_db[0].split(":")
-
-        _asyncpg_pool = await asyncpg.create_pool(
-            user=user_pass[0],
-            password=user_pass[1] if len(user_pass) > 1 else "",
-            host=host_port[0],
-            port=int(host_port[1]) if len(host_port) > 1 else 5432,
-            database=host_db[1],
-            min_size=2,
-            max_size=10
-        )
+        _asyncpg_pool = await _create_asyncpg_pool(settings.DATABASE_URL)
 
     return _asyncpg_pool
 
 
+async def get_readonly_asyncpg_pool() -> asyncpg.Pool:
+    """Get the read replica pool, or the primary pool when no replica is configured."""
+    global _readonly_asyncpg_pool
+
+    if not settings.READONLY_DATABASE_URL:
+        return await get_asyncpg_pool()
+    if _readonly_asyncpg_pool is None:
+        _readonly_asyncpg_pool = await _create_asyncpg_pool(settings.READONLY_DATABASE_URL)
+
+    return _readonly_asyncpg_pool
+
+
 @asynccontextmanager
 async def get_db_session():
     """Get a raw asyncpg connection from the pool.
@@ -186,3 +208,22 @@ async def get_db_session():
     pool = await get_asyncpg_pool()
     async with pool.acquire() as connection:
         yield connection
+
+
+@asynccontextmanager
+async def get_readonly_db_session(statement_timeout_ms: int | None = None):
+    """Get a raw connection for read-only reporting queries.
+
+    The connection comes from the replica pool when READONLY_DATABASE_URL is
+    set and runs inside a read-only transaction with a local statement_timeout,
+    so a runaway aggregate is cancelled instead of pinning the server.
+    """
+    timeout_ms = statement_timeout_ms or settings.READONLY_STATEMENT_TIMEOUT_MS
+    pool = await get_readonly_asyncpg_pool()
+    async with pool.acquire() as connection:
+        async with connection.transaction(readonly=True):
+            await connection.execute(
+                "SELECT set_config('statement_timeout', $1, true)",
+                str(timeout_ms),
+            )
+            yield connection
@@ -8,6 +8,7 @@ To keep production upgrades safe, this module applies additive migrations with
 from __future__ import annotations
 
 import logging
+import re
 
 import asyncpg
 
@@ -99,50 +100,67 @@ RUNTIME_MIGRATIONS: list[str] = [
       END;
     END $$;
     """,
-    # User/tenant columns
-    "ALTER TABLE users ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_users_organization_id ON users(organization_id);",
+    # Tenant columns: one transaction, and only tables still missing the column
+    # are ALTERed, so restarts no longer take ACCESS EXCLUSIVE locks on every table.
+    """
+    DO $$
+    DECLARE
+      t TEXT;
+    BEGIN
+      FOREACH t IN ARRAY ARRAY[
+        'users',
+        'cases',
+        'documents',
+        'document_processing_jobs',
+        'extracted_fields',
+        'borrower_features',
+        'quick_scans',
+        'copilot_queries',
+        'case_reports',
+        'eligibility_results',
+        'leads',
+        'lender_submissions',
+        'submission_queries',
+        'dsa_commission_rates',
+        'commission_payouts',
+        'lender_pincodes',
+        'lender_branches',
+        'lender_rms',
+        'lender_products',
+        'lenders'
+      ] LOOP
+        IF to_regclass(t) IS NOT NULL AND NOT EXISTS (
+          SELECT 1 FROM information_schema.columns
+          WHERE table_schema = 'public' AND table_name = t AND column_name = 'organization_id'
+        ) THEN
+          EXECUTE format('ALTER TABLE %I ADD COLUMN organization_id UUID', t);
+        END IF;
+      END LOOP;
+    END $$;
+    """,
     "ALTER TABLE users ALTER COLUMN role SET DEFAULT 'agent';",
-    # Case/document tenant columns
-    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_cases_organization_id ON cases(organization_id);",
     "ALTER TABLE cases ADD COLUMN IF NOT EXISTS business_address TEXT;",
-    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_documents_organization_id ON documents(organization_id);",
-    "ALTER TABLE document_processing_jobs ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_doc_jobs_organization_id ON document_processing_jobs(organization_id);",
-    "ALTER TABLE extracted_fields ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_extracted_fields_organization_id ON extracted_fields(organization_id);",
-    "ALTER TABLE borrower_features ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_borrower_features_organization_id ON borrower_features(organization_id);",
-    "ALTER TABLE quick_scans ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_quick_scans_org_id ON quick_scans(organization_id);",
-    "ALTER TABLE copilot_queries ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_copilot_queries_org_id ON copilot_queries(organization_id);",
-    "ALTER TABLE case_reports ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_case_reports_org_id ON case_reports(organization_id);",
-    "ALTER TABLE eligibility_results ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_eligibility_org_id ON eligibility_results(organization_id);",
-    "ALTER TABLE leads ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_leads_org_id ON leads(organization_id);",
-    "ALTER TABLE lender_submissions ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_lender_submissions_org_id ON lender_submissions(organization_id);",
-    "ALTER TABLE submission_queries ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_submission_queries_org_id ON submission_queries(organization_id);",
-    "ALTER TABLE dsa_commission_rates ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_dsa_commission_rates_org_id ON dsa_commission_rates(organization_id);",
-    "ALTER TABLE commission_payouts ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_commission_payouts_org_id ON commission_payouts(organization_id);",
-    "ALTER TABLE lender_pincodes ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_lender_pincodes_org_id ON lender_pincodes(organization_id);",
-    "ALTER TABLE lender_branches ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_lender_branches_org_id ON lender_branches(organization_id);",
-    "ALTER TABLE lender_rms ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_lender_rms_org_id ON lender_rms(organization_id);",
-    "ALTER TABLE lender_products ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_lender_products_org_id ON lender_products(organization_id);",
-    "ALTER TABLE lenders ADD COLUMN IF NOT EXISTS organization_id UUID;",
-    "CREATE INDEX IF NOT EXISTS idx_lenders_org_id ON lenders(organization_id);",
+    # CONCURRENTLY avoids blocking writes while tenant indexes build on a live DB.
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_organization_id ON users(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_organization_id ON cases(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_organization_id ON documents(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doc_jobs_organization_id ON document_processing_jobs(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_extracted_fields_organization_id ON extracted_fields(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_borrower_features_organization_id ON borrower_features(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quick_scans_org_id ON quick_scans(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_copilot_queries_org_id ON copilot_queries(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_case_reports_org_id ON case_reports(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_eligibility_org_id ON eligibility_results(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leads_org_id ON leads(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_submissions_org_id ON lender_submissions(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submission_queries_org_id ON submission_queries(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dsa_commission_rates_org_id ON dsa_commission_rates(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_commission_payouts_org_id ON commission_payouts(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_pincodes_org_id ON lender_pincodes(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_branches_org_id ON lender_branches(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_rms_org_id ON lender_rms(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_products_org_id ON lender_products(organization_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lenders_org_id ON lenders(organization_id);",
     # Subscription plan seed
     """
     INSERT INTO subscription_plans (code, name, monthly_price_inr, monthly_case_limit, monthly_bank_analysis_limit, features_json)
@@ -168,19 +186,66 @@ RUNTIME_MIGRATIONS: list[str] = [
     );
     """,
     "ALTER TABLE lender_documents ADD COLUMN IF NOT EXISTS embedding_json TEXT NOT NULL DEFAULT '[]';",
+    # halfvec (pgvector >= 0.7) halves embedding storage; older installs keep VECTOR.
     """
     DO $$
     BEGIN
       IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
-        ALTER TABLE lender_documents ADD COLUMN IF NOT EXISTS embedding VECTOR(384);
+        IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'halfvec') THEN
+          ALTER TABLE lender_documents ADD COLUMN IF NOT EXISTS embedding halfvec(384);
+          IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'lender_documents' AND column_name = 'embedding' AND udt_name = 'vector'
+          ) THEN
+            ALTER TABLE lender_documents ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+          END IF;
+        ELSE
+          ALTER TABLE lender_documents ADD COLUMN IF NOT EXISTS embedding VECTOR(384);
+        END IF;
       END IF;
     END $$;
     """,
+    # Dedupe on a stored chunk hash (mirrors alembic 20261018_0006) so inserts
+    # no longer recompute md5(chunk_text) for the unique index.
+    "ALTER TABLE lender_documents ADD COLUMN IF NOT EXISTS chunk_hash BYTEA GENERATED ALWAYS AS (decode(md5(chunk_text), 'hex')) STORED;",
     """
-    CREATE UNIQUE INDEX IF NOT EXISTS uq_lender_documents_dedupe
-    ON lender_documents (organization_id, lender_name, product_type, COALESCE(section_title, ''), md5(chunk_text));
+    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_lender_documents_dedupe_hash
+    ON lender_documents (organization_id, lender_name, product_type, COALESCE(section_title, ''), chunk_hash);
+    """,
+    # Retire the md5 expression index only once the hash index is usable, so
+    # the table is never left without a dedupe constraint.
+    """
+    DO $$
+    BEGIN
+      IF EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'uq_lender_documents_dedupe_hash' AND i.indisvalid
+      ) THEN
+        DROP INDEX IF EXISTS uq_lender_documents_dedupe;
+      END IF;
+    END $$;
     """,
     "CREATE INDEX IF NOT EXISTS idx_lender_documents_org ON lender_documents(organization_id);",
+    # ANN index for RAG search; embeddings are normalized so inner-product ops apply.
+    """
+    DO $$
+    DECLARE
+      embedding_type TEXT;
+    BEGIN
+      SELECT udt_name INTO embedding_type
+      FROM information_schema.columns
+      WHERE table_name = 'lender_documents' AND column_name = 'embedding';
+
+      IF embedding_type = 'halfvec' THEN
+        CREATE INDEX IF NOT EXISTS idx_lender_docs_hnsw
+        ON lender_documents USING hnsw (embedding halfvec_ip_ops) WITH (m = 16, ef_construction = 64);
+      ELSIF embedding_type = 'vector' THEN
+        CREATE INDEX IF NOT EXISTS idx_lender_docs_hnsw
+        ON lender_documents USING hnsw (embedding vector_ip_ops) WITH (m = 16, ef_construction = 64);
+      END IF;
+    END $$;
+    """,
     # Secure share links for oversized email collaboration payloads
     """
     CREATE TABLE IF NOT EXISTS case_share_links (
@@ -199,6 +264,308 @@ RUNTIME_MIGRATIONS: list[str] = [
     """,
     "CREATE INDEX IF NOT EXISTS idx_case_share_links_case_id ON case_share_links(case_id);",
     "CREATE INDEX IF NOT EXISTS idx_case_share_links_expires_at ON case_share_links(expires_at);",
+    # Admin dashboard: O(1) row totals maintained by statement-level triggers
+    """
+    CREATE TABLE IF NOT EXISTS platform_counters (
+        entity VARCHAR(64) PRIMARY KEY,
+        row_count BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    """,
+    # Triggers append per-statement deltas instead of updating the shared
+    # counter row, so concurrent writers never queue behind one row lock.
+    # The MV refresher folds deltas into platform_counters periodically.
+    """
+    CREATE TABLE IF NOT EXISTS platform_counter_deltas (
+        id BIGSERIAL PRIMARY KEY,
+        entity VARCHAR(64) NOT NULL,
+        delta BIGINT NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_platform_counter_deltas_entity ON platform_counter_deltas(entity);",
+    """
+    CREATE OR REPLACE FUNCTION bump_platform_counter() RETURNS trigger AS $$
+    DECLARE
+      n BIGINT;
+    BEGIN
+      IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO n FROM new_rows;
+      ELSIF TG_OP = 'DELETE' THEN
+        SELECT -COUNT(*) INTO n FROM old_rows;
+      ELSIF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM platform_counter_deltas WHERE entity = TG_TABLE_NAME;
+        UPDATE platform_counters SET row_count = 0, updated_at = NOW() WHERE entity = TG_TABLE_NAME;
+        RETURN NULL;
+      END IF;
+      -- Statements that changed nothing (e.g. ON CONFLICT DO NOTHING) write nothing.
+      IF n <> 0 THEN
+        INSERT INTO platform_counter_deltas (entity, delta) VALUES (TG_TABLE_NAME, n);
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    # Seed each counter under a write lock in the same transaction that installs
+    # its triggers, so no insert/delete can slip between the COUNT and the trigger.
+    """
+    DO $$
+    DECLARE
+      t TEXT;
+    BEGIN
+      FOREACH t IN ARRAY ARRAY['users', 'cases', 'documents', 'quick_scans', 'leads', 'lender_submissions'] LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_' || t || '_counter_ins') THEN
+          EXECUTE format('LOCK TABLE %I IN SHARE ROW EXCLUSIVE MODE', t);
+          EXECUTE format(
+            'INSERT INTO platform_counters (entity, row_count) SELECT %L, COUNT(*) FROM %I '
+            'ON CONFLICT (entity) DO UPDATE SET row_count = EXCLUDED.row_count, updated_at = NOW()',
+            t, t
+          );
+          EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_platform_counter()',
+            'trg_' || t || '_counter_ins', t
+          );
+          EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_platform_counter()',
+            'trg_' || t || '_counter_del', t
+          );
+          EXECUTE format(
+            'CREATE TRIGGER %I AFTER TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_platform_counter()',
+            'trg_' || t || '_counter_trunc', t
+          );
+        END IF;
+      END LOOP;
+    END $$;
+    """,
+    # BRIN indexes for append-only created_at windows (7d/24h admin tiles)
+    "CREATE INDEX IF NOT EXISTS idx_users_created_at_brin ON users USING brin (created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_copilot_queries_created_at_brin ON copilot_queries USING brin (created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_leads_created_at_brin ON leads USING brin (created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_lender_submissions_created_at_brin ON lender_submissions USING brin (created_at);",
+    # Admin dashboard: per-status case rollup refreshed by the MV refresher
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_admin_case_stats AS
+    SELECT
+        COALESCE(status, 'unknown') AS status,
+        COUNT(*)::bigint AS cnt,
+        COALESCE(SUM(completeness_score), 0)::double precision AS completeness_sum,
+        COUNT(completeness_score)::bigint AS scored_count
+    FROM cases
+    GROUP BY COALESCE(status, 'unknown');
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_admin_case_stats_status ON mv_admin_case_stats(status);",
+    # Admin user list: per-user case aggregates and newest-first paging
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_user_created ON cases (user_id, created_at DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at ON users (created_at DESC);",
+    # Keyset pagination: (created_at, id) seek for admin user/case lists
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_id ON users (created_at DESC, id DESC);",
+    # Covers every /admin/cases column so unfiltered pages can be index-only
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_created_at_id_covering ON cases (created_at DESC, id DESC) "
+    "INCLUDE (case_id, borrower_name, status, program_type, completeness_score, user_id, updated_at);",
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_cases_created_at_id;",
+    # Trigram indexes so the admin ILIKE '%q%' user search avoids seq scans
+    """
+    DO $$
+    BEGIN
+      IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+      END IF;
+    END $$;
+    """,
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_trgm ON users USING gin (email gin_trgm_ops);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_fullname_trgm ON users USING gin (full_name gin_trgm_ops);",
+    # Trigram indexes for the smart case search. Identifier columns are indexed
+    # upper-cased to match its UPPER(col) LIKE '%Q%' predicates. Built
+    # concurrently so writes continue; skipped when pg_trgm is unavailable.
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_case_id_upper_trgm ON cases USING gin (upper(case_id) gin_trgm_ops);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_gstin_upper_trgm ON cases USING gin (upper(gstin) gin_trgm_ops);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_borrower_name_trgm ON cases USING gin (borrower_name gin_trgm_ops);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_borrower_features_pan_upper_trgm ON borrower_features USING gin (upper(pan_number) gin_trgm_ops);",
+    # Exact upper-case PAN lookups for the smart-search duplicate check
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_borrower_features_pan_upper ON borrower_features (upper(pan_number));",
+    # BRIN for time-windowed case/document scans (stats tiles, operational logs)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_created_at_brin ON cases USING brin (created_at) WITH (pages_per_range = 32);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_updated_at_brin ON cases USING brin (updated_at) WITH (pages_per_range = 32);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_created_at_brin ON documents USING brin (created_at);",
+    # Partial index for the failed-cases operational log (small, hot subset)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_status_failed ON cases (updated_at DESC) WHERE status = 'failed';",
+    # /admin/cases?status=...: filter and keyset order served by one index
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_status_created_id ON cases (status, created_at DESC, id DESC);",
+    # Admin dashboard: per-day creation counts behind the 7d tiles
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_platform_daily_stats AS
+    SELECT date_trunc('day', created_at) AS day, 'users'::text AS entity, COUNT(*)::bigint AS cnt
+    FROM users WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('day', created_at), 'cases', COUNT(*)
+    FROM cases WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('day', created_at), 'quick_scans', COUNT(*)
+    FROM quick_scans WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('day', created_at), 'copilot_queries', COUNT(*)
+    FROM copilot_queries WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('day', created_at), 'leads', COUNT(*)
+    FROM leads WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('day', created_at), 'lender_submissions', COUNT(*)
+    FROM lender_submissions WHERE created_at >= NOW() - INTERVAL '31 days' GROUP BY 1;
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_platform_daily_stats ON mv_platform_daily_stats(day, entity);",
+    # Admin user-usage matrix: per-user 30-day counters refreshed in background
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_usage_30d AS
+    WITH case_agg AS (
+        SELECT
+            user_id,
+            COUNT(*)::int AS cases_total,
+            COUNT(*) FILTER (WHERE status = 'failed' AND updated_at >= NOW() - INTERVAL '30 days')::int AS failed_cases_30d,
+            MAX(updated_at) AS last_case_at
+        FROM cases
+        GROUP BY user_id
+    ),
+    doc_agg AS (
+        SELECT
+            c.user_id,
+            COUNT(*) FILTER (WHERE d.created_at >= NOW() - INTERVAL '30 days')::int AS docs_uploaded_30d,
+            MAX(d.created_at) AS last_doc_at
+        FROM documents d
+        INNER JOIN cases c ON c.id = d.case_id
+        GROUP BY c.user_id
+    ),
+    quick_scan_agg AS (
+        SELECT
+            user_id,
+            COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')::int AS quick_scans_30d,
+            MAX(created_at) AS last_quick_scan_at
+        FROM quick_scans
+        GROUP BY user_id
+    ),
+    copilot_agg AS (
+        SELECT
+            user_id,
+            COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')::int AS copilot_queries_30d,
+            MAX(created_at) AS last_copilot_at
+        FROM copilot_queries
+        GROUP BY user_id
+    ),
+    lead_agg AS (
+        SELECT
+            created_by AS user_id,
+            COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')::int AS leads_30d,
+            MAX(created_at) AS last_lead_at
+        FROM leads
+        GROUP BY created_by
+    ),
+    submission_agg AS (
+        SELECT
+            c.user_id,
+            COUNT(*) FILTER (WHERE ls.created_at >= NOW() - INTERVAL '30 days')::int AS submissions_30d,
+            MAX(ls.created_at) AS last_submission_at
+        FROM lender_submissions ls
+        INNER JOIN cases c ON c.id = ls.case_id
+        GROUP BY c.user_id
+    )
+    SELECT
+        u.id AS user_id,
+        COALESCE(ca.cases_total, 0) AS cases_total,
+        COALESCE(da.docs_uploaded_30d, 0) AS docs_uploaded_30d,
+        COALESCE(qa.quick_scans_30d, 0) AS quick_scans_30d,
+        COALESCE(coa.copilot_queries_30d, 0) AS copilot_queries_30d,
+        COALESCE(la.leads_30d, 0) AS leads_30d,
+        COALESCE(sa.submissions_30d, 0) AS submissions_30d,
+        COALESCE(ca.failed_cases_30d, 0) AS failed_cases_30d,
+        GREATEST(
+            ca.last_case_at,
+            da.last_doc_at,
+            qa.last_quick_scan_at,
+            coa.last_copilot_at,
+            la.last_lead_at,
+            sa.last_submission_at
+        ) AS last_activity_at
+    FROM users u
+    LEFT JOIN case_agg ca ON ca.user_id = u.id
+    LEFT JOIN doc_agg da ON da.user_id = u.id
+    LEFT JOIN quick_scan_agg qa ON qa.user_id = u.id
+    LEFT JOIN copilot_agg coa ON coa.user_id = u.id
+    LEFT JOIN lead_agg la ON la.user_id = u.id
+    LEFT JOIN submission_agg sa ON sa.user_id = u.id;
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_user_usage_30d_user ON mv_user_usage_30d(user_id);",
+    # Running completeness totals for the admin average (O(1) instead of AVG over cases)
+    """
+    CREATE TABLE IF NOT EXISTS platform_summary (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        completeness_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+        scored_count BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bump_case_completeness() RETURNS trigger AS $$
+    DECLARE
+      delta_sum DOUBLE PRECISION := 0;
+      delta_count BIGINT := 0;
+      part_sum DOUBLE PRECISION;
+      part_count BIGINT;
+    BEGIN
+      IF TG_OP = 'TRUNCATE' THEN
+        UPDATE platform_summary SET completeness_sum = 0, scored_count = 0, updated_at = NOW();
+        RETURN NULL;
+      END IF;
+      IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COALESCE(SUM(completeness_score), 0), COUNT(completeness_score)
+        INTO part_sum, part_count FROM new_rows;
+        delta_sum := delta_sum + part_sum;
+        delta_count := delta_count + part_count;
+      END IF;
+      IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT COALESCE(SUM(completeness_score), 0), COUNT(completeness_score)
+        INTO part_sum, part_count FROM old_rows;
+        delta_sum := delta_sum - part_sum;
+        delta_count := delta_count - part_count;
+      END IF;
+      -- Most case updates (status changes) leave completeness alone; skip the
+      -- write so they do not contend on the summary row.
+      IF delta_sum <> 0 OR delta_count <> 0 THEN
+        UPDATE platform_summary
+        SET completeness_sum = completeness_sum + delta_sum,
+            scored_count = GREATEST(scored_count + delta_count, 0),
+            updated_at = NOW();
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    DO $$
+    BEGIN
+      IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_cases_completeness_ins') THEN
+        LOCK TABLE cases IN SHARE ROW EXCLUSIVE MODE;
+        INSERT INTO platform_summary (id, completeness_sum, scored_count)
+        SELECT TRUE, COALESCE(SUM(completeness_score), 0), COUNT(completeness_score) FROM cases
+        ON CONFLICT (id) DO UPDATE
+        SET completeness_sum = EXCLUDED.completeness_sum,
+            scored_count = EXCLUDED.scored_count,
+            updated_at = NOW();
+        CREATE TRIGGER trg_cases_completeness_ins AFTER INSERT ON cases
+          REFERENCING NEW TABLE AS new_rows
+          FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+        CREATE TRIGGER trg_cases_completeness_upd AFTER UPDATE ON cases
+          REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+          FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+        CREATE TRIGGER trg_cases_completeness_del AFTER DELETE ON cases
+          REFERENCING OLD TABLE AS old_rows
+          FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+        CREATE TRIGGER trg_cases_completeness_trunc AFTER TRUNCATE ON cases
+          FOR EACH STATEMENT EXECUTE FUNCTION bump_case_completeness();
+      END IF;
+    END $$;
+    """,
 ]
 
 
@@ -265,17 +632,143 @@ POST_MIGRATION_DATA_FIXES: list[str] = [
     FROM cases c
     WHERE bf.organization_id IS NULL AND bf.case_id = c.id;
     """,
+    # Typed embeddings make the JSON copy dead weight; keep it only for rows
+    # without a vector (no-pgvector fallback search).
+    """
+    DO $$
+    BEGIN
+      IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'lender_documents' AND column_name = 'embedding'
+      ) THEN
+        UPDATE lender_documents
+        SET embedding_json = '[]'
+        WHERE embedding IS NOT NULL AND embedding_json <> '[]';
+      END IF;
+    END $$;
+    """,
 ]
 
 
+COMMISSION_PAYOUT_KEY_INDEX = "uq_commission_payouts_case_user_lender"
+
+COMMISSION_PAYOUT_KEY_INDEX_SQL = (
+    f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {COMMISSION_PAYOUT_KEY_INDEX} "
+    "ON commission_payouts (case_id, user_id, LOWER(COALESCE(lender_name, '')));"
+)
+
+COMMISSION_PAYOUT_DUPLICATES_SQL = """
+    SELECT p.case_id::text AS case_id, p.user_id::text AS user_id,
+           LOWER(COALESCE(p.lender_name, '')) AS lender, COUNT(*) AS payouts
+    FROM commission_payouts p
+    GROUP BY p.case_id, p.user_id, LOWER(COALESCE(p.lender_name, ''))
+    HAVING COUNT(*) > 1
+    ORDER BY COUNT(*) DESC
+    LIMIT 50
+"""
+
+
+_CONCURRENT_INDEX_RE = re.compile(
+    r"^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)",
+    re.IGNORECASE,
+)
+
+_INDEX_VALID_SQL = """
+    SELECT i.indisvalid
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = $1
+"""
+
+
+def concurrent_index_name(stmt: str) -> str | None:
+    """Return the index name if *stmt* is a CREATE INDEX CONCURRENTLY IF NOT EXISTS."""
+    match = _CONCURRENT_INDEX_RE.match(stmt)
+    return match.group(1) if match else None
+
+
+async def _drop_index_concurrently(conn: asyncpg.Connection, index_name: str) -> None:
+    await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
+
+
+async def create_index_concurrently(conn: asyncpg.Connection, index_name: str, stmt: str) -> None:
+    """Run a CREATE INDEX CONCURRENTLY IF NOT EXISTS statement so it can be retried.
+
+    An interrupted concurrent build leaves an INVALID index that IF NOT EXISTS
+    would keep forever, so one is dropped before building. A build that fails
+    has its half-built index dropped before the error is re-raised.
+    """
+    valid = await conn.fetchval(_INDEX_VALID_SQL, index_name)
+    if valid:
+        return
+    if valid is False:
+        logger.warning("Dropping invalid index %s before rebuilding it", index_name)
+        await _drop_index_concurrently(conn, index_name)
+
+    try:
+        await conn.execute(stmt)
+    except Exception:
+        await _drop_index_concurrently(conn, index_name)
+        raise
+
+
+async def ensure_commission_payout_key(conn: asyncpg.Connection) -> bool:
+    """Build the (case, user, lender) unique index behind the payout upsert.
+
+    Duplicate payouts are never deleted here: when any exist the index is not
+    built and the affected groups are logged for manual review. Returns True
+    when a valid index is in place.
+    """
+    valid = await conn.fetchval(_INDEX_VALID_SQL, COMMISSION_PAYOUT_KEY_INDEX)
+    if valid:
+        return True
+    if valid is False:
+        # An invalid unique index still rejects writes; never leave one behind.
+        logger.warning("Dropping invalid index %s before rebuilding it", COMMISSION_PAYOUT_KEY_INDEX)
+        await _drop_index_concurrently(conn, COMMISSION_PAYOUT_KEY_INDEX)
+
+    duplicates = await conn.fetch(COMMISSION_PAYOUT_DUPLICATES_SQL)
+    if duplicates:
+        logger.error(
+            "Not building %s: commission_payouts has duplicate (case_id, user_id, lender) rows; "
+            "payout upserts use the legacy path until they are resolved. Groups: %s",
+            COMMISSION_PAYOUT_KEY_INDEX,
+            [dict(row) for row in duplicates],
+        )
+        return False
+
+    try:
+        await create_index_concurrently(conn, COMMISSION_PAYOUT_KEY_INDEX, COMMISSION_PAYOUT_KEY_INDEX_SQL)
+    except Exception as exc:  # noqa: BLE001
+        # A duplicate written mid-build fails the build; the index is dropped.
+        logger.warning("Building %s failed: %s", COMMISSION_PAYOUT_KEY_INDEX, exc)
+        return False
+    return True
+
+
 async def apply_runtime_migrations(conn: asyncpg.Connection) -> None:
     """Apply additive migration statements safely."""
     for stmt in RUNTIME_MIGRATIONS:
         try:
-            await conn.execute(stmt)
+            index_name = concurrent_index_name(stmt)
+            if index_name:
+                await create_index_concurrently(conn, index_name, stmt)
+            else:
+                await conn.execute(stmt)
+        except asyncpg.UndefinedObjectError as exc:
+            if "gin_trgm_ops" in str(exc):
+                # Trigram indexes are optional; the search falls back to scans.
+                logger.info("Skipping trigram index, pg_trgm is not installed: %s", exc)
+            else:
+                logger.warning("Runtime migration statement failed (continuing): %s", exc)
         except Exception as exc:  # noqa: BLE001
             logger.warning("Runtime migration statement failed (continuing): %s", exc)
 
+    try:
+        await ensure_commission_payout_key(conn)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Commission payout key migration failed (continuing): %s", exc)
+
     for stmt in POST_MIGRATION_DATA_FIXES:
         try:
             await conn.execute(stmt)
@@ -10,10 +10,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
+from app.core.cache import close_cache
 from app.core.config import settings
 from app.core.latency_metrics import record_latency
 from app.db.database import init_db, close_db
+from app.services.credilo_api_client import CrediloApiClient, create_pooled_http_client
 from app.services.document_queue import document_queue_manager
+from app.services.materialized_views import materialized_view_refresher
 from app.api.v1.endpoints import (
     auth, cases, documents, extraction,
     eligibility, reports, copilot, lenders, whatsapp, share, pincodes,
@@ -77,10 +80,20 @@ async def lifespan(application: FastAPI):
     # Auto-ingest lender data if tables are empty
     await _auto_ingest_lender_data()
     await document_queue_manager.start()
+    await materialized_view_refresher.start()
+
+    # One pooled Credilo client per process; the bank statement proxy reuses
+    # its keep-alive connections across uploads.
+    credilo_http_client = create_pooled_http_client()
+    application.state.credilo = CrediloApiClient(http_client=credilo_http_client)
 
     yield
     # Shutdown
+    await materialized_view_refresher.stop()
     await document_queue_manager.stop()
+    await admin.close_admin_http_client()
+    await credilo_http_client.aclose()
+    await close_cache()
     await close_db()
 
 
@@ -99,6 +112,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset-paginated lists return the next page's cursor in this header.
+    expose_headers=["X-Next-Cursor"],
 )
 
 
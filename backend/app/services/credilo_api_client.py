@@ -2,14 +2,47 @@
 
 from __future__ import annotations
 
+import importlib.util
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 from urllib.parse import urljoin
 
 import httpx
 
 from app.core.config import settings
 
+# HTTP/2 needs the optional h2 package (httpx[http2]). ALPN still falls back
+# to HTTP/1.1 when the Credilo host does not offer h2.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def credilo_timeout() -> httpx.Timeout:
+    """Separate connect/write/read/pool deadlines for Credilo calls."""
+    return httpx.Timeout(
+        connect=settings.CREDILO_CONNECT_TIMEOUT_SECONDS,
+        read=settings.CREDILO_READ_TIMEOUT_SECONDS,
+        write=settings.CREDILO_WRITE_TIMEOUT_SECONDS,
+        pool=settings.CREDILO_POOL_TIMEOUT_SECONDS,
+    )
+
+
+def create_pooled_http_client() -> httpx.AsyncClient:
+    """Keep-alive client for a process with one long-lived event loop.
+
+    The API app opens this in its lifespan. RQ jobs run each task under a
+    fresh ``asyncio.run`` loop, so they keep using per-call clients.
+    """
+    return httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        timeout=credilo_timeout(),
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=15.0,
+        ),
+    )
+
 
 class CrediloApiError(RuntimeError):
     """Raised when Credilo API calls fail."""
@@ -18,7 +51,8 @@ class CrediloApiError(RuntimeError):
 class CrediloApiClient:
     """Thin HTTP client for Credilo parser endpoints."""
 
-    def __init__(self) -> None:
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None) -> None:
+        self._http_client = http_client
         self.base_url = (settings.CREDILO_API_BASE_URL or "").strip().rstrip("/") + "/"
         self.process_url = self._build_url(settings.CREDILO_PROCESS_PATH)
         self.preview_url = self._build_url(settings.CREDILO_PREVIEW_PATH)
@@ -35,6 +69,26 @@ class CrediloApiClient:
     def is_configured(self) -> bool:
         return bool(self.preview_url)
 
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Use the injected pooled client, or a one-off client when none was given."""
+        if self._http_client is not None:
+            yield self._http_client
+            return
+        async with httpx.AsyncClient(timeout=credilo_timeout()) as client:
+            yield client
+
+    async def open_process_stream(self, files: List[Any]) -> httpx.Response:
+        """POST multipart ``files`` to the process endpoint, returning an unread response.
+
+        The caller owns the response and must ``aclose()`` it. Requires the
+        pooled client, since a one-off client would close under the stream.
+        """
+        if self._http_client is None:
+            raise CrediloApiError("Streaming Credilo calls need a pooled http client")
+        request = self._http_client.build_request("POST", self.process_url, files=files)
+        return await self._http_client.send(request, stream=True)
+
     async def process_preview(self, pdf_paths: List[str]) -> Dict[str, Any]:
         """Send PDFs to Credilo preview endpoint and return JSON payload."""
         files = []
@@ -54,7 +108,7 @@ class CrediloApiClient:
             raise CrediloApiError("Credilo preview URL is not configured")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
+            async with self._client() as client:
                 response = await client.post(self.preview_url, files=files)
         finally:
             for handle in file_handles:
@@ -100,7 +154,7 @@ class CrediloApiClient:
             raise CrediloApiError("Credilo process URL is not configured")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
+            async with self._client() as client:
                 response = await client.post(self.process_url, files=files)
         finally:
             for handle in file_handles:
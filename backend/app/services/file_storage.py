@@ -1,11 +1,12 @@
 """File storage service - abstract interface with local filesystem implementation."""
+import asyncio
 import os
 import hashlib
 import shutil
 import re
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import AsyncIterator, BinaryIO, Optional
 import logging
 
 from app.core.config import settings
@@ -72,6 +73,53 @@ class FileStorageBackend(ABC):
         """Get the actual file path (for local storage)."""
         pass
 
+    async def open_stream(
+        self,
+        storage_key: str,
+        chunk_size: int = 64 * 1024,
+    ) -> Optional[AsyncIterator[bytes]]:
+        """
+        Open a stored file for chunked reading.
+
+        Returns None if the file is not found. Files with a local path are
+        read ``chunk_size`` bytes at a time off the event loop; other backends
+        fall back to ``get_file`` and yield the bytes in ``chunk_size`` slices.
+        """
+        file_path = self.get_file_path(storage_key)
+        if file_path is not None:
+            handle = await asyncio.to_thread(open, file_path, "rb")
+
+            async def _file_chunks() -> AsyncIterator[bytes]:
+                try:
+                    while True:
+                        chunk = await asyncio.to_thread(handle.read, chunk_size)
+                        if not chunk:
+                            break
+                        yield chunk
+                finally:
+                    handle.close()
+
+            return _file_chunks()
+
+        data = await self.get_file(storage_key)
+        if data is None:
+            return None
+        view = memoryview(data)
+
+        async def _chunks() -> AsyncIterator[bytes]:
+            for start in range(0, len(view), chunk_size):
+                yield bytes(view[start:start + chunk_size])
+
+        return _chunks()
+
+    def cache_path(self, name: str) -> Optional[Path]:
+        """
+        Local path for a derived file (e.g. a built archive) under ``name``.
+
+        Returns None when the backend has no local disk to cache on.
+        """
+        return None
+
 
 class LocalFileStorage(FileStorageBackend):
     """Local filesystem implementation of file storage."""
@@ -201,8 +249,8 @@ class LocalFileStorage(FileStorageBackend):
             return None
 
         try:
-            with open(file_path, "rb") as f:
-                return f.read()
+            # Off the event loop so concurrent reads (archive downloads) overlap.
+            return await asyncio.to_thread(file_path.read_bytes)
         except Exception as e:
             logger.error(f"Failed to read file {storage_key}: {e}")
             raise
@@ -239,6 +287,10 @@ class LocalFileStorage(FileStorageBackend):
         """Get the actual file path."""
         return self._resolve_existing_path(storage_key)
 
+    def cache_path(self, name: str) -> Optional[Path]:
+        """Derived files live under {base_path}/.cache, apart from case uploads."""
+        return self.base_path / ".cache" / name
+
 
 class S3FileStorage(FileStorageBackend):
     """S3 implementation - placeholder for future implementation."""
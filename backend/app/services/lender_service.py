@@ -364,7 +364,7 @@ async def get_knowledge_base_stats() -> Dict[str, Any]:
 
         # Count unique pincodes
         pincode_stats = dict(await db.fetchrow(
-            "SELECT COUNT(DISTINCT pincode) as unique_pincodes FROM lender_pincodes"
+            "SELECT COUNT(*) as unique_pincodes FROM (SELECT 1 FROM lender_pincodes GROUP BY pincode) p"
         ))
 
         # Program type breakdown
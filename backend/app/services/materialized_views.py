@@ -0,0 +1,129 @@
+"""Periodic refresh of the materialized views behind admin dashboards."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.db.database import get_asyncpg_pool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MaterializedViewSpec:
+    name: str
+    refresh_seconds: int
+
+
+def registered_views() -> list[MaterializedViewSpec]:
+    return [
+        MaterializedViewSpec("mv_admin_case_stats", settings.ADMIN_CASE_STATS_REFRESH_SECONDS),
+        MaterializedViewSpec("mv_platform_daily_stats", settings.PLATFORM_DAILY_STATS_REFRESH_SECONDS),
+        MaterializedViewSpec("mv_user_usage_30d", settings.USER_USAGE_REFRESH_SECONDS),
+    ]
+
+
+# Folds the trigger-appended platform_counter_deltas into platform_counters.
+# One statement, so deltas committed while it runs are left for the next pass.
+_COMPACT_PLATFORM_COUNTERS_SQL = """
+    WITH moved AS (
+        DELETE FROM platform_counter_deltas
+        RETURNING entity, delta
+    ),
+    totals AS (
+        SELECT entity, SUM(delta) AS delta
+        FROM moved
+        GROUP BY entity
+    )
+    UPDATE platform_counters c
+    SET row_count = GREATEST(c.row_count + totals.delta, 0), updated_at = NOW()
+    FROM totals
+    WHERE c.entity = totals.entity
+"""
+
+
+def _advisory_lock_key(view_name: str) -> int:
+    # Stable across processes so only one replica refreshes a view at a time.
+    return zlib.crc32(f"mv_refresh:{view_name}".encode("utf-8"))
+
+
+class MaterializedViewRefresher:
+    """Background loop running REFRESH MATERIALIZED VIEW CONCURRENTLY on a schedule."""
+
+    def __init__(self) -> None:
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._last_refreshed: dict[str, float] = {}
+        self._last_compacted = 0.0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        if not settings.MV_REFRESH_ENABLED:
+            logger.info("Materialized view refresher disabled by configuration.")
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Materialized view refresher started.")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_event.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Materialized view refresher stopped.")
+
+    async def _loop(self) -> None:
+        views = registered_views()
+        tick = max(5, min(spec.refresh_seconds for spec in views))
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            for spec in views:
+                if now - self._last_refreshed.get(spec.name, 0.0) < spec.refresh_seconds:
+                    continue
+                try:
+                    await refresh_materialized_view(spec.name)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Refresh of %s failed: %s", spec.name, exc)
+                self._last_refreshed[spec.name] = now
+            if now - self._last_compacted >= settings.PLATFORM_COUNTER_COMPACT_SECONDS:
+                try:
+                    await compact_platform_counters()
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Platform counter compaction failed: %s", exc)
+                self._last_compacted = now
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=tick)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def refresh_materialized_view(view_name: str) -> bool:
+    """Refresh one view unless another process is already doing it."""
+    lock_key = _advisory_lock_key(view_name)
+    pool = await get_asyncpg_pool()
+    async with pool.acquire() as conn:
+        acquired = await conn.fetchval("SELECT pg_try_advisory_lock($1)", lock_key)
+        if not acquired:
+            return False
+        try:
+            await conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}")
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", lock_key)
+    return True
+
+
+async def compact_platform_counters() -> None:
+    """Fold pending counter deltas into platform_counters."""
+    pool = await get_asyncpg_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(_COMPACT_PLATFORM_COUNTERS_SQL)
+
+
+materialized_view_refresher = MaterializedViewRefresher()
@@ -39,6 +39,8 @@ SUPPORTED_DOC_EXTENSIONS = {".pdf", ".txt", ".md"}
 _EMBED_MODEL: SentenceTransformer | None = None
 _TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_/\\-]*")
 _EMBED_DIM = 384
+# Whitelisted pgvector column types; interpolated into SQL casts.
+_VECTOR_COLUMN_TYPES = {"halfvec", "vector"}
 KNOWN_LENDER_PATTERNS: list[tuple[str, tuple[str, ...]]] = [
     ("Aditya Birla Finance", ("aditya birla", "abfl")),
     ("Arthmate", ("arthmate",)),
@@ -299,7 +301,12 @@ def _parse_embedding_json(raw: str | None) -> list[float]:
     return []
 
 
-async def _rag_capabilities(db) -> tuple[bool, bool]:
+async def _rag_capabilities(db) -> tuple[bool, str | None]:
+    """Return (has_table, embedding column type) for lender_documents.
+
+    The column type is ``"halfvec"`` on pgvector >= 0.7, ``"vector"`` on older
+    installs, or ``None`` when pgvector is unavailable.
+    """
     row = await db.fetchrow(
         """
         SELECT
@@ -308,18 +315,21 @@ async def _rag_capabilities(db) -> tuple[bool, bool]:
             FROM information_schema.tables
             WHERE table_schema = 'public' AND table_name = 'lender_documents'
           ) AS has_table,
-          EXISTS (
-            SELECT 1
+          (
+            SELECT udt_name
             FROM information_schema.columns
             WHERE table_schema = 'public'
               AND table_name = 'lender_documents'
               AND column_name = 'embedding'
-          ) AS has_vector_column
+          ) AS embedding_type
         """
     )
     if not row:
-        return False, False
-    return bool(row["has_table"]), bool(row["has_vector_column"])
+        return False, None
+    embedding_type = row["embedding_type"]
+    if embedding_type not in _VECTOR_COLUMN_TYPES:
+        embedding_type = None
+    return bool(row["has_table"]), embedding_type
 
 
 async def search_relevant_lender_chunks(
@@ -337,26 +347,34 @@ async def search_relevant_lender_chunks(
     try:
         pool = await get_asyncpg_pool()
         async with pool.acquire() as db:
-            has_table, has_vector_column = await _rag_capabilities(db)
+            has_table, vector_type = await _rag_capabilities(db)
             if not has_table:
                 return []
 
-            if has_vector_column:
+            if vector_type:
                 vector_text = _embedding_literal(query_vector)
-                rows = await db.fetch(
-                    """
-                    SELECT lender_name, product_type, section_title, chunk_text, source_file,
-                           (embedding <=> $2::vector) AS distance
-                    FROM lender_documents
-                    WHERE organization_id = $1
-                      AND embedding IS NOT NULL
-                    ORDER BY embedding <=> $2::vector
-                    LIMIT $3
-                    """,
-                    organization_id,
-                    vector_text,
-                    top,
-                )
+                # Embeddings are L2-normalized, so negative inner product (<#>)
+                # ranks like cosine distance and matches the HNSW *_ip_ops index;
+                # 1 + (a <#> b) is the cosine distance for unit vectors.
+                async with db.transaction():
+                    await db.execute(
+                        "SELECT set_config('hnsw.ef_search', $1, true)",
+                        str(max(settings.RAG_HNSW_EF_SEARCH, top)),
+                    )
+                    rows = await db.fetch(
+                        f"""
+                        SELECT lender_name, product_type, section_title, chunk_text, source_file,
+                               1 + (embedding <#> $2::{vector_type}) AS distance
+                        FROM lender_documents
+                        WHERE organization_id = $1
+                          AND embedding IS NOT NULL
+                        ORDER BY embedding <#> $2::{vector_type}
+                        LIMIT $3
+                        """,
+                        organization_id,
+                        vector_text,
+                        top,
+                    )
                 return [dict(row) for row in rows]
 
             # Fallback path for environments without pgvector support.
@@ -437,7 +455,7 @@ async def _ingest_file_content(
     source_file: Path,
     text: str,
     db,
-    has_vector_column: bool,
+    vector_type: str | None,
 ) -> int:
     if not text.strip():
         return 0
@@ -448,97 +466,98 @@ async def _ingest_file_content(
         return 0
 
     embeddings = _embed_texts(chunks)
-
-    inserted = 0
-    for idx, (chunk_text, vector) in enumerate(zip(chunks, embeddings), start=1):
-        section_title = f"{source_file.stem} - chunk {idx}"
-        vector_literal = _embedding_literal(vector)
-        vector_json = json.dumps(vector)
-        existing_id = await db.fetchval(
+    records = [
+        (
+            lender_name,
+            product_type,
+            f"{source_file.stem} - chunk {idx}",
+            chunk_text,
+            _embedding_literal(vector) if vector_type else None,
+            # The JSON copy only backs the no-pgvector fallback search; with a
+            # typed column it would just double the row size.
+            "[]" if vector_type else json.dumps(vector),
+            str(source_file),
+        )
+        for idx, (chunk_text, vector) in enumerate(zip(chunks, embeddings), start=1)
+    ]
+
+    # Bulk path: COPY every chunk of the file into a transaction-scoped staging
+    # table, then upsert with two set-based statements instead of a
+    # SELECT + INSERT/UPDATE round-trip per chunk. The vector literal is staged
+    # as text and cast once server-side since asyncpg has no pgvector codec.
+    embedding_assign = f"embedding = s.embedding_text::{vector_type}," if vector_type else ""
+    embedding_column = "embedding," if vector_type else ""
+    embedding_value = f"s.embedding_text::{vector_type}," if vector_type else ""
+    async with db.transaction():
+        await db.execute(
             """
-            SELECT id
-            FROM lender_documents
-            WHERE organization_id = $1
-              AND LOWER(lender_name) = LOWER($2)
-              AND LOWER(product_type) = LOWER($3)
-              AND COALESCE(section_title, '') = COALESCE($4, '')
-            LIMIT 1
+            CREATE TEMP TABLE lender_documents_staging (
+                lender_name TEXT,
+                product_type TEXT,
+                section_title TEXT,
+                chunk_text TEXT,
+                embedding_text TEXT,
+                embedding_json TEXT,
+                source_file TEXT
+            ) ON COMMIT DROP
+            """
+        )
+        await db.copy_records_to_table(
+            "lender_documents_staging",
+            records=records,
+            columns=[
+                "lender_name",
+                "product_type",
+                "section_title",
+                "chunk_text",
+                "embedding_text",
+                "embedding_json",
+                "source_file",
+            ],
+        )
+        await db.execute(
+            f"""
+            UPDATE lender_documents d
+            SET chunk_text = s.chunk_text,
+                {embedding_assign}
+                embedding_json = s.embedding_json,
+                source_file = s.source_file,
+                last_updated = NOW()
+            FROM lender_documents_staging s
+            WHERE d.organization_id = $1
+              AND LOWER(d.lender_name) = LOWER(s.lender_name)
+              AND LOWER(d.product_type) = LOWER(s.product_type)
+              AND COALESCE(d.section_title, '') = COALESCE(s.section_title, '')
             """,
             organization_id,
-            lender_name,
-            product_type,
-            section_title,
         )
-
-        if existing_id:
-            if has_vector_column:
-                await db.execute(
-                    """
-                    UPDATE lender_documents
-                    SET chunk_text = $2,
-                        embedding = $3::vector,
-                        embedding_json = $4,
-                        source_file = $5,
-                        last_updated = NOW()
-                    WHERE id = $1
-                    """,
-                    existing_id,
-                    chunk_text,
-                    vector_literal,
-                    vector_json,
-                    str(source_file),
-                )
-            else:
-                await db.execute(
-                    """
-                    UPDATE lender_documents
-                    SET chunk_text = $2,
-                        embedding_json = $3,
-                        source_file = $4,
-                        last_updated = NOW()
-                    WHERE id = $1
-                    """,
-                    existing_id,
-                    chunk_text,
-                    vector_json,
-                    str(source_file),
-                )
-        else:
-            if has_vector_column:
-                await db.execute(
-                    """
-                    INSERT INTO lender_documents (
-                        organization_id, lender_name, product_type, section_title, chunk_text, embedding, embedding_json, source_file, last_updated
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6::vector, $7, $8, NOW())
-                    """,
-                    organization_id,
-                    lender_name,
-                    product_type,
-                    section_title,
-                    chunk_text,
-                    vector_literal,
-                    vector_json,
-                    str(source_file),
+        inserted = await db.fetchval(
+            f"""
+            WITH ins AS (
+                INSERT INTO lender_documents (
+                    organization_id, lender_name, product_type, section_title, chunk_text,
+                    {embedding_column} embedding_json, source_file, last_updated
                 )
-            else:
-                await db.execute(
-                    """
-                    INSERT INTO lender_documents (
-                        organization_id, lender_name, product_type, section_title, chunk_text, embedding_json, source_file, last_updated
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
-                    """,
-                    organization_id,
-                    lender_name,
-                    product_type,
-                    section_title,
-                    chunk_text,
-                    vector_json,
-                    str(source_file),
+                SELECT
+                    $1, s.lender_name, s.product_type, s.section_title, s.chunk_text,
+                    {embedding_value} s.embedding_json, s.source_file, NOW()
+                FROM lender_documents_staging s
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM lender_documents d
+                    WHERE d.organization_id = $1
+                      AND LOWER(d.lender_name) = LOWER(s.lender_name)
+                      AND LOWER(d.product_type) = LOWER(s.product_type)
+                      AND COALESCE(d.section_title, '') = COALESCE(s.section_title, '')
                 )
-            inserted += 1
-    return inserted
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            )
+            SELECT COUNT(*) FROM ins
+            """,
+            organization_id,
+        )
+    return int(inserted or 0)
 
 
 async def ingest_lender_policy_documents(
@@ -556,7 +575,7 @@ async def ingest_lender_policy_documents(
 
     pool = await get_asyncpg_pool()
     async with pool.acquire() as db:
-        has_table, has_vector_column = await _rag_capabilities(db)
+        has_table, vector_type = await _rag_capabilities(db)
     if not has_table:
         return {
             "organization_id": str(organization_id),
@@ -602,7 +621,7 @@ async def ingest_lender_policy_documents(
                                     source_file=Path(f"{source.name}:{member.filename}"),
                                     text=text,
                                     db=db,
-                                    has_vector_column=has_vector_column,
+                                    vector_type=vector_type,
                                 )
                             processed_files += 1
             elif source.suffix.lower() in SUPPORTED_DOC_EXTENSIONS:
@@ -615,7 +634,7 @@ async def ingest_lender_policy_documents(
                         source_file=source,
                         text=text,
                         db=db,
-                        has_vector_column=has_vector_column,
+                        vector_type=vector_type,
                     )
                 processed_files += 1
             else:
@@ -4,6 +4,7 @@ import mimetypes
 import zipfile
 import re
 import asyncio
+import shutil
 from typing import List, Optional, BinaryIO, Tuple
 from pathlib import Path
 from uuid import UUID
@@ -13,7 +14,7 @@ import fitz  # PyMuPDF
 from fastapi import UploadFile, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.models.case import Case, Document, DocumentProcessingJob
 from app.models.user import User
@@ -715,11 +716,12 @@ class CaseEntryService:
         Also attempts cleanup of stored uploaded files.
         """
         try:
-            case = await self._get_case_by_case_id(case_id, current_user)
+            case = await self._get_case_by_case_id(case_id, current_user, include_documents=True)
             storage_keys = [
                 doc.storage_key for doc in case.documents
                 if doc.storage_key
             ]
+            archive_cache_dir = self._archive_cache_dir(case.id)
 
             # Prevent FK restriction from leads table where case link is optional.
             try:
@@ -749,6 +751,9 @@ class CaseEntryService:
                         cleanup_error,
                     )
 
+            if archive_cache_dir is not None:
+                await asyncio.to_thread(shutil.rmtree, archive_cache_dir, ignore_errors=True)
+
             logger.info(f"Deleted case: {case_id}")
 
         except HTTPException:
@@ -763,8 +768,22 @@ class CaseEntryService:
 
     # Helper methods
 
-    async def _get_case_by_case_id(self, case_id: str, current_user: User) -> Case:
-        """Get case by case_id and verify ownership."""
+    def _archive_cache_dir(self, case_uuid: UUID) -> Optional[Path]:
+        """Directory holding the case's cached document archives, if the backend caches."""
+        return self.storage.cache_path(f"archives/{case_uuid}")
+
+    async def _get_case_by_case_id(
+        self,
+        case_id: str,
+        current_user: User,
+        include_documents: bool = False,
+    ) -> Case:
+        """Get case by case_id and verify ownership.
+
+        ``include_documents`` eager-loads ``case.documents``; callers that never
+        touch the relationship skip the extra SELECT. Without it the relationship
+        is raise-loaded, so a stray access fails clearly instead of lazy-loading.
+        """
         query = select(Case).where(Case.case_id == case_id)
         if current_user.role != "super_admin":
             org_id = getattr(current_user, "organization_id", None)
@@ -772,7 +791,10 @@ class CaseEntryService:
                 query = query.where(Case.organization_id == org_id)
             else:
                 query = query.where(Case.user_id == current_user.id)
-        query = query.options(selectinload(Case.documents))
+        if include_documents:
+            query = query.options(selectinload(Case.documents))
+        else:
+            query = query.options(raiseload(Case.documents))
 
         result = await self.db.execute(query)
         case = result.scalar_one_or_none()
@@ -5,16 +5,62 @@ Handles extraction and processing of ZIP files containing multiple bank statemen
 Supports batch upload and aggregated analysis.
 """
 
+import asyncio
 import logging
 import zipfile
 import io
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 import tempfile
 
 logger = logging.getLogger(__name__)
 
+# zlib releases the GIL while inflating, so members decompress in parallel on
+# plain threads. ZipFile serializes the underlying seeks/reads with its own
+# lock, which makes concurrent read() calls on one open archive safe.
+_extract_pool = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1),
+    thread_name_prefix="zip-extract",
+)
+
+
+ZipSource = Union[bytes, BinaryIO]
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of processing one batch of extracted files."""
+
+    success: bool
+    total_files: int
+    processed: int
+    failed: int
+    document_ids: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _as_file(zip_source: ZipSource) -> BinaryIO:
+    """Accept raw bytes (legacy callers) or a seekable binary file object."""
+    if isinstance(zip_source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(zip_source)
+    zip_source.seek(0)
+    return zip_source
+
 
 class ZIPHandler:
     """Service for handling ZIP file uploads and extraction."""
@@ -22,31 +68,72 @@ class ZIPHandler:
     ALLOWED_EXTENSIONS = {'.pdf', '.png', '.jpg', '.jpeg', '.tif', '.tiff'}
     MAX_FILES_PER_ZIP = 50
     MAX_FILE_SIZE_MB = 10
+    MAX_ZIP_BYTES = 100 * 1024 * 1024  # 100MB
+    MAX_CONCURRENT_DOCUMENTS = 4
 
     @classmethod
-    async def extract_zip(
+    def _select_members(cls, zip_ref: zipfile.ZipFile) -> List[Tuple[str, str]]:
+        """Pick the (filename, extension) pairs worth extracting from an open archive."""
+        # Get list of files in ZIP
+        file_list = zip_ref.namelist()
+
+        # Filter out directories and hidden files
+        valid_files = [
+            f for f in file_list
+            if not f.endswith('/') and not f.startswith('__MACOSX') and not f.startswith('.')
+        ]
+
+        logger.info(f"Found {len(valid_files)} files in ZIP (total including dirs: {len(file_list)})")
+
+        if len(valid_files) > cls.MAX_FILES_PER_ZIP:
+            raise ValueError(f"ZIP contains too many files ({len(valid_files)}). Maximum: {cls.MAX_FILES_PER_ZIP}")
+
+        if len(valid_files) == 0:
+            raise ValueError("ZIP file is empty or contains only directories")
+
+        # Filter by extension and declared size before inflating anything
+        to_extract = []
+        for filename in valid_files:
+            # Get file extension
+            ext = Path(filename).suffix.lower()
+
+            # Check if extension is allowed
+            if ext not in cls.ALLOWED_EXTENSIONS:
+                logger.warning(f"Skipping file with unsupported extension: {filename}")
+                continue
+
+            file_size_mb = zip_ref.getinfo(filename).file_size / (1024 * 1024)
+            if file_size_mb > cls.MAX_FILE_SIZE_MB:
+                logger.warning(f"Skipping large file: {filename} ({file_size_mb:.1f}MB)")
+                continue
+
+            to_extract.append((filename, ext))
+
+        if not to_extract:
+            raise ValueError("No valid files found in ZIP after filtering")
+
+        return to_extract
+
+    @classmethod
+    async def iter_zip(
         cls,
-        zip_content: bytes,
+        zip_content: ZipSource,
         zip_filename: str
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Extract all files from a ZIP archive.
+        Yield files from a ZIP archive as soon as each one is decompressed.
+
+        Members inflate concurrently on the extraction pool and are yielded in
+        completion order, so callers can start processing the first files while
+        the rest are still being extracted.
 
         Args:
-            zip_content: ZIP file content as bytes
+            zip_content: ZIP bytes, or a seekable file object such as an
+                upload's spooled temp file (read in place, never copied whole)
             zip_filename: Original ZIP filename
 
-        Returns:
-            List of extracted files with metadata:
-            [
-                {
-                    'filename': str,
-                    'content': bytes,
-                    'size': int,
-                    'extension': str
-                },
-                ...
-            ]
+        Yields:
+            {'filename': str, 'content': bytes, 'size': int, 'extension': str}
 
         Raises:
             ValueError: If ZIP is invalid or contains too many files
@@ -54,99 +141,105 @@ class ZIPHandler:
         logger.info(f"Extracting ZIP file: {zip_filename}")
 
         try:
-            # Create BytesIO object from content
-            zip_buffer = io.BytesIO(zip_content)
-
-            # Open ZIP file
-            with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
-                # Get list of files in ZIP
-                file_list = zip_ref.namelist()
-
-                # Filter out directories and hidden files
-                valid_files = [
-                    f for f in file_list
-                    if not f.endswith('/') and not f.startswith('__MACOSX') and not f.startswith('.')
-                ]
-
-                logger.info(f"Found {len(valid_files)} files in ZIP (total including dirs: {len(file_list)})")
-
-                if len(valid_files) > cls.MAX_FILES_PER_ZIP:
-                    raise ValueError(f"ZIP contains too many files ({len(valid_files)}). Maximum: {cls.MAX_FILES_PER_ZIP}")
-
-                if len(valid_files) == 0:
-                    raise ValueError("ZIP file is empty or contains only directories")
-
-                # Extract files
-                extracted_files = []
-
-                for filename in valid_files:
-                    # Get file extension
-                    ext = Path(filename).suffix.lower()
-
-                    # Check if extension is allowed
-                    if ext not in cls.ALLOWED_EXTENSIONS:
-                        logger.warning(f"Skipping file with unsupported extension: {filename}")
-                        continue
+            zip_ref = zipfile.ZipFile(_as_file(zip_content), 'r')
+        except zipfile.BadZipFile:
+            logger.error(f"Invalid ZIP file: {zip_filename}")
+            raise ValueError("Invalid ZIP file")
 
-                    # Extract file content
-                    try:
-                        file_content = zip_ref.read(filename)
-                        file_size_mb = len(file_content) / (1024 * 1024)
+        with zip_ref:
+            to_extract = cls._select_members(zip_ref)
 
-                        if file_size_mb > cls.MAX_FILE_SIZE_MB:
-                            logger.warning(f"Skipping large file: {filename} ({file_size_mb:.1f}MB)")
+            loop = asyncio.get_running_loop()
+            pending = {
+                loop.run_in_executor(_extract_pool, zip_ref.read, filename): (filename, ext)
+                for filename, ext in to_extract
+            }
+            extracted = 0
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        filename, ext = pending.pop(future)
+                        try:
+                            file_content = future.result()
+                        except Exception as e:
+                            logger.error(f"Error extracting file {filename}: {e}")
                             continue
 
-                        extracted_files.append({
+                        logger.info(f"Extracted: {filename} ({len(file_content) / 1024:.1f} KB)")
+                        extracted += 1
+                        yield {
                             'filename': filename,
                             'content': file_content,
                             'size': len(file_content),
                             'extension': ext
-                        })
-
-                        logger.info(f"Extracted: {filename} ({len(file_content) / 1024:.1f} KB)")
+                        }
+            finally:
+                # Consumer stopped early: let in-flight reads finish before the
+                # archive is closed underneath them.
+                for future in pending:
+                    future.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
 
-                    except Exception as e:
-                        logger.error(f"Error extracting file {filename}: {e}")
-                        continue
+        logger.info(f"Successfully extracted {extracted} files from {zip_filename}")
 
-                if not extracted_files:
-                    raise ValueError("No valid files found in ZIP after filtering")
-
-                logger.info(f"Successfully extracted {len(extracted_files)} files from {zip_filename}")
-
-                return extracted_files
+    @classmethod
+    async def extract_zip(
+        cls,
+        zip_content: ZipSource,
+        zip_filename: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract all files from a ZIP archive.
 
-        except zipfile.BadZipFile:
-            logger.error(f"Invalid ZIP file: {zip_filename}")
-            raise ValueError("Invalid ZIP file")
+        Collects ``iter_zip`` into a list (completion order) for callers that
+        need every file up front.
 
+        Raises:
+            ValueError: If ZIP is invalid, contains too many files, or nothing
+                could be extracted
+        """
+        try:
+            extracted_files = [file_data async for file_data in cls.iter_zip(zip_content, zip_filename)]
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting ZIP: {e}", exc_info=True)
             raise ValueError(f"Error processing ZIP file: {str(e)}")
 
+        if not extracted_files:
+            raise ValueError("No valid files found in ZIP after filtering")
+
+        return extracted_files
+
     @classmethod
-    def validate_zip(cls, file_content: bytes, filename: str) -> Tuple[bool, Optional[str]]:
+    def validate_zip(cls, file_content: ZipSource, filename: str) -> Tuple[bool, Optional[str]]:
         """
         Validate ZIP file before extraction.
 
         Args:
-            file_content: ZIP file content
+            file_content: ZIP bytes or a seekable file object; only the size
+                and the end-of-central-directory record are read
             filename: Filename
 
         Returns:
             (is_valid, error_message)
         """
         try:
-            # Check if it's a valid ZIP
-            if not zipfile.is_zipfile(io.BytesIO(file_content)):
-                return False, "File is not a valid ZIP archive"
+            zip_file = _as_file(file_content)
 
-            # Check file size (100MB max)
-            max_size = 100 * 1024 * 1024  # 100MB
-            if len(file_content) > max_size:
+            # Check file size (100MB max) before touching the contents
+            zip_file.seek(0, os.SEEK_END)
+            size = zip_file.tell()
+            zip_file.seek(0)
+            if size > cls.MAX_ZIP_BYTES:
                 return False, f"ZIP file too large (max: 100MB)"
 
+            # Check if it's a valid ZIP
+            if not zipfile.is_zipfile(zip_file):
+                return False, "File is not a valid ZIP archive"
+
             return True, None
 
         except Exception as e:
@@ -156,35 +249,32 @@ class ZIPHandler:
     @classmethod
     async def process_batch_documents(
         cls,
-        extracted_files: List[Dict[str, Any]],
+        extracted_files: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
         case_id: str,
         user_id: str
-    ) -> Dict[str, Any]:
+    ) -> BatchResult:
         """
         Process all extracted files as documents for a case.
 
         This is a helper function that will be called by the document upload endpoint.
+        ``extracted_files`` may be a list or an async iterator such as
+        ``iter_zip``; each file starts processing as soon as it arrives, with
+        at most ``MAX_CONCURRENT_DOCUMENTS`` in flight.
 
         Args:
-            extracted_files: List of extracted files from ZIP
+            extracted_files: Extracted files from ZIP (list or async iterator)
             case_id: Case ID
             user_id: User ID
 
         Returns:
-            {
-                'success': bool,
-                'total_files': int,
-                'processed': int,
-                'failed': int,
-                'document_ids': List[str],
-                'errors': List[str]
-            }
+            BatchResult with per-file counts, created document IDs and errors;
+            ``error`` is set when the batch could not start at all
         """
         from app.services.file_storage import save_file
         from app.services.stages.stage0_case_entry import process_uploaded_document
         from app.db.database import get_db_session
 
-        logger.info(f"Processing {len(extracted_files)} documents for case {case_id}")
+        logger.info(f"Processing batch documents for case {case_id}")
 
         processed = 0
         failed = 0
@@ -197,19 +287,23 @@ class ZIPHandler:
             case_row = await db.fetchrow(case_query, case_id)
 
             if not case_row:
-                return {
-                    'success': False,
-                    'error': 'Case not found',
-                    'total_files': len(extracted_files),
-                    'processed': 0,
-                    'failed': len(extracted_files)
-                }
+                if hasattr(extracted_files, 'aclose'):
+                    await extracted_files.aclose()
+                known_total = len(extracted_files) if isinstance(extracted_files, list) else 0
+                return BatchResult(
+                    success=False,
+                    error='Case not found',
+                    total_files=known_total,
+                    processed=0,
+                    failed=known_total
+                )
 
             case_uuid = case_row['id']
 
-        # Process each file
-        for file_data in extracted_files:
-            try:
+        semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_DOCUMENTS)
+
+        async def _process_one(file_data: Dict[str, Any]) -> str:
+            async with semaphore:
                 filename = file_data['filename']
                 content = file_data['content']
 
@@ -266,24 +360,44 @@ class ZIPHandler:
                         case_id=str(case_uuid)
                     )
 
-                    document_ids.append(str(doc_id))
-                    processed += 1
-
                     logger.info(f"Successfully processed: {filename}")
+                    return str(doc_id)
 
-            except Exception as e:
-                logger.error(f"Error processing file {file_data['filename']}: {e}", exc_info=True)
-                errors.append(f"{file_data['filename']}: {str(e)}")
+        # Start each file as it arrives instead of waiting for the whole ZIP
+        files: List[Dict[str, Any]] = []
+        tasks: List[asyncio.Task] = []
+        try:
+            if isinstance(extracted_files, AsyncIterable):
+                async for file_data in extracted_files:
+                    files.append(file_data)
+                    tasks.append(asyncio.create_task(_process_one(file_data)))
+            else:
+                for file_data in extracted_files:
+                    files.append(file_data)
+                    tasks.append(asyncio.create_task(_process_one(file_data)))
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for file_data, outcome in zip(files, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error processing file {file_data['filename']}: {outcome}", exc_info=outcome)
+                errors.append(f"{file_data['filename']}: {str(outcome)}")
                 failed += 1
-
-        result = {
-            'success': processed > 0,
-            'total_files': len(extracted_files),
-            'processed': processed,
-            'failed': failed,
-            'document_ids': document_ids,
-            'errors': errors
-        }
+            else:
+                document_ids.append(outcome)
+                processed += 1
+
+        result = BatchResult(
+            success=processed > 0,
+            total_files=len(files),
+            processed=processed,
+            failed=failed,
+            document_ids=document_ids,
+            errors=errors
+        )
 
         logger.info(f"Batch processing complete: {processed} success, {failed} failed")
 
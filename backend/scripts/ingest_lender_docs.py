@@ -11,11 +11,41 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import sys
 from uuid import UUID
 
 from app.db.database import get_asyncpg_pool
+from app.db.runtime_migrations import create_index_concurrently
 from app.services.rag_service import DEFAULT_POLICY_SOURCES, ingest_lender_policy_documents
 
+# Indexes dropped during a deferred-index bulk load and rebuilt afterwards.
+DEFERRED_INDEX_DDL = {
+    "uq_lender_documents_dedupe_hash": (
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_lender_documents_dedupe_hash "
+        "ON lender_documents (organization_id, lender_name, product_type, COALESCE(section_title, ''), chunk_hash)"
+    ),
+    "idx_lender_documents_org": (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lender_documents_org ON lender_documents(organization_id)"
+    ),
+}
+
+
+async def _rebuild_deferred_indexes(pool) -> None:
+    """Recreate every deferred index; one failing build must not skip the rest."""
+    failures = []
+    async with pool.acquire() as db:
+        for index_name, ddl in DEFERRED_INDEX_DDL.items():
+            try:
+                await create_index_concurrently(db, index_name, ddl)
+            except Exception as exc:  # noqa: BLE001
+                failures.append(index_name)
+                print(f"Failed to rebuild index {index_name}: {exc}", file=sys.stderr)
+    if failures:
+        print(
+            "Rebuild the indexes above manually (see DEFERRED_INDEX_DDL): " + ", ".join(failures),
+            file=sys.stderr,
+        )
+
 
 async def _resolve_org_id(explicit_org_id: str | None) -> UUID:
     if explicit_org_id:
@@ -45,20 +75,36 @@ async def main() -> None:
         action="store_true",
         help="Delete existing lender_documents rows for this organization before ingestion.",
     )
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help=(
+            "Drop the dedupe/org indexes before a large reload and rebuild them afterwards. "
+            "Faster for full corpora; avoid while other ingestions are running."
+        ),
+    )
     args = parser.parse_args()
 
     org_id = await _resolve_org_id(args.organization_id)
+    pool = await get_asyncpg_pool()
     if args.reset_existing:
-        pool = await get_asyncpg_pool()
         async with pool.acquire() as db:
             await db.execute(
                 "DELETE FROM lender_documents WHERE organization_id = $1",
                 org_id,
             )
-    result = await ingest_lender_policy_documents(
-        organization_id=org_id,
-        source_paths=args.sources or list(DEFAULT_POLICY_SOURCES),
-    )
+    if args.defer_indexes:
+        async with pool.acquire() as db:
+            for index_name in DEFERRED_INDEX_DDL:
+                await db.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+    try:
+        result = await ingest_lender_policy_documents(
+            organization_id=org_id,
+            source_paths=args.sources or list(DEFAULT_POLICY_SOURCES),
+        )
+    finally:
+        if args.defer_indexes:
+            await _rebuild_deferred_indexes(pool)
     print(json.dumps(result, indent=2))
 
 
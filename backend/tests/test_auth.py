@@ -10,6 +10,8 @@ from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.security import (
+    BCRYPT_ROUNDS,
+    DUMMY_PASSWORD_HASH,
     hash_password,
     verify_password,
     create_access_token,
@@ -62,6 +64,11 @@ class TestPasswordHashing:
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
 
+    def test_dummy_hash_matches_real_hash_cost(self):
+        """The unknown-email dummy hash is a valid bcrypt hash at the pinned cost."""
+        assert DUMMY_PASSWORD_HASH.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+        assert verify_password("not-the-dummy-password", DUMMY_PASSWORD_HASH) is False
+
 
 class TestJWTTokens:
     """Test JWT token creation and validation."""
@@ -0,0 +1,222 @@
+"""Unit tests for the best-effort Redis cache helpers."""
+import json
+
+import pytest
+
+from app.core import cache
+from app.core.cache import LOCK_SUFFIX, STALE_SUFFIX, invalidate_cache, ttl_cache
+from app.core.config import settings
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of redis.asyncio calls the cache uses."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.store.pop(key, None) is not None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.ops.append(self.redis.setex(key, ttl, value))
+
+    def delete(self, *keys):
+        self.ops.append(self.redis.delete(*keys))
+
+    async def execute(self):
+        return [await op for op in self.ops]
+
+
+class DownRedis:
+    """Every call fails the way an unreachable server does."""
+
+    async def get(self, key):
+        raise ConnectionError("redis unavailable")
+
+    async def delete(self, *keys):
+        raise ConnectionError("redis unavailable")
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError("redis unavailable")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(cache, "get_async_redis", lambda: redis)
+    return redis
+
+
+def _counting(result):
+    calls = []
+
+    async def compute(*args):
+        calls.append(args)
+        return result
+
+    return compute, calls
+
+
+class TestTTLCache:
+    """Tests for the ttl_cache decorator."""
+
+    @pytest.mark.asyncio
+    async def test_miss_computes_and_hit_reuses(self, fake_redis):
+        """The first call computes and stores; the second is served from Redis."""
+        compute, calls = _counting({"total": 3})
+        cached = ttl_cache("stats:v1", ttl=30)(compute)
+
+        assert await cached() == {"total": 3}
+        assert await cached() == {"total": 3}
+
+        assert len(calls) == 1
+        assert json.loads(fake_redis.store["stats:v1"]) == {"total": 3}
+        assert fake_redis.ttls["stats:v1"] == 30
+        assert fake_redis.ttls["stats:v1" + STALE_SUFFIX] == 30 * cache.STALE_TTL_MULTIPLIER
+        assert "stats:v1" + LOCK_SUFFIX not in fake_redis.store
+
+    @pytest.mark.asyncio
+    async def test_callable_key_uses_call_arguments(self, fake_redis):
+        """A callable key caches each argument set separately."""
+        compute, calls = _counting({"ok": True})
+        cached = ttl_cache(lambda case_id: f"status:{case_id}")(compute)
+
+        await cached("CASE-1")
+        await cached("CASE-2")
+        await cached("CASE-1")
+
+        assert calls == [("CASE-1",), ("CASE-2",)]
+        assert "status:CASE-1" in fake_redis.store
+        assert "status:CASE-2" in fake_redis.store
+
+    @pytest.mark.asyncio
+    async def test_locked_miss_serves_stale_copy(self, fake_redis):
+        """While another request holds the lock, the stale copy is returned."""
+        compute, calls = _counting({"total": 99})
+        cached = ttl_cache("stats:v1")(compute)
+        fake_redis.store["stats:v1" + LOCK_SUFFIX] = "1"
+        fake_redis.store["stats:v1" + STALE_SUFFIX] = json.dumps({"total": 1})
+
+        assert await cached() == {"total": 1}
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_locked_miss_without_stale_copy_computes(self, fake_redis):
+        """With nothing stale to serve, a locked-out request computes anyway."""
+        compute, calls = _counting({"total": 5})
+        cached = ttl_cache("stats:v1")(compute)
+        fake_redis.store["stats:v1" + LOCK_SUFFIX] = "1"
+
+        assert await cached() == {"total": 5}
+        assert len(calls) == 1
+        assert fake_redis.store["stats:v1" + LOCK_SUFFIX] == "1"
+
+    @pytest.mark.asyncio
+    async def test_failed_compute_releases_lock(self, fake_redis):
+        """A raising coroutine does not leave the mutex held until it expires."""
+
+        async def compute():
+            raise RuntimeError("database down")
+
+        cached = ttl_cache("stats:v1")(compute)
+
+        with pytest.raises(RuntimeError):
+            await cached()
+        assert "stats:v1" + LOCK_SUFFIX not in fake_redis.store
+
+    @pytest.mark.asyncio
+    async def test_miss_returns_same_types_as_hit(self, fake_redis):
+        """A miss returns the JSON round-tripped value, exactly like a later hit."""
+        compute, _ = _counting({"ids": (1, 2)})
+        cached = ttl_cache("stats:v1")(compute)
+
+        miss = await cached()
+        hit = await cached()
+
+        assert miss == hit == {"ids": [1, 2]}
+
+    @pytest.mark.asyncio
+    async def test_redis_down_falls_back_to_live_call(self, monkeypatch):
+        """An unreachable Redis never fails the request."""
+        monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+        monkeypatch.setattr(cache, "get_async_redis", lambda: DownRedis())
+        compute, calls = _counting({"total": 7})
+        cached = ttl_cache("stats:v1")(compute)
+
+        assert await cached() == {"total": 7}
+        assert await cached() == {"total": 7}
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_skips_redis(self, monkeypatch):
+        """CACHE_ENABLED=false calls straight through without touching Redis."""
+        monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+        monkeypatch.setattr(cache, "get_async_redis", lambda: DownRedis())
+        compute, calls = _counting({"total": 2})
+        cached = ttl_cache("stats:v1")(compute)
+
+        assert await cached() == {"total": 2}
+        assert len(calls) == 1
+
+
+class TestInvalidateCache:
+    """Tests for invalidate_cache."""
+
+    @pytest.mark.asyncio
+    async def test_drops_fresh_entry_and_keeps_stale(self, fake_redis):
+        """Invalidation forces a recompute but leaves the stale copy for racing readers."""
+        compute, calls = _counting({"total": 1})
+        cached = ttl_cache("stats:v1")(compute)
+        await cached()
+
+        assert await invalidate_cache("stats:v1") == 1
+        assert "stats:v1" not in fake_redis.store
+        assert "stats:v1" + STALE_SUFFIX in fake_redis.store
+
+        await cached()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_keys_and_no_keys(self, fake_redis):
+        """Unknown keys delete nothing; an empty call is a no-op."""
+        assert await invalidate_cache("never-set") == 0
+        assert await invalidate_cache() == 0
+
+    @pytest.mark.asyncio
+    async def test_redis_down_returns_zero(self, monkeypatch):
+        """A failed delete is swallowed and reported as nothing removed."""
+        monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+        monkeypatch.setattr(cache, "get_async_redis", lambda: DownRedis())
+
+        assert await invalidate_cache("stats:v1") == 0
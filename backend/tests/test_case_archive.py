@@ -0,0 +1,123 @@
+"""Tests for the streamed case documents archive and its on-disk cache."""
+import io
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.api.v1.endpoints.cases import _case_archive_cache_path, _case_archive_response
+from app.models.case import Case, Document
+from app.services.stages.stage0_case_entry import CaseEntryService
+
+
+async def _load_case(db_session, case_uuid) -> Case:
+    result = await db_session.execute(
+        select(Case)
+        .where(Case.id == case_uuid)
+        .options(selectinload(Case.documents))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _read_body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestCaseArchive:
+    """Tests for _case_archive_response."""
+
+    @pytest.mark.asyncio
+    async def test_streams_valid_zip_and_serves_cache_next_time(
+        self, db_session, sample_case, sample_document, test_storage_path
+    ):
+        """The first request streams a valid ZIP and caches it for the next one."""
+        service = CaseEntryService(db_session)
+        case = await _load_case(db_session, sample_case.id)
+
+        response = _case_archive_response(service, case, headers={})
+        assert isinstance(response, StreamingResponse)
+        body = await _read_body(response)
+
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == ["test_doc.pdf"]
+            assert archive.read("test_doc.pdf") == b"%PDF-1.4\n%Test\n%%EOF"
+
+        cache_path = _case_archive_cache_path(service, case)
+        assert cache_path.is_relative_to(test_storage_path)
+        assert cache_path.read_bytes() == body
+
+        cached = _case_archive_response(service, case, headers={})
+        assert isinstance(cached, FileResponse)
+        assert cached.path == cache_path
+
+    @pytest.mark.asyncio
+    async def test_partial_stream_is_never_published(
+        self, db_session, sample_case, sample_document
+    ):
+        """A client that disconnects mid-archive leaves no cache file behind."""
+        service = CaseEntryService(db_session)
+        case = await _load_case(db_session, sample_case.id)
+
+        response = _case_archive_response(service, case, headers={})
+        chunks = response.body_iterator
+        await chunks.__anext__()
+        await chunks.aclose()
+
+        cache_path = _case_archive_cache_path(service, case)
+        assert not cache_path.exists()
+        assert list(cache_path.parent.glob("*")) == []
+
+    @pytest.mark.asyncio
+    async def test_archive_with_placeholder_entries_is_not_cached(
+        self, db_session, sample_case, sample_document
+    ):
+        """A document missing from storage gets its OCR text, and the archive is not cached."""
+        db_session.add(
+            Document(
+                case_id=sample_case.id,
+                original_filename="missing.pdf",
+                storage_key=f"{sample_case.case_id}/missing.pdf",
+                mime_type="application/pdf",
+                file_hash="def456",
+                status="uploaded",
+                ocr_text="Recovered statement text",
+            )
+        )
+        await db_session.commit()
+
+        service = CaseEntryService(db_session)
+        case = await _load_case(db_session, sample_case.id)
+
+        body = await _read_body(_case_archive_response(service, case, headers={}))
+
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            assert archive.testzip() is None
+            assert sorted(archive.namelist()) == ["missing_ocr.txt", "test_doc.pdf"]
+            assert b"Recovered statement text" in archive.read("missing_ocr.txt")
+
+        assert not _case_archive_cache_path(service, case).exists()
+
+
+class TestArchiveCacheCleanup:
+    """Deleting a case removes its cached archives."""
+
+    @pytest.mark.asyncio
+    async def test_delete_case_removes_archive_cache_dir(self, test_storage_path):
+        service = CaseEntryService(AsyncMock())
+        case = SimpleNamespace(id=uuid4(), documents=[])
+
+        archive_dir = service._archive_cache_dir(case.id)
+        archive_dir.mkdir(parents=True)
+        (archive_dir / "cached.zip").write_bytes(b"PK")
+
+        with patch.object(service, "_get_case_by_case_id", AsyncMock(return_value=case)):
+            await service.delete_case("CASE-20240210-0001", SimpleNamespace())
+
+        assert not archive_dir.exists()
@@ -0,0 +1,127 @@
+"""Tests for the public share-link archive download."""
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.api.v1.endpoints.cases import _hash_share_token, download_shared_case_archive
+from app.core.config import settings
+from app.models.case import CaseShareLink
+
+
+@pytest.fixture(autouse=True)
+def disable_cache(monkeypatch):
+    """Keep the rejection cache out of these tests; each asserts on SQL state."""
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+
+
+async def _create_share_link(
+    db_session,
+    case,
+    token_hash,
+    expires_in=timedelta(hours=1),
+    max_downloads=2,
+    download_count=0,
+):
+    link = CaseShareLink(
+        case_id=case.id,
+        token_hash=token_hash,
+        expires_at=datetime.now(timezone.utc) + expires_in,
+        max_downloads=max_downloads,
+        download_count=download_count,
+        is_active=True,
+    )
+    db_session.add(link)
+    await db_session.commit()
+    await db_session.refresh(link)
+    return link
+
+
+class TestSharedArchiveDownload:
+    """Tests for download_shared_case_archive."""
+
+    @pytest.mark.asyncio
+    async def test_valid_link_counts_downloads_and_deactivates_at_limit(
+        self, db_session, sample_case, sample_document
+    ):
+        """Each download is counted and the last allowed one deactivates the link."""
+        token = "valid-share-token"
+        link = await _create_share_link(db_session, sample_case, _hash_share_token(token), max_downloads=2)
+
+        response = await download_shared_case_archive(token, db=db_session)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.media_type == "application/zip"
+        assert response.headers["cache-control"] == "no-store"
+
+        await db_session.refresh(link)
+        assert link.download_count == 1
+        assert link.is_active is True
+        assert link.last_accessed_at is not None
+
+        await download_shared_case_archive(token, db=db_session)
+        await db_session.refresh(link)
+        assert link.download_count == 2
+        assert link.is_active is False
+
+        with pytest.raises(HTTPException) as exc_info:
+            await download_shared_case_archive(token, db=db_session)
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_expired_link_returns_410(self, db_session, sample_case, sample_document):
+        """An expired link is rejected with 410 and deactivated."""
+        token = "expired-share-token"
+        link = await _create_share_link(
+            db_session, sample_case, _hash_share_token(token), expires_in=timedelta(hours=-1)
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await download_shared_case_archive(token, db=db_session)
+
+        assert exc_info.value.status_code == status.HTTP_410_GONE
+        assert exc_info.value.detail == "Share link has expired"
+        await db_session.refresh(link)
+        assert link.is_active is False
+        assert link.download_count == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_link_returns_410(self, db_session, sample_case, sample_document):
+        """A link that used up its downloads is rejected with 410 and deactivated."""
+        token = "exhausted-share-token"
+        link = await _create_share_link(
+            db_session, sample_case, _hash_share_token(token), max_downloads=3, download_count=3
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await download_shared_case_archive(token, db=db_session)
+
+        assert exc_info.value.status_code == status.HTTP_410_GONE
+        assert exc_info.value.detail == "Share link download limit reached"
+        await db_session.refresh(link)
+        assert link.is_active is False
+        assert link.download_count == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_token_returns_404(self, db_session, sample_case, sample_document):
+        """A token with no matching link is a 404."""
+        await _create_share_link(db_session, sample_case, _hash_share_token("some-other-token"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await download_shared_case_archive("unknown-share-token", db=db_session)
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_legacy_sha256_link_still_resolves(self, db_session, sample_case, sample_document):
+        """Links stored with the old unkeyed SHA-256 hash keep working."""
+        token = "legacy-share-token"
+        legacy_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        link = await _create_share_link(db_session, sample_case, legacy_hash, max_downloads=5)
+
+        response = await download_shared_case_archive(token, db=db_session)
+
+        assert response.status_code == status.HTTP_200_OK
+        await db_session.refresh(link)
+        assert link.download_count == 1
+        assert link.is_active is True
@@ -0,0 +1,48 @@
+"""Tests for chunked reads from the file storage backends."""
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from app.services.file_storage import LocalFileStorage
+
+
+class BytesOnlyStorage(LocalFileStorage):
+    """A backend without local paths, so reads go through get_file."""
+
+    def get_file_path(self, storage_key: str) -> Optional[Path]:
+        return None
+
+
+async def _collect(stream) -> list[bytes]:
+    return [chunk async for chunk in stream]
+
+
+class TestOpenStream:
+    """Tests for FileStorageBackend.open_stream."""
+
+    @pytest.mark.asyncio
+    async def test_local_file_is_read_in_chunks(self, test_storage_path):
+        (test_storage_path / "CASE-1").mkdir()
+        (test_storage_path / "CASE-1" / "statement.pdf").write_bytes(b"a" * 10 + b"b" * 5)
+        storage = LocalFileStorage(str(test_storage_path))
+
+        stream = await storage.open_stream("CASE-1/statement.pdf", chunk_size=4)
+
+        assert await _collect(stream) == [b"aaaa", b"aaaa", b"aabb", b"bbb"]
+
+    @pytest.mark.asyncio
+    async def test_get_file_fallback_is_sliced(self, test_storage_path):
+        """Backends without a local path still yield chunk_size pieces."""
+        (test_storage_path / "CASE-1").mkdir()
+        (test_storage_path / "CASE-1" / "statement.pdf").write_bytes(b"0123456789")
+        storage = BytesOnlyStorage(str(test_storage_path))
+
+        stream = await storage.open_stream("CASE-1/statement.pdf", chunk_size=4)
+
+        assert await _collect(stream) == [b"0123", b"4567", b"89"]
+
+    @pytest.mark.asyncio
+    async def test_missing_file_returns_none(self, test_storage_path):
+        storage = LocalFileStorage(str(test_storage_path))
+        assert await storage.open_stream("CASE-1/missing.pdf") is None
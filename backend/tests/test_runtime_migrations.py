@@ -0,0 +1,68 @@
+"""Unit tests for the concurrent index helpers in runtime migrations."""
+import pytest
+
+from app.db.runtime_migrations import concurrent_index_name, create_index_concurrently
+
+
+class FakeConnection:
+    """Records executed SQL and reports a fixed pg_index.indisvalid value."""
+
+    def __init__(self, valid=None, fail_create=False):
+        self.valid = valid
+        self.fail_create = fail_create
+        self.executed = []
+
+    async def fetchval(self, query, *args):
+        return self.valid
+
+    async def execute(self, stmt):
+        self.executed.append(stmt)
+        if self.fail_create and stmt.startswith("CREATE"):
+            raise RuntimeError("could not create unique index")
+
+
+CREATE_SQL = "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_x ON cases(x);"
+
+
+class TestConcurrentIndexName:
+    """Tests for concurrent_index_name."""
+
+    def test_matches_plain_and_unique_indexes(self):
+        assert concurrent_index_name(CREATE_SQL) == "idx_cases_x"
+        assert concurrent_index_name(
+            "\n    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_docs\n    ON documents (a, b);"
+        ) == "uq_docs"
+
+    def test_ignores_other_statements(self):
+        assert concurrent_index_name("CREATE INDEX IF NOT EXISTS idx_a ON t(a);") is None
+        assert concurrent_index_name("DROP INDEX CONCURRENTLY IF EXISTS idx_a;") is None
+
+
+class TestCreateIndexConcurrently:
+    """Tests for create_index_concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_valid_index_is_left_alone(self):
+        conn = FakeConnection(valid=True)
+        await create_index_concurrently(conn, "idx_cases_x", CREATE_SQL)
+        assert conn.executed == []
+
+    @pytest.mark.asyncio
+    async def test_missing_index_is_built(self):
+        conn = FakeConnection(valid=None)
+        await create_index_concurrently(conn, "idx_cases_x", CREATE_SQL)
+        assert conn.executed == [CREATE_SQL]
+
+    @pytest.mark.asyncio
+    async def test_invalid_index_is_dropped_then_rebuilt(self):
+        """An index left INVALID by an interrupted build is replaced."""
+        conn = FakeConnection(valid=False)
+        await create_index_concurrently(conn, "idx_cases_x", CREATE_SQL)
+        assert conn.executed == ["DROP INDEX CONCURRENTLY IF EXISTS idx_cases_x;", CREATE_SQL]
+
+    @pytest.mark.asyncio
+    async def test_failed_build_drops_half_built_index(self):
+        conn = FakeConnection(valid=None, fail_create=True)
+        with pytest.raises(RuntimeError):
+            await create_index_concurrently(conn, "idx_cases_x", CREATE_SQL)
+        assert conn.executed == [CREATE_SQL, "DROP INDEX CONCURRENTLY IF EXISTS idx_cases_x;"]
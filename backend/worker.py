@@ -8,6 +8,7 @@ or:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from rq import Connection, Worker
@@ -15,10 +16,20 @@ from rq import Connection, Worker
 from app.core.config import settings
 from app.services.rq_queue import get_redis_connection
 
+try:
+    import uvloop
+except ImportError:  # uvicorn[standard] installs it on every platform but Windows
+    uvloop = None
+
 logging.basicConfig(level=logging.INFO)
 
 
 def main() -> None:
+    # Jobs drive their async work through asyncio.run in the forked work horse,
+    # which inherits this policy.
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     queues = [
         settings.RQ_QUEUE_OCR,
         settings.RQ_QUEUE_REPORTS,